@@ -21,5 +21,6 @@ from poker.hand import (
     Hand,
     Range,
     Shape,
+    WeightedRange,
 )
 from poker.strategy import Strategy
@@ -1,54 +1,77 @@
 import enum
-import functools
 import random
 from collections.abc import Iterable
 
 
 class _PokerEnumMeta(enum.EnumMeta):
     def __init__(self, clsname, bases, classdict):
+        # exact value: member, filled with every alias as written, upper and lower case,
+        # other spellings are added on first use
+        self._lookup_cache_ = {}
         # make sure we only have tuple values, not single values
-        for member in self.__members__.values():
+        for ordinal, member in enumerate(self.__members__.values()):
             values = member._value_
             if not isinstance(values, Iterable) or isinstance(values, str):
                 raise TypeError(
                     f"{member._name_} = {values!r}, should be iterable, not {type(values)}!"
                 )
+            member.ordinal = ordinal
             for alias in values:
                 if isinstance(alias, str):
+                    for spelling in (alias, alias.lower(), alias.upper()):
+                        self._lookup_cache_.setdefault(spelling, member)
                     alias = alias.upper()
+                else:
+                    self._lookup_cache_.setdefault(alias, member)
                 self._value2member_map_.setdefault(alias, member)
 
     def __call__(cls, value):
         """Return the appropriate instance with any of the values listed. If values contains
         text types, those will be looked up in a case insensitive manner."""
+        if value.__class__ is cls:
+            return value
+        try:
+            return cls._lookup_cache_[value]
+        except (KeyError, TypeError):
+            pass
         if isinstance(value, str):
-            value = value.upper()
+            member = super().__call__(value.upper())
+            cls._lookup_cache_[value] = member
+            return member
         return super().__call__(value)
 
     def make_random(cls):
         return random.choice(list(cls))
 
 
-@functools.total_ordering
 class _OrderableMixin:
     # I couldn't inline this to PokerEnum because Enum do some magic which don't like it.
+    # Members are ordered by their ordinal (index in the definition order).
 
-    # From Python manual:
-    # If a class that overrides __eq__() needs to retain
-    # the implementation of __hash__() from a parent class,
-    # the interpreter must be told this explicitly
-    def __hash__(self):
-        return super().__hash__()
+    # Every member is a singleton with a different value, so equality is identity.
+    # These are implemented in C, unlike Enum.__hash__ and a Python __eq__.
+    __eq__ = object.__eq__
+    __ne__ = object.__ne__
+    __hash__ = object.__hash__
 
-    def __eq__(self, other):
+    def __lt__(self, other):
         if self.__class__ is other.__class__:
-            return self._value_ == other._value_
+            return self.ordinal < other.ordinal
         return NotImplemented
 
-    def __lt__(self, other):
+    def __le__(self, other):
         if self.__class__ is other.__class__:
-            names = self.__class__._member_names_
-            return names.index(self._name_) < names.index(other._name_)
+            return self.ordinal <= other.ordinal
+        return NotImplemented
+
+    def __gt__(self, other):
+        if self.__class__ is other.__class__:
+            return self.ordinal > other.ordinal
+        return NotImplemented
+
+    def __ge__(self, other):
+        if self.__class__ is other.__class__:
+            return self.ordinal >= other.ordinal
         return NotImplemented
 
 
@@ -81,3 +104,17 @@ def _make_float(string):
 
 def _make_int(string):
     return int(string.strip().replace(",", ""))
+
+
+def _set_attributes(obj, **attributes):
+    """Set attributes of an immutable interned instance, only while building the instances."""
+    for name, value in attributes.items():
+        object.__setattr__(obj, name, value)
+
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+
+    def _popcount(number):
+        return bin(number).count("1")
@@ -0,0 +1,152 @@
+"""
+    Flop textures.
+
+    Suits don't matter for the texture of a flop, only whether they are the same, so the 22100
+    possible flops are only 1755 different (suit isomorphic) flops. Every one of them has an id
+    (0-1754) and precomputed properties in a table, so the texture of any flop is one dict lookup
+    by the bitmask of its cards. The table is built on first use.
+"""
+
+import enum
+import functools
+import itertools
+
+import attr
+
+from .card import Card, Rank, canonical_board
+
+__all__ = ["FlopTexture", "FlopInfo", "flop_id", "flop_info", "flop_texture", "flop_bucket"]
+
+
+_RANKS = tuple(Rank)
+# bitmask of every card id with the suits permuted, for every permutation of the 4 suits
+# (id is rank * 4 + suit)
+_PERMUTED_BITMASKS = tuple(
+    tuple(1 << (card_id & ~3 | permutation[card_id & 3]) for card_id in range(52))
+    for permutation in itertools.permutations(range(4))
+)
+
+
+class FlopTexture(enum.IntFlag):
+    """Flags of the texture of a flop. Straight draws are counted by the differences of ranks,
+    where Ace is only high.
+    """
+
+    RAINBOW = 1  # three different suits
+    MONOTONE = 2  # one suit
+    TRIPLET = 4  # three of the same rank
+    PAIR = 8  # at least two of the same rank
+    STRAIGHTDRAW = 16  # two cards at most 3 ranks apart
+    GUTSHOT = 32  # two cards at most 4 ranks apart
+    FLUSHDRAW = 64  # at least two of the same suit
+
+
+@attr.s(slots=True, frozen=True)
+class FlopInfo:
+    """Precomputed properties of a suit isomorphic flop.
+
+    :ivar int id:               0-1754
+    :ivar tuple cards:          the canonical flop, see :func:`poker.card.canonical_board`
+    :ivar FlopTexture texture:
+    :ivar Rank high_card:
+    :ivar int num_suits:        number of different suits, 1 (monotone) - 3 (rainbow)
+    :ivar int num_ranks:        number of different ranks, 1 (triplet) - 3 (unpaired)
+    :ivar int combinations:     number of the 22100 flops which are isomorphic to this one
+    """
+
+    id = attr.ib()
+    cards = attr.ib()
+    texture = attr.ib()
+    high_card = attr.ib()
+    num_suits = attr.ib()
+    num_ranks = attr.ib()
+    combinations = attr.ib()
+
+
+def _texture(ranks, suits):
+    texture = FlopTexture(0)
+    num_suits, num_ranks = len(set(suits)), len(set(ranks))
+    if num_suits == 3:
+        texture |= FlopTexture.RAINBOW
+    elif num_suits == 1:
+        texture |= FlopTexture.MONOTONE | FlopTexture.FLUSHDRAW
+    else:
+        texture |= FlopTexture.FLUSHDRAW
+    if num_ranks == 1:
+        texture |= FlopTexture.TRIPLET
+    if num_ranks < 3:
+        texture |= FlopTexture.PAIR
+    differences = [abs(first - second) for first, second in itertools.combinations(ranks, 2)]
+    if any(1 <= difference <= 3 for difference in differences):
+        texture |= FlopTexture.STRAIGHTDRAW
+    if any(1 <= difference <= 4 for difference in differences):
+        texture |= FlopTexture.GUTSHOT
+    return texture
+
+
+@functools.lru_cache(maxsize=None)
+def _flop_table():
+    """Returns (canonical id of every flop by bitmask, FlopInfo of every canonical flop).
+    Flops are enumerated in the order of card ids, the other flops of the isomorphism class of
+    a new flop are found by permuting its suits.
+    """
+    ids_by_mask = {}
+    infos = []
+    for first, second, third in itertools.combinations(range(52), 3):
+        if (1 << first) | (1 << second) | (1 << third) in ids_by_mask:
+            continue
+
+        id = len(infos)
+        card_ids = third, second, first
+        ranks = [card_id >> 2 for card_id in card_ids]
+        suits = [card_id & 3 for card_id in card_ids]
+        isomorphic_masks = {
+            bitmasks[first] | bitmasks[second] | bitmasks[third]
+            for bitmasks in _PERMUTED_BITMASKS
+        }
+        for isomorphic_mask in isomorphic_masks:
+            ids_by_mask[isomorphic_mask] = id
+
+        infos.append(
+            FlopInfo(
+                id=id,
+                cards=canonical_board(Card.from_id(card_id) for card_id in card_ids),
+                texture=_texture(ranks, suits),
+                high_card=_RANKS[ranks[0]],
+                num_suits=len(set(suits)),
+                num_ranks=len(set(ranks)),
+                combinations=len(isomorphic_masks),
+            )
+        )
+    return ids_by_mask, tuple(infos)
+
+
+def flop_id(cards):
+    """Canonical id (0-1754) of a flop given as three :class:`poker.card.Card`\\ s."""
+    first, second, third = cards
+    mask = first.bitmask | second.bitmask | third.bitmask
+    try:
+        return _flop_table()[0][mask]
+    except KeyError:
+        raise ValueError(f"Not a flop: {cards!r}")
+
+
+def flop_info(cards_or_id):
+    """:class:`FlopInfo` of a flop given as three Cards or by its canonical id."""
+    if isinstance(cards_or_id, int):
+        return _flop_table()[1][cards_or_id]
+    return _flop_table()[1][flop_id(cards_or_id)]
+
+
+def flop_texture(cards):
+    """:class:`FlopTexture` flags of a flop given as three Cards."""
+    return flop_info(cards).texture
+
+
+def flop_bucket(cards, by=("high_card", "num_suits", "num_ranks")):
+    """Bucket of a flop for grouping flops in reports: the tuple of the :class:`FlopInfo`
+    attributes in by. The default buckets are high card, number of suits and number of ranks,
+    e.g. ``(Rank('A'), 2, 3)`` for an unpaired two-tone Ace high flop.
+    """
+    info = flop_info(cards)
+    return tuple(getattr(info, attribute) for attribute in by)
@@ -1,9 +1,18 @@
 import itertools
+import random
 from functools import total_ordering
 
-from ._common import PokerEnum, _ReprMixin
+from ._common import PokerEnum, _ReprMixin, _set_attributes
 
-__all__ = ["Suit", "Rank", "Card", "FACE_RANKS", "BROADWAY_RANKS"]
+__all__ = [
+    "Suit",
+    "Rank",
+    "Card",
+    "FACE_RANKS",
+    "BROADWAY_RANKS",
+    "canonical_board",
+    "canonical_board_key",
+]
 
 
 class Suit(PokerEnum):
@@ -36,9 +45,7 @@ class Rank(PokerEnum):
         """Tells the numerical difference between two ranks."""
 
         # so we always get a Rank instance even if string were passed in
-        first, second = cls(first), cls(second)
-        rank_list = list(cls)
-        return abs(rank_list.index(first) - rank_list.index(second))
+        return abs(cls(first).ordinal - cls(second).ordinal)
 
 
 FACE_RANKS = Rank("J"), Rank("Q"), Rank("K")
@@ -50,17 +57,20 @@ class _CardMeta(type):
     def __new__(metacls, clsname, bases, classdict):
         """Cache all possible Card instances on the class itself."""
         cls = super(_CardMeta, metacls).__new__(metacls, clsname, bases, classdict)
-        cls._all_cards = list(
-            cls(f"{rank}{suit}") for rank, suit in itertools.product(Rank, Suit)
-        )
+        cls._all_cards = []
+        cls._card_ids = {}
+        for id, (rank, suit) in enumerate(itertools.product(Rank, Suit)):
+            self = object.__new__(cls)
+            _set_attributes(self, rank=rank, suit=suit, id=id, bitmask=1 << id)
+            cls._all_cards.append(self)
+            cls._card_ids[rank, suit] = id
+        # parsed str -> Card instance, filled on first use of every different spelling
+        cls._cards_by_name = {}
         return cls
 
     def make_random(cls):
         """Returns a random Card instance."""
-        self = object.__new__(cls)
-        self.rank = Rank.make_random()
-        self.suit = Suit.make_random()
-        return self
+        return random.choice(cls._all_cards)
 
     def __iter__(cls):
         return iter(cls._all_cards)
@@ -68,38 +78,61 @@ class _CardMeta(type):
 
 @total_ordering
 class Card(_ReprMixin, metaclass=_CardMeta):
-    """Represents a Card, which consists a Rank and a Suit."""
+    """Represents a Card, which consists a Rank and a Suit.
+
+    There is only one instance of every Card, ``Card('As') is Card('A♠')``.
+    Every card has an integer ``id`` between 0 and 51 in ascending order (2♣ is 0, A♠ is 51)
+    and a ``bitmask`` (``1 << id``), so a set of cards can be represented as one integer.
+    """
 
-    __slots__ = ("rank", "suit")
+    __slots__ = ("rank", "suit", "id", "bitmask")
 
     def __new__(cls, card):
         if isinstance(card, cls):
             return card
 
+        try:
+            return cls._cards_by_name[card]
+        except KeyError:
+            pass
+
         if len(card) != 2:
             raise ValueError("length should be two in %r" % card)
 
-        self = object.__new__(cls)
-        self.rank = Rank(card[0])
-        self.suit = Suit(card[1])
+        self = cls._all_cards[cls._card_ids[Rank(card[0]), Suit(card[1])]]
+        cls._cards_by_name[card] = self
         return self
 
+    @classmethod
+    def from_id(cls, id):
+        """The Card instance with the given id (0-51)."""
+        if not 0 <= id < 52:
+            raise ValueError(f"Invalid card id: {id!r}")
+        return cls._all_cards[id]
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} instances are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} instances are immutable")
+
+    def __reduce__(self):
+        return Card.from_id, (self.id,)
+
     def __hash__(self):
-        return hash(self.rank) + hash(self.suit)
+        return self.id
 
     def __eq__(self, other):
         if self.__class__ is other.__class__:
-            return self.rank == other.rank and self.suit == other.suit
+            return self.id == other.id
         return NotImplemented
 
     def __lt__(self, other):
         if self.__class__ is not other.__class__:
             return NotImplemented
 
-        # with same ranks, suit counts
-        if self.rank == other.rank:
-            return self.suit < other.suit
-        return self.rank < other.rank
+        # ids are ordered by rank first, and with same ranks, suit counts
+        return self.id < other.id
 
     def __str__(self):
         return f"{self.rank}{self.suit}"
@@ -111,3 +144,47 @@ class Card(_ReprMixin, metaclass=_CardMeta):
     @property
     def is_broadway(self):
         return self.rank in BROADWAY_RANKS
+
+
+def _canonical_ids(*groups):
+    """Suit isomorphic representative of groups of card ids, every group sorted descending.
+
+    Cards which are the same except for suits have the same ranks in every suit in some order,
+    so the suits are sorted by their ranks (in every group) and renamed in that order:
+    the suit with the highest ranks becomes clubs, the next one diamonds and so on.
+    """
+    # id is rank * 4 + suit
+    ranks_by_suit = [[0] * len(groups) for _ in range(4)]
+    for index, group in enumerate(groups):
+        for card_id in group:
+            ranks_by_suit[card_id & 3][index] |= 1 << (card_id >> 2)
+    new_suits = [0] * 4
+    for new_suit, suit in enumerate(
+        sorted(range(4), key=ranks_by_suit.__getitem__, reverse=True)
+    ):
+        new_suits[suit] = new_suit
+    return tuple(
+        tuple(sorted((card_id & ~3 | new_suits[card_id & 3] for card_id in group), reverse=True))
+        for group in groups
+    )
+
+
+def canonical_board(cards):
+    """The suit isomorphic representative of a board (or any cards): boards which differ only
+    in suits have the same representative, e.g. ``Ah7s2d`` and ``As7d2c`` are both
+    ``(Card('A♣'), Card('7♦'), Card('2♥'))``. Returns a tuple of Cards, highest first.
+    """
+    (card_ids,) = _canonical_ids([card.id for card in cards])
+    return tuple(Card.from_id(card_id) for card_id in card_ids)
+
+
+def canonical_board_key(cards):
+    """Integer key of the suit isomorphism class of a board: the bitmask of the canonical board.
+    Boards of the same length are isomorphic if and only if their keys are equal.
+    See :func:`poker.board.flop_id` for an index between 0 and 1754 of flops.
+    """
+    (card_ids,) = _canonical_ids([card.id for card in cards])
+    mask = 0
+    for card_id in card_ids:
+        mask |= 1 << card_id
+    return mask
@@ -0,0 +1,374 @@
+"""
+    Columnar export of parsed hand histories.
+
+    Hands are flattened into four tables: hands, players, actions and boards. Every table is a
+    set of equally long columns, every column is an :class:`array.array` of numbers, so a whole
+    column can be scanned without Python objects and written to disk as one raw binary file.
+    Rows of the players, actions and boards tables refer to the row number of their hand in the
+    hands table by the ``hand`` column.
+
+    Cards, actions, positions, names and other repeating values are dictionary encoded: the
+    column stores small integer codes, the values are in the dictionary of the column.
+    Cards are encoded by :attr:`poker.card.Card.id`, -1 means no card.
+    Missing amounts are NaN.
+
+    Written tables can be read back with :meth:`HandTables.read`, or without this module:
+    ``metadata.json`` describes every column with a NumPy compatible dtype, so any column file
+    can be loaded (or memory mapped) with e.g. ``numpy.fromfile(path, dtype)``.
+"""
+
+import array
+import json
+import math
+import sys
+from pathlib import Path
+
+from .card import Card
+from .handhistory import _get_positions
+
+__all__ = ["HandTables"]
+
+
+_METADATA_FILE = "metadata.json"
+_FORMAT_VERSION = 1
+_CARD_NAMES = [card.rank.val + card.suit.val for card in Card]
+_NO_CARD = -1
+
+
+def _dtype(typecode):
+    """NumPy dtype string of an array typecode."""
+    itemsize = array.array(typecode).itemsize
+    if typecode in "fd":
+        kind = "f"
+    elif typecode.islower():
+        kind = "i"
+    else:
+        kind = "u"
+    byteorder = "<" if sys.byteorder == "little" else ">"
+    return f"{byteorder}{kind}{itemsize}"
+
+
+def _amount(value):
+    return math.nan if value is None else float(value)
+
+
+def _card_id(card):
+    return _NO_CARD if card is None else card.id
+
+
+class _Column:
+    """Column of numbers."""
+
+    kind = "plain"
+
+    def __init__(self, typecode):
+        self.data = array.array(typecode)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        return self.data[index]
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def append(self, value):
+        self.data.append(value)
+
+    def _metadata(self):
+        return {"kind": self.kind, "dtype": _dtype(self.data.typecode)}
+
+    def _write(self, path):
+        with path.open("wb") as f:
+            self.data.tofile(f)
+
+    def _read(self, path, metadata, length):
+        with path.open("rb") as f:
+            self.data.fromfile(f, length)
+
+
+class _DictionaryColumn(_Column):
+    """Column of codes, indexes into the list of distinct values (the dictionary)."""
+
+    kind = "dictionary"
+
+    def __init__(self, typecode, dictionary=()):
+        super().__init__(typecode)
+        self.dictionary = list(dictionary)
+        self._codes = {value: code for code, value in enumerate(self.dictionary)}
+
+    def __getitem__(self, index):
+        return self.dictionary[self.data[index]]
+
+    def __iter__(self):
+        dictionary = self.dictionary
+        return (dictionary[code] for code in self.data)
+
+    def append(self, value):
+        try:
+            code = self._codes[value]
+        except KeyError:
+            code = self._codes[value] = len(self.dictionary)
+            self.dictionary.append(value)
+        self.data.append(code)
+
+    def _metadata(self):
+        return dict(super()._metadata(), dictionary=self.dictionary)
+
+    def _read(self, path, metadata, length):
+        super()._read(path, metadata, length)
+        self.dictionary = metadata["dictionary"]
+        self._codes = {value: code for code, value in enumerate(self.dictionary)}
+
+
+class _EnumColumn(_DictionaryColumn):
+    """Dictionary column of :class:`poker._common.PokerEnum` members, stored by their names."""
+
+    def append(self, value):
+        super().append(None if value is None else value.name)
+
+
+class _CardColumn(_Column):
+    """Dictionary column of Cards with the fixed dictionary of all cards, codes are card ids."""
+
+    kind = "card"
+    dictionary = _CARD_NAMES
+
+    def __init__(self):
+        super().__init__("b")
+
+    def __getitem__(self, index):
+        card_id = self.data[index]
+        return None if card_id == _NO_CARD else Card.from_id(card_id)
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self.data)))
+
+    def append(self, card):
+        self.data.append(_card_id(card))
+
+
+class _StringColumn(_Column):
+    """Column of unique strings, stored as UTF-8 bytes and offsets of the end of strings."""
+
+    kind = "string"
+
+    def __init__(self):
+        super().__init__("Q")
+        self.bytes = bytearray()
+
+    def __getitem__(self, index):
+        start = self.data[index - 1] if index > 0 else 0
+        return self.bytes[start : self.data[index]].decode()
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self.data)))
+
+    def append(self, value):
+        self.bytes.extend(value.encode())
+        self.data.append(len(self.bytes))
+
+    def _write(self, path):
+        super()._write(path.with_suffix(".offsets"))
+        path.write_bytes(self.bytes)
+
+    def _read(self, path, metadata, length):
+        super()._read(path.with_suffix(".offsets"), metadata, length)
+        self.bytes = bytearray(path.read_bytes())
+
+
+class _Table:
+    """Named columns with the same length."""
+
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = columns
+
+    def __len__(self):
+        return len(next(iter(self.columns.values())))
+
+    def __getitem__(self, column_name):
+        return self.columns[column_name]
+
+    def __iter__(self):
+        """Iterate through rows as tuples of decoded values in column order."""
+        return zip(*self.columns.values())
+
+    def append(self, *values):
+        for column, value in zip(self.columns.values(), values):
+            column.append(value)
+
+    def _metadata(self):
+        columns = {name: column._metadata() for name, column in self.columns.items()}
+        return {"rows": len(self), "columns": columns}
+
+    def _column_path(self, directory, column_name):
+        return directory / f"{self.name}.{column_name}.bin"
+
+
+class HandTables:
+    """Columnar tables of parsed hand histories."""
+
+    def __init__(self):
+        self.hands = _Table(
+            "hands",
+            {
+                "room": _EnumColumn("B"),
+                "ident": _StringColumn(),
+                "date": _Column("d"),
+                "game_type": _EnumColumn("B"),
+                "game": _EnumColumn("B"),
+                "limit": _EnumColumn("B"),
+                "currency": _EnumColumn("B"),
+                "sb": _Column("d"),
+                "bb": _Column("d"),
+                "total_pot": _Column("d"),
+                "rake": _Column("d"),
+                "table_name": _DictionaryColumn("I"),
+                "tournament_ident": _DictionaryColumn("I"),
+                "max_players": _Column("b"),
+                "button_seat": _Column("b"),
+            },
+        )
+        self.players = _Table(
+            "players",
+            {
+                "hand": _Column("I"),
+                "seat": _Column("b"),
+                "name": _DictionaryColumn("I"),
+                "stack": _Column("d"),
+                "position": _EnumColumn("B"),
+                "first_card": _CardColumn(),
+                "second_card": _CardColumn(),
+                "is_hero": _Column("b"),
+                "is_winner": _Column("b"),
+            },
+        )
+        self.actions = _Table(
+            "actions",
+            {
+                "hand": _Column("I"),
+                "street": _DictionaryColumn("B"),
+                "player": _DictionaryColumn("I"),
+                "action": _EnumColumn("B"),
+                "amount": _Column("d"),
+            },
+        )
+        self.boards = _Table(
+            "boards",
+            {
+                "hand": _Column("I"),
+                "flop1": _CardColumn(),
+                "flop2": _CardColumn(),
+                "flop3": _CardColumn(),
+                "turn": _CardColumn(),
+                "river": _CardColumn(),
+            },
+        )
+
+    @property
+    def tables(self):
+        return self.hands, self.players, self.actions, self.boards
+
+    def __len__(self):
+        return len(self.hands)
+
+    @classmethod
+    def from_hand_histories(cls, hand_histories):
+        self = cls()
+        self.extend(hand_histories)
+        return self
+
+    def extend(self, hand_histories):
+        for hh in hand_histories:
+            self.append(hh)
+
+    def append(self, hh):
+        """Flatten one parsed hand history into the tables."""
+        hand = len(self.hands)
+        self.hands.append(
+            hh.room,
+            hh.ident,
+            hh.date.timestamp(),
+            hh.game_type,
+            hh.game,
+            hh.limit,
+            hh.currency,
+            _amount(hh.sb),
+            _amount(hh.bb),
+            _amount(getattr(hh, "total_pot", None)),
+            _amount(hh.rake),
+            hh.table_name,
+            hh.tournament_ident,
+            hh.max_players,
+            hh.button.seat,
+        )
+
+        actions = list(hh._iter_actions())
+        active = {post.name for post in hh.posts}
+        active.update(action.name for _, action in actions)
+        positions = _get_positions(hh.players, hh.button, active)
+        hero_name = hh.hero.name if hh.hero else None
+        winners = hh.winners or ()
+        for player in hh.players:
+            if not player.stack:
+                continue
+            combo = player.combo
+            self.players.append(
+                hand,
+                player.seat,
+                player.name,
+                _amount(player.stack),
+                positions.get(player.name),
+                combo.first if combo else None,
+                combo.second if combo else None,
+                player.name == hero_name,
+                player.name in winners,
+            )
+
+        for street, action in actions:
+            self.actions.append(
+                hand, street, action.name, action.action, _amount(action.amount)
+            )
+
+        board = hh.board
+        if board:
+            board += (None,) * (5 - len(board))
+            self.boards.append(hand, *board)
+
+    def write(self, directory):
+        """Write every column to a separate binary file and the description of the tables
+        to metadata.json in directory.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        metadata = {"version": _FORMAT_VERSION, "tables": {}}
+        for table in self.tables:
+            for column_name, column in table.columns.items():
+                column._write(table._column_path(directory, column_name))
+            metadata["tables"][table.name] = table._metadata()
+        metadata_path = directory / _METADATA_FILE
+        metadata_path.write_text(json.dumps(metadata, indent=2))
+
+    @classmethod
+    def read(cls, directory):
+        """Read tables written by :meth:`write`."""
+        directory = Path(directory)
+        metadata = json.loads((directory / _METADATA_FILE).read_text())
+        if metadata["version"] != _FORMAT_VERSION:
+            raise ValueError(f"Unknown format version: {metadata['version']}")
+
+        self = cls()
+        for table in self.tables:
+            table_metadata = metadata["tables"][table.name]
+            for column_name, column in table.columns.items():
+                column_metadata = table_metadata["columns"][column_name]
+                if column_metadata["dtype"] != _dtype(column.data.typecode):
+                    raise ValueError(
+                        f"{table.name}.{column_name} is stored as {column_metadata['dtype']}, "
+                        "can't read on this platform"
+                    )
+                path = table._column_path(directory, column_name)
+                column._read(path, column_metadata, table_metadata["rows"])
+        return self
@@ -68,6 +68,8 @@ class Action(PokerEnum):
     SHOW = ("show",)
     MUCK = "don't show", "didn't show", "did not show", "mucks"
     THINK = ("seconds left to act",)
+    POST = "post", "posts"
+    ANTE = "ante", "antes"
 
 
 class Position(PokerEnum):
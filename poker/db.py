@@ -0,0 +1,272 @@
+"""
+    SQLite storage of parsed hand histories.
+
+    Hands are unique by (room, ident), so importing the same hand again is a no-op.
+    Imported files are remembered with their size and modification time, unchanged files are
+    skipped entirely. Files which were only appended to are read from where the last import
+    stopped, in other changed files only the header of already imported hands are parsed.
+"""
+
+import io
+import sqlite3
+from pathlib import Path
+
+from .handhistory import _CHUNK_SIZE, _chunk_offsets, _iter_bytes_hand_histories
+
+__all__ = ["HandDatabase"]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hands (
+    id INTEGER PRIMARY KEY,
+    room TEXT NOT NULL,
+    ident TEXT NOT NULL,
+    date TEXT,
+    game_type TEXT,
+    game TEXT,
+    "limit" TEXT,
+    currency TEXT,
+    sb NUMERIC,
+    bb NUMERIC,
+    buyin NUMERIC,
+    rake NUMERIC,
+    total_pot NUMERIC,
+    table_name TEXT,
+    max_players INTEGER,
+    button_seat INTEGER,
+    tournament_ident TEXT,
+    tournament_level TEXT,
+    board TEXT,
+    UNIQUE (room, ident)
+);
+CREATE INDEX IF NOT EXISTS hands_date ON hands (date);
+CREATE INDEX IF NOT EXISTS hands_stakes ON hands (sb, bb);
+CREATE INDEX IF NOT EXISTS hands_game_type ON hands (game_type);
+CREATE INDEX IF NOT EXISTS hands_tournament_ident ON hands (tournament_ident);
+
+CREATE TABLE IF NOT EXISTS players (
+    hand_id INTEGER NOT NULL REFERENCES hands (id),
+    seat INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    stack NUMERIC,
+    combo TEXT,
+    is_hero INTEGER NOT NULL,
+    is_winner INTEGER NOT NULL,
+    PRIMARY KEY (hand_id, seat)
+);
+CREATE INDEX IF NOT EXISTS players_name ON players (name);
+
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    "offset" INTEGER NOT NULL DEFAULT 0,
+    tail BLOB NOT NULL DEFAULT x''
+);
+"""
+# columns added to the files table since the first version of the schema
+_FILES_COLUMNS = {
+    "offset": "ALTER TABLE files ADD COLUMN \"offset\" INTEGER NOT NULL DEFAULT 0",
+    "tail": "ALTER TABLE files ADD COLUMN tail BLOB NOT NULL DEFAULT x''",
+}
+
+_INSERT_HAND = """
+INSERT INTO hands (
+    id, room, ident, date, game_type, game, "limit", currency, sb, bb, buyin, rake, total_pot,
+    table_name, max_players, button_seat, tournament_ident, tournament_level, board
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_PLAYER = "INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+# the end of the imported part of a file is remembered, to see if the file was only appended to
+_TAIL_SIZE = 256
+
+
+def _name(enum_value):
+    return None if enum_value is None else enum_value.name
+
+
+def _number(value):
+    # sqlite3 can't store Decimal, SQLite would store NUMERIC as REAL anyway
+    return None if value is None else float(value)
+
+
+def _cards(cards):
+    if not cards:
+        return None
+    # ASCII suits, e.g. "As"
+    return "".join(card.rank.val + card.suit.value[1] for card in cards)
+
+
+def _after_last_empty_line(data):
+    """Position right after the last empty line of data, 0 if there is none.
+    The hands before it are complete, even if the file is still being written.
+    """
+    end = 0
+    for empty_line in (b"\n\n", b"\n\r\n"):
+        position = data.rfind(empty_line)
+        if position != -1:
+            end = max(end, position + len(empty_line))
+    return end
+
+
+class HandDatabase:
+    """SQLite database of hand histories. Can be used as a context manager, which closes the
+    database at the end.
+
+    :param path: Path of the database file, created if doesn't exist. In memory by default.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.connection = sqlite3.connect(str(path))
+        self.connection.executescript(_SCHEMA)
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(files)")}
+        for name, alter_table in _FILES_COLUMNS.items():
+            if name not in columns:
+                self.connection.execute(alter_table)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT count(*) FROM hands").fetchone()[0]
+
+    def __contains__(self, room_and_ident):
+        """Check if a hand is in the database by a (room, ident) tuple."""
+        room, ident = room_and_ident
+        row = self.connection.execute(
+            "SELECT 1 FROM hands WHERE room = ? AND ident = ?", (room.name, ident)
+        ).fetchone()
+        return row is not None
+
+    def close(self):
+        self.connection.close()
+
+    def add_hands(self, hands):
+        """Insert parsed hand histories (or records from :func:`poker.handhistory.parse_many`),
+        skipping hands which are already in the database. Returns the number of inserted hands.
+        """
+        with self.connection:
+            return self._insert(hh for hh in hands if (hh.room, hh.ident) not in self)
+
+    def import_files(self, paths, room=None):
+        """Import every new hand from hand history files. Files which haven't changed since the
+        last import are skipped, files which were only appended to are read from the first hand
+        which wasn't complete at the last import, only the header of already imported hands are
+        parsed. Returns the number of imported hands.
+
+        :param room: :class:`poker.constants.PokerRoom` of the hand histories, detected for every
+            hand if None.
+        """
+        imported = 0
+        for path in paths:
+            imported += self.import_file(path, room)
+        return imported
+
+    def import_file(self, path, room=None):
+        """Import new hands from one file, see :meth:`import_files`."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        size = stat.st_size
+        row = self.connection.execute(
+            'SELECT size, mtime, "offset", tail FROM files WHERE path = ?', (str(path),)
+        ).fetchone()
+        if row is not None and row[:2] == (size, stat.st_mtime):
+            return 0
+
+        with io.open(path, "rb") as f:
+            start = 0
+            if row is not None:
+                last_size, _, last_offset, last_tail = row
+                f.seek(last_size - len(last_tail))
+                if last_size <= size and f.read(len(last_tail)) == last_tail:
+                    start = last_offset
+            f.seek(max(0, size - _TAIL_SIZE))
+            tail = f.read(size - f.tell())
+            offsets = _chunk_offsets(f, _CHUNK_SIZE, start, size)
+            # chunks start after empty lines, the last one is in the last chunk
+            f.seek(offsets[-2])
+            offset = offsets[-2] + _after_last_empty_line(f.read(size - offsets[-2]))
+
+            with self.connection:
+                imported = self._insert(self._iter_new_hands(f, room, offsets))
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                    (str(path), size, stat.st_mtime, offset, tail),
+                )
+        return imported
+
+    def _iter_new_hands(self, f, room, offsets):
+        for start, end in zip(offsets, offsets[1:]):
+            f.seek(start)
+            for hh in _iter_bytes_hand_histories(room, f.read(end - start)):
+                hh.parse_header()
+                if (hh.room, hh.ident) not in self:
+                    hh.parse()
+                    yield hh
+
+    def _insert(self, new_hands):
+        hand_rows, player_rows = [], []
+        seen = set()
+        (hand_id,) = self.connection.execute(
+            "SELECT coalesce(max(id), 0) FROM hands"
+        ).fetchone()
+
+        for hh in new_hands:
+            key = hh.room, hh.ident
+            if key in seen:
+                continue
+            seen.add(key)
+            hand_id += 1
+            hand_rows.append(self._hand_row(hand_id, hh))
+            player_rows.extend(self._player_rows(hand_id, hh))
+
+        self.connection.executemany(_INSERT_HAND, hand_rows)
+        self.connection.executemany(_INSERT_PLAYER, player_rows)
+        return len(hand_rows)
+
+    @staticmethod
+    def _hand_row(hand_id, hh):
+        return (
+            hand_id,
+            hh.room.name,
+            hh.ident,
+            hh.date.isoformat() if hh.date else None,
+            _name(hh.game_type),
+            _name(hh.game),
+            _name(hh.limit),
+            _name(hh.currency),
+            _number(hh.sb),
+            _number(hh.bb),
+            _number(hh.buyin),
+            _number(hh.rake),
+            _number(getattr(hh, "total_pot", None)),
+            hh.table_name,
+            hh.max_players,
+            hh.button.seat if hh.button else None,
+            hh.tournament_ident,
+            hh.tournament_level,
+            _cards(hh.board),
+        )
+
+    @staticmethod
+    def _player_rows(hand_id, hh):
+        hero_name = hh.hero.name if hh.hero else None
+        winners = hh.winners or ()
+        for player in hh.players:
+            # skip empty seats
+            if not player.stack:
+                continue
+            combo = player.combo
+            yield (
+                hand_id,
+                player.seat,
+                player.name,
+                _number(player.stack),
+                _cards((combo.first, combo.second)) if combo else None,
+                player.name == hero_name,
+                player.name in winners,
+            )
@@ -1,12 +1,35 @@
+import array
+import random
 import secrets
 
+from ._common import _popcount
 from .card import Card
 
+_ALL_CARDS = tuple(Card)
+# random bytes which are not mapped to a card, bytes are dealt as cards by a translation table
+_NO_CARD = 255
+# below this probability of a sample having no repeated cards, samples are dealt one by one
+_MIN_ACCEPTANCE = 0.25
+
 
 class Deck:
-    def __init__(self):
-        self._cards = list(Card)
+    """Deck of 52 cards.
+
+    :meth:`shuffle` uses the cryptographically secure :mod:`secrets` module for real dealing.
+    :meth:`sample` is for simulations, it uses a fast :class:`random.Random` generator,
+    seeded with seed if given, so simulations can be repeated.
+    For simulation loops, a deck can be used for every trial: known cards are taken out once with
+    :meth:`remove`, :meth:`reset` puts back the dealt cards without making a new deck.
+    """
+
+    def __init__(self, seed=None):
+        # cards in the deck after reset, all cards except the removed ones
+        self._live = list(_ALL_CARDS)
+        self._cards = list(_ALL_CARDS)
         self._drawn = []
+        self._seed = seed
+        # made on first use, seeding from the OS takes longer than making the deck
+        self._random = None
 
     def shuffle(self):
         """Shuffles the deck."""
@@ -25,3 +48,115 @@ class Deck:
         card = self._cards.pop()
         self._drawn.append(card)
         return card
+
+    def deal(self, n):
+        """Draws n cards from the top of the deck, the same as calling :meth:`draw` n times.
+
+        :return: list of Cards
+        """
+        if not 0 <= n <= len(self._cards):
+            raise ValueError(f"Can't deal {n} cards from {len(self._cards)} cards")
+        cards = self._cards[len(self._cards) - n :]
+        del self._cards[len(self._cards) - n :]
+        cards.reverse()
+        self._drawn.extend(cards)
+        return cards
+
+    def remove(self, cards):
+        """Removes known cards from the deck (e.g. hole cards or the board),
+        they are not put back by :meth:`reset`.
+
+        :param cards: iterable of :class:`poker.card.Card`\\ s or card strs, e.g. ``['As', 'Kd']``
+        :raises ValueError: if a card is not in the deck
+        """
+        dead_mask = 0
+        for card in cards:
+            dead_mask |= Card(card).bitmask
+        in_deck = [card for card in self._cards if not card.bitmask & dead_mask]
+        if len(self._cards) - len(in_deck) != _popcount(dead_mask):
+            not_in_deck = [
+                card for card in Card if card.bitmask & dead_mask and card not in self._cards
+            ]
+            raise ValueError(f"Cards not in the deck: {not_in_deck!r}")
+        self._cards[:] = in_deck
+        self._live[:] = [card for card in self._live if not card.bitmask & dead_mask]
+
+    def reset(self):
+        """Puts back every drawn and dealt card in the original order, except the removed ones.
+        The lists of the deck are reused, nothing new is allocated.
+        """
+        self._cards[:] = self._live
+        self._drawn.clear()
+
+    def sample(self, num_samples, size):
+        """Deals num_samples independent random samples of size different cards at once from the
+        cards in the deck, e.g. boards or hands for a Monte Carlo simulation.
+        The deck itself doesn't change.
+
+        Cards are represented by their :attr:`poker.card.Card.id`. Sample n is
+        ``samples[n * size:(n + 1) * size]``, the array can be used as a NumPy array without
+        copying: ``numpy.frombuffer(samples, numpy.uint8).reshape(-1, size)``.
+
+        :return: :class:`array.array` of unsigned bytes, num_samples * size long
+        """
+        card_ids = bytes(card.id for card in self._cards)
+        if not 0 <= size <= len(card_ids):
+            raise ValueError(f"Can't sample {size} cards from {len(card_ids)} cards")
+        samples = array.array("B")
+        if not size:
+            return samples
+        if self._random is None:
+            self._random = random.Random(self._seed)
+        if _acceptance(len(card_ids), size) < _MIN_ACCEPTANCE:
+            samples.frombytes(_shuffled_samples(self._random, card_ids, num_samples, size))
+        else:
+            samples.frombytes(_rejection_samples(self._random, card_ids, num_samples, size))
+        return samples
+
+
+def _acceptance(num_cards, size):
+    """Probability of size cards drawn with replacement all being different."""
+    probability = 1.0
+    for index in range(size):
+        probability *= (num_cards - index) / num_cards
+    return probability
+
+
+def _rejection_samples(rng, card_ids, num_samples, size):
+    """Random bytes are translated to cards in bulk, every byte value is one card in the same
+    number of ways, the rest of the values are dropped. The stream of cards is cut into samples,
+    samples with a repeated card are dropped, which leaves uniform samples of different cards.
+    """
+    per_byte = 256 // len(card_ids)
+    table = bytes(card_ids) * per_byte
+    table += bytes([_NO_CARD]) * (256 - len(table))
+    expected_bytes = size / (_acceptance(len(card_ids), size) * per_byte * len(card_ids) / 256)
+
+    samples = []
+    missing = num_samples
+    while missing > 0:
+        num_bytes = int(missing * expected_bytes * 1.1) + 64
+        random_bytes = rng.getrandbits(num_bytes * 8).to_bytes(num_bytes, "little")
+        cards = random_bytes.translate(table).replace(bytes([_NO_CARD]), b"")
+        new_samples = [
+            sample
+            for sample in (cards[start : start + size] for start in range(0, len(cards), size))
+            if len(sample) == size and len(set(sample)) == size
+        ]
+        samples += new_samples[:missing]
+        missing -= len(new_samples)
+    return b"".join(samples)
+
+
+def _shuffled_samples(rng, card_ids, num_samples, size):
+    """Partial Fisher-Yates shuffle of the first size cards for every sample."""
+    cards = bytearray(card_ids)
+    ranges = [(index, len(cards) - index) for index in range(size)]
+    rand = rng.random
+    samples = bytearray()
+    for _ in range(num_samples):
+        for index, num_left in ranges:
+            other = index + int(rand() * num_left)
+            cards[index], cards[other] = cards[other], cards[index]
+        samples += cards[:size]
+    return bytes(samples)
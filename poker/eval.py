@@ -0,0 +1,266 @@
+"""
+    Poker hand evaluator module.
+
+    Ranks 5, 6 and 7 card Hold'em hands with lookup tables, based on Cactus Kev's
+    prime product algorithm: every card is packed into a 32 bit integer, flushes are looked up
+    by the bit pattern of ranks, every other hand by the product of the rank primes.
+
+    Packed card layout::
+
+        +--------+--------+--------+--------+
+        |xxxbbbbb|bbbbbbbb|cdhsrrrr|xxpppppp|
+        +--------+--------+--------+--------+
+
+        p = prime number of rank (deuce=2, trey=3, four=5, ..., ace=41)
+        r = rank of card (deuce=0, trey=1, four=2, ..., ace=12)
+        cdhs = suit of card (bit turned on based on suit of card)
+        b = bit turned on depending on rank of card
+
+    Evaluated hand values are between 1 (royal flush) and 7462 (7-5-4-3-2 offsuit),
+    the smaller the value, the better the hand.
+"""
+
+import itertools
+
+from ._common import PokerEnum
+from .card import Card, Rank, Suit
+
+__all__ = ["HandClass", "encode", "evaluate", "get_hand_class"]
+
+
+class HandClass(PokerEnum):
+    HIGH_CARD = "High card", "high"
+    PAIR = "Pair", "one pair"
+    TWO_PAIR = ("Two pair",)
+    TRIPS = "Three of a kind", "trips", "set"
+    STRAIGHT = ("Straight",)
+    FLUSH = ("Flush",)
+    FULL_HOUSE = "Full house", "boat"
+    QUADS = "Four of a kind", "quads"
+    STRAIGHT_FLUSH = ("Straight flush",)
+
+
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_SUIT_BITS = {
+    Suit.CLUBS: 0x8000,
+    Suit.DIAMONDS: 0x4000,
+    Suit.HEARTS: 0x2000,
+    Suit.SPADES: 0x1000,
+}
+_RANK_INDEXES = {rank: index for index, rank in enumerate(Rank)}
+
+# bit patterns of the 10 straights, from broadway down to the wheel (A-2-3-4-5)
+_STRAIGHTS = tuple(0b11111 << low for low in range(8, -1, -1)) + (0b1000000001111,)
+
+# (HandClass, worst value in the class), from best to worst
+_CLASS_LIMITS = (
+    (HandClass.STRAIGHT_FLUSH, 10),
+    (HandClass.QUADS, 166),
+    (HandClass.FULL_HOUSE, 322),
+    (HandClass.FLUSH, 1599),
+    (HandClass.STRAIGHT, 1609),
+    (HandClass.TRIPS, 2467),
+    (HandClass.TWO_PAIR, 3325),
+    (HandClass.PAIR, 6185),
+    (HandClass.HIGH_CARD, 7462),
+)
+
+
+def encode(card):
+    """Pack a :class:`poker.card.Card` (or a str like ``'Ah'``) into an integer."""
+    card = Card(card)
+    rank = _RANK_INDEXES[card.rank]
+    return (1 << (16 + rank)) | _SUIT_BITS[card.suit] | (rank << 8) | _PRIMES[rank]
+
+
+def _descending_ranks(*excluded):
+    return [rank for rank in range(12, -1, -1) if rank not in excluded]
+
+
+def _make_five_card_tables():
+    """Generate every equivalence class of 5 card hands in order, from best to worst."""
+    flushes, unique5, products = {}, {}, {}
+
+    non_straights = []
+    for ranks in itertools.combinations(range(12, -1, -1), 5):
+        mask = sum(1 << rank for rank in ranks)
+        if mask not in _STRAIGHTS:
+            non_straights.append(mask)
+
+    value = 1
+    for mask in _STRAIGHTS:
+        flushes[mask] = value
+        value += 1
+
+    for quad in _descending_ranks():
+        for kicker in _descending_ranks(quad):
+            products[_PRIMES[quad] ** 4 * _PRIMES[kicker]] = value
+            value += 1
+
+    for trips in _descending_ranks():
+        for pair in _descending_ranks(trips):
+            products[_PRIMES[trips] ** 3 * _PRIMES[pair] ** 2] = value
+            value += 1
+
+    for mask in non_straights:
+        flushes[mask] = value
+        value += 1
+
+    for mask in _STRAIGHTS:
+        unique5[mask] = value
+        value += 1
+
+    for trips in _descending_ranks():
+        for kickers in itertools.combinations(_descending_ranks(trips), 2):
+            product = _PRIMES[trips] ** 3
+            for kicker in kickers:
+                product *= _PRIMES[kicker]
+            products[product] = value
+            value += 1
+
+    for high, low in itertools.combinations(_descending_ranks(), 2):
+        for kicker in _descending_ranks(high, low):
+            product = _PRIMES[high] ** 2 * _PRIMES[low] ** 2 * _PRIMES[kicker]
+            products[product] = value
+            value += 1
+
+    for pair in _descending_ranks():
+        for kickers in itertools.combinations(_descending_ranks(pair), 3):
+            product = _PRIMES[pair] ** 2
+            for kicker in kickers:
+                product *= _PRIMES[kicker]
+            products[product] = value
+            value += 1
+
+    for mask in non_straights:
+        unique5[mask] = value
+        value += 1
+
+    return flushes, unique5, products
+
+
+_FLUSHES, _UNIQUE5, _PRODUCTS = _make_five_card_tables()
+
+# All hands with 5 different ranks can be looked up by the product of their primes too,
+# so one lookup is enough for every non-flush hand.
+for _mask, _value in _UNIQUE5.items():
+    _product = 1
+    for _rank in range(13):
+        if _mask & (1 << _rank):
+            _product *= _PRIMES[_rank]
+    _PRODUCTS[_product] = _value
+
+
+def _best_flush(mask):
+    for straight in _STRAIGHTS:
+        if mask & straight == straight:
+            return _FLUSHES[straight]
+    # keep the five highest ranks only
+    while bin(mask).count("1") > 5:
+        mask &= mask - 1
+    return _FLUSHES[mask]
+
+
+def _best_non_flush(counts):
+    """Value of the best 5 card hand from rank counts (index is rank, value is count)."""
+    by_count = {1: [], 2: [], 3: [], 4: []}
+    mask = 0
+    for rank in range(12, -1, -1):
+        count = counts[rank]
+        if count:
+            by_count[count].append(rank)
+            mask |= 1 << rank
+    quads, trips, pairs, singles = by_count[4], by_count[3], by_count[2], by_count[1]
+
+    if quads:
+        kicker = max(r for r in range(13) if counts[r] and r != quads[0])
+        return _PRODUCTS[_PRIMES[quads[0]] ** 4 * _PRIMES[kicker]]
+
+    if trips and (len(trips) > 1 or pairs):
+        pair = max(trips[1:] + pairs)
+        return _PRODUCTS[_PRIMES[trips[0]] ** 3 * _PRIMES[pair] ** 2]
+
+    for straight in _STRAIGHTS:
+        if mask & straight == straight:
+            return _UNIQUE5[straight]
+
+    if trips:
+        kickers = singles[:2]
+        return _PRODUCTS[
+            _PRIMES[trips[0]] ** 3 * _PRIMES[kickers[0]] * _PRIMES[kickers[1]]
+        ]
+
+    if len(pairs) > 1:
+        high, low = pairs[:2]
+        kicker = max(pairs[2:] + singles)
+        return _PRODUCTS[_PRIMES[high] ** 2 * _PRIMES[low] ** 2 * _PRIMES[kicker]]
+
+    if pairs:
+        product = _PRIMES[pairs[0]] ** 2
+        for kicker in singles[:3]:
+            product *= _PRIMES[kicker]
+        return _PRODUCTS[product]
+
+    return _UNIQUE5[sum(1 << rank for rank in singles[:5])]
+
+
+# Flushes with 6 or 7 suited cards are precomputed, the best 5 card hand for other 6 and 7 card
+# rank combinations (there are ~70k of them) is calculated on first use and stored in _PRODUCTS.
+for _mask in range(1 << 13):
+    if 6 <= bin(_mask).count("1") <= 7:
+        _FLUSHES[_mask] = _best_flush(_mask)
+
+del _mask, _value, _product, _rank
+
+
+def _evaluate_product(cards, product):
+    counts = [0] * 13
+    for card in cards:
+        if not isinstance(card, int):
+            card = _PACKED_CARDS[card.id]
+        counts[(card >> 8) & 0xF] += 1
+    value = _PRODUCTS[product] = _best_non_flush(counts)
+    return value
+
+
+_PACKED_CARDS = tuple(encode(card) for card in Card)
+
+
+def evaluate(cards):
+    """Evaluate the best 5 card poker hand from 5, 6 or 7 cards.
+
+    Cards can be :class:`poker.card.Card` instances or packed integers made by :func:`encode`.
+    Returns a value between 1 and 7462, smaller value means better hand.
+    """
+    if not 5 <= len(cards) <= 7:
+        raise ValueError(f"Can only evaluate 5, 6 or 7 cards, got {len(cards)}")
+
+    product = 1
+    suits = {}
+    for card in cards:
+        if not isinstance(card, int):
+            card = _PACKED_CARDS[card.id]
+        product *= card & 0xFF
+        suit, rank_bit = card & 0xF000, card >> 16
+        mask = suits.get(suit, 0)
+        if mask & rank_bit:
+            raise ValueError("Same card can't be evaluated twice")
+        suits[suit] = mask | rank_bit
+
+    # 7 cards can't make a flush and a better hand (quads or full house) at the same time
+    for mask in suits.values():
+        if mask in _FLUSHES:
+            return _FLUSHES[mask]
+
+    try:
+        return _PRODUCTS[product]
+    except KeyError:
+        return _evaluate_product(cards, product)
+
+
+def get_hand_class(value):
+    """The :class:`HandClass` of an evaluated hand value."""
+    for hand_class, limit in _CLASS_LIMITS:
+        if value <= limit:
+            return hand_class
+    raise ValueError(f"Invalid hand value: {value}")
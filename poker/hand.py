@@ -1,5 +1,7 @@
+import bisect
 import functools
 import itertools
+import operator
 import random
 import re
 from decimal import Decimal
@@ -7,17 +9,21 @@ from pathlib import Path
 
 from cached_property import cached_property
 
-from ._common import PokerEnum, _ReprMixin
-from .card import BROADWAY_RANKS, Card, Rank
+from ._common import PokerEnum, _popcount, _ReprMixin, _set_attributes
+from .card import BROADWAY_RANKS, Card, Rank, _canonical_ids
+from .eval import encode, evaluate
 
 __all__ = [
     "Shape",
     "Hand",
     "Combo",
     "Range",
+    "WeightedRange",
     "PAIR_HANDS",
     "OFFSUIT_HANDS",
     "SUITED_HANDS",
+    "canonical_combo",
+    "canonical_combo_key",
 ]
 
 
@@ -39,6 +45,10 @@ _OFFSUIT_SUIT_COMBINATIONS = (
 )
 _SUITED_SUIT_COMBINATIONS = ("cc", "dd", "hh", "ss")
 
+# above this many board cards to come, equity is estimated with Monte Carlo simulation by default
+_MAX_EXACT_CARDS_TO_COME = 2
+_DEFAULT_ITERATIONS = 10000
+
 
 class Shape(PokerEnum):
     OFFSUIT = "o", "offsuit", "off"
@@ -52,115 +62,150 @@ class _HandMeta(type):
     def __new__(metacls, clsname, bases, classdict):
         """Cache all possible Hand instances on the class itself."""
         cls = super(_HandMeta, metacls).__new__(metacls, clsname, bases, classdict)
+        # (first Rank, second Rank, shape) -> the only instance of the Hand
+        cls._hands = {}
         cls._all_hands = tuple(cls._get_non_pairs()) + tuple(cls._get_pairs())
+        for sort_key, hand in enumerate(cls._all_hands):
+            _set_attributes(hand, sort_key=sort_key)
+        # parsed str -> Hand instance, filled on first use of every different spelling
+        cls._hands_by_name = {}
         return cls
 
     def _get_non_pairs(cls):
         for rank1 in Rank:
             for rank2 in (r for r in Rank if r < rank1):
-                yield cls(f"{rank1}{rank2}o")
-                yield cls(f"{rank1}{rank2}s")
+                yield cls._make(rank1, rank2, "o")
+                yield cls._make(rank1, rank2, "s")
 
     def _get_pairs(cls):
         for rank in Rank:
-            yield cls(rank.val * 2)
+            yield cls._make(rank, rank, "")
+
+    def _make(cls, first, second, shape):
+        """Make the instance of a Hand with every property precomputed."""
+        self = object.__new__(cls)
+        # first >= second
+        rank_difference = first.ordinal - second.ordinal
+        _set_attributes(
+            self,
+            first=first,
+            second=second,
+            _shape=shape,
+            shape=Shape(shape),
+            is_pair=first is second,
+            is_suited=shape == "s",
+            is_offsuit=shape == "o",
+            rank_difference=rank_difference,
+            is_connector=rank_difference == 1,
+            is_broadway=first in BROADWAY_RANKS and second in BROADWAY_RANKS,
+        )
+        cls._hands[first, second, shape] = self
+        return self
 
     def __iter__(cls):
         return iter(cls._all_hands)
 
     def make_random(cls):
-        obj = object.__new__(cls)
         first = Rank.make_random()
         second = Rank.make_random()
-        obj._set_ranks_in_order(first, second)
-        if first == second:
-            obj._shape = ""
-        else:
-            obj._shape = random.choice(["s", "o"])
-        return obj
+        if first < second:
+            first, second = second, first
+        shape = "" if first is second else random.choice(["s", "o"])
+        return cls._hands[first, second, shape]
 
 
-@functools.total_ordering
 class Hand(_ReprMixin, metaclass=_HandMeta):
-    """General hand without a precise suit. Only knows about two ranks and shape."""
-
-    __slots__ = ("first", "second", "_shape")
+    """General hand without a precise suit. Only knows about two ranks and shape.
+
+    There is only one instance of every Hand, ``Hand('AKs') is Hand('KAs')``, with all the
+    properties precomputed, so Hands are immutable.
+    Hands are compared by ``sort_key``, their index (0-168) in ascending order.
+    """
+
+    __slots__ = (
+        "first",
+        "second",
+        "_shape",
+        "shape",
+        "is_pair",
+        "is_suited",
+        "is_offsuit",
+        "rank_difference",
+        "is_connector",
+        "is_broadway",
+        "sort_key",
+    )
 
     def __new__(cls, hand):
         if isinstance(hand, cls):
             return hand
 
+        try:
+            return cls._hands_by_name[hand]
+        except KeyError:
+            pass
+
         if len(hand) not in (2, 3):
             raise ValueError("Length should be 2 (pair) or 3 (hand)")
 
         first, second = hand[:2]
 
-        self = object.__new__(cls)
-
         if len(hand) == 2:
             if first != second:
                 raise ValueError(
                     "%r, Not a pair! Maybe you need to specify a suit?" % hand
                 )
-            self._shape = ""
+            shape = ""
         elif len(hand) == 3:
             shape = hand[2].lower()
             if first == second:
                 raise ValueError(f"{hand!r}; pairs can't have a suit: {shape!r}")
             if shape not in ("s", "o"):
                 raise ValueError(f"{hand!r}; Invalid shape: {shape!r}")
-            self._shape = shape
 
-        self._set_ranks_in_order(first, second)
+        first, second = Rank(first), Rank(second)
+        if first < second:
+            first, second = second, first
 
+        self = cls._hands[first, second, shape]
+        cls._hands_by_name[hand] = self
         return self
 
     def __str__(self):
         return f"{self.first}{self.second}{self.shape}"
 
-    def __hash__(self):
-        return hash(self.first) + hash(self.second) + hash(self.shape)
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} instances are immutable")
 
-    def __eq__(self, other):
-        if self.__class__ is not other.__class__:
-            return NotImplemented
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} instances are immutable")
 
-        # AKs != AKo, because AKs is better
-        return (
-            self.first == other.first
-            and self.second == other.second
-            and self.shape.val == other.shape.val
-        )
+    def __reduce__(self):
+        return self.__class__, (str(self),)
+
+    # every Hand is a singleton, so AKs != AKo, because AKs is better
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
 
     def __lt__(self, other):
-        if self.__class__ is not other.__class__:
-            return NotImplemented
+        if self.__class__ is other.__class__:
+            return self.sort_key < other.sort_key
+        return NotImplemented
 
-        # pairs are better than non-pairs
-        if not self.is_pair and other.is_pair:
-            return True
-        elif self.is_pair and not other.is_pair:
-            return False
-        elif (
-            not self.is_pair
-            and not other.is_pair
-            and self.first == other.first
-            and self.second == other.second
-            and self._shape != other._shape
-        ):
-            # when Rank match, only suit is the deciding factor
-            # so, offsuit hand is 'less' than suited
-            return self._shape == "o"
-        elif self.first == other.first:
-            return self.second < other.second
-        else:
-            return self.first < other.first
+    def __le__(self, other):
+        if self.__class__ is other.__class__:
+            return self.sort_key <= other.sort_key
+        return NotImplemented
 
-    def _set_ranks_in_order(self, first, second):
-        # set as Rank objects.
-        self.first, self.second = Rank(first), Rank(second)
-        if self.first < self.second:
-            self.first, self.second = self.second, self.first
+    def __gt__(self, other):
+        if self.__class__ is other.__class__:
+            return self.sort_key > other.sort_key
+        return NotImplemented
+
+    def __ge__(self, other):
+        if self.__class__ is other.__class__:
+            return self.sort_key >= other.sort_key
+        return NotImplemented
 
     def to_combos(self):
         first, second = self.first.val, self.second.val
@@ -181,18 +226,6 @@ class Hand(_ReprMixin, metaclass=_HandMeta):
     def is_suited_connector(self):
         return self.is_suited and self.is_connector
 
-    @property
-    def is_suited(self):
-        return self._shape == "s"
-
-    @property
-    def is_offsuit(self):
-        return self._shape == "o"
-
-    @property
-    def is_connector(self):
-        return self.rank_difference == 1
-
     @property
     def is_one_gapper(self):
         return self.rank_difference == 2
@@ -201,29 +234,6 @@ class Hand(_ReprMixin, metaclass=_HandMeta):
     def is_two_gapper(self):
         return self.rank_difference == 3
 
-    @property
-    def rank_difference(self):
-        """The difference between the first and second rank of the Hand."""
-
-        # self.first >= self.second
-        return Rank.difference(self.first, self.second)
-
-    @property
-    def is_broadway(self):
-        return self.first in BROADWAY_RANKS and self.second in BROADWAY_RANKS
-
-    @property
-    def is_pair(self):
-        return self.first == self.second
-
-    @property
-    def shape(self):
-        return Shape(self._shape)
-
-    @shape.setter
-    def shape(self, value):
-        self._shape = Shape(value).val
-
 
 PAIR_HANDS = tuple(hand for hand in Hand if hand.is_pair)
 """Tuple of all pair hands in ascending order."""
@@ -235,76 +245,118 @@ SUITED_HANDS = tuple(hand for hand in Hand if hand.is_suited)
 """Tuple of suited hands in ascending order."""
 
 
-@functools.total_ordering
 class Combo(_ReprMixin):
-    """Hand combination."""
-
-    __slots__ = ("first", "second")
+    """Hand combination.
+
+    There is only one instance of every Combo, ``Combo('AsKs') is Combo('KsAs')``, with all the
+    properties precomputed, so Combos are immutable.
+    Combos are compared by ``sort_key``, their index (0-1325) in ascending order.
+    """
+
+    __slots__ = (
+        "first",
+        "second",
+        "id",
+        "shape",
+        "is_pair",
+        "is_suited",
+        "is_offsuit",
+        "rank_difference",
+        "is_connector",
+        "is_broadway",
+        "sort_key",
+    )
 
     def __new__(cls, combo):
         if isinstance(combo, Combo):
             return combo
 
+        try:
+            return _COMBOS_BY_NAME[combo]
+        except KeyError:
+            pass
+
         if len(combo) != 4:
             raise ValueError("%r, should have a length of 4" % combo)
         elif combo[0] == combo[2] and combo[1] == combo[3]:
             raise ValueError(f"{combo!r}, Pair can't have the same suit: {combo[1]!r}")
 
-        self = super().__new__(cls)
-        self._set_cards_in_order(combo[:2], combo[2:])
+        self = cls.from_cards(Card(combo[:2]), Card(combo[2:]))
+        _COMBOS_BY_NAME[combo] = self
         return self
 
     @classmethod
     def from_cards(cls, first, second):
-        self = super().__new__(cls)
-        first = first.rank.val + first.suit.val
-        second = second.rank.val + second.suit.val
-        self._set_cards_in_order(first, second)
+        first, second = first.id, second.id
+        if first < second:
+            first, second = second, first
+        elif first == second:
+            raise ValueError(f"{Card.from_id(first)!r} twice, a Combo needs two different Cards")
+        return _ALL_COMBOS[first * (first - 1) // 2 + second]
+
+    @classmethod
+    def _make(cls, first, second):
+        """Make the instance of a Combo with every property precomputed, first > second."""
+        self = object.__new__(cls)
+        is_pair = first.rank is second.rank
+        is_suited = first.suit is second.suit
+        if is_pair:
+            shape = Shape.PAIR
+        elif is_suited:
+            shape = Shape.SUITED
+        else:
+            shape = Shape.OFFSUIT
+        rank_difference = first.rank.ordinal - second.rank.ordinal
+        _set_attributes(
+            self,
+            first=first,
+            second=second,
+            id=first.id * (first.id - 1) // 2 + second.id,
+            shape=shape,
+            is_pair=is_pair,
+            is_suited=is_suited,
+            is_offsuit=not is_pair and not is_suited,
+            rank_difference=rank_difference,
+            is_connector=rank_difference == 1,
+            is_broadway=first.is_broadway and second.is_broadway,
+        )
         return self
 
     def __str__(self):
         return f"{self.first}{self.second}"
 
-    def __hash__(self):
-        return hash(self.first) + hash(self.second)
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} instances are immutable")
 
-    def __eq__(self, other):
-        if self.__class__ is other.__class__:
-            return self.first == other.first and self.second == other.second
-        return NotImplemented
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} instances are immutable")
 
-    def __lt__(self, other):
-        if self.__class__ is not other.__class__:
-            return NotImplemented
+    def __reduce__(self):
+        return self.__class__.from_cards, (self.first, self.second)
 
-        # lookup optimization
-        self_is_pair, other_is_pair = self.is_pair, other.is_pair
-        self_first, other_first = self.first, other.first
+    # every Combo is a singleton
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
 
-        if self_is_pair and other_is_pair:
-            if self_first == other_first:
-                return self.second < other.second
-            return self_first < other_first
+    def __lt__(self, other):
+        if self.__class__ is other.__class__:
+            return self.sort_key < other.sort_key
+        return NotImplemented
 
-        elif self_is_pair or other_is_pair:
-            # Pairs are better than non-pairs
-            return self_is_pair < other_is_pair
+    def __le__(self, other):
+        if self.__class__ is other.__class__:
+            return self.sort_key <= other.sort_key
+        return NotImplemented
 
-        else:
-            if self_first.rank == other_first.rank:
-                if self.second.rank == other.second.rank:
-                    # same ranks, suited go first in order by Suit rank
-                    if self.is_suited or other.is_suited:
-                        return self.is_suited < other.is_suited
-                    # both are suited
-                    return self_first.suit < other_first.suit
-                return self.second < other.second
-            return self_first < other_first
-
-    def _set_cards_in_order(self, first, second):
-        self.first, self.second = Card(first), Card(second)
-        if self.first < self.second:
-            self.first, self.second = self.second, self.first
+    def __gt__(self, other):
+        if self.__class__ is other.__class__:
+            return self.sort_key > other.sort_key
+        return NotImplemented
+
+    def __ge__(self, other):
+        if self.__class__ is other.__class__:
+            return self.sort_key >= other.sort_key
+        return NotImplemented
 
     def to_hand(self):
         """Convert combo to :class:`Hand` object, losing suit information."""
@@ -314,18 +366,6 @@ class Combo(_ReprMixin):
     def is_suited_connector(self):
         return self.is_suited and self.is_connector
 
-    @property
-    def is_suited(self):
-        return self.first.suit == self.second.suit
-
-    @property
-    def is_offsuit(self):
-        return not self.is_suited and not self.is_pair
-
-    @property
-    def is_connector(self):
-        return self.rank_difference == 1
-
     @property
     def is_one_gapper(self):
         return self.rank_difference == 2
@@ -334,37 +374,224 @@ class Combo(_ReprMixin):
     def is_two_gapper(self):
         return self.rank_difference == 3
 
-    @property
-    def rank_difference(self):
-        """The difference between the first and second rank of the Combo."""
-        # self.first >= self.second
-        return Rank.difference(self.first.rank, self.second.rank)
 
-    @property
-    def is_pair(self):
-        return self.first.rank == self.second.rank
+# all the 1326 combos, indexed by Combo.id (2d2c is 0, AsAh is 1325)
+_ALL_COMBOS = tuple(
+    Combo._make(Card.from_id(first), Card.from_id(second))
+    for first in range(52)
+    for second in range(first)
+)
 
-    @property
-    def is_broadway(self):
-        return self.first.is_broadway and self.second.is_broadway
+# parsed str -> Combo instance, filled on first use of every different spelling
+_COMBOS_BY_NAME = {}
+
+
+def _combo_order(combo):
+    first, second = combo.first, combo.second
+    # pairs are better than non-pairs
+    if combo.is_pair:
+        return 1, first.id, second.id
+    # with the same ranks, offsuit combos go first, then in order of suits
+    return (
+        0,
+        first.rank.ordinal,
+        second.rank.ordinal,
+        combo.is_suited,
+        first.suit.ordinal,
+        second.suit.ordinal,
+    )
 
-    @property
-    def shape(self):
-        if self.is_pair:
-            return Shape.PAIR
-        elif self.is_suited:
-            return Shape.SUITED
-        else:
-            return Shape.OFFSUIT
 
-    @shape.setter
-    def shape(self, value):
-        self._shape = Shape(value).val
+for _sort_key, _combo in enumerate(sorted(_ALL_COMBOS, key=_combo_order)):
+    _set_attributes(_combo, sort_key=_sort_key)
+del _sort_key, _combo
+
+_sort_key = operator.attrgetter("sort_key")
+
+_ALL_COMBOS_MASK = (1 << len(_ALL_COMBOS)) - 1
+
+# Range bitmask of every Hand's combos
+_HAND_MASKS = {
+    hand: functools.reduce(lambda mask, combo: mask | 1 << combo.id, hand.to_combos(), 0)
+    for hand in Hand
+}
+
+
+def _iter_combo_ids(mask):
+    while mask:
+        lowest_bit = mask & -mask
+        yield lowest_bit.bit_length() - 1
+        mask ^= lowest_bit
+
+
+def _canonical_combo_ids(combo, board):
+    board_ids, (first, second) = _canonical_ids(
+        [card.id for card in board], (combo.first.id, combo.second.id)
+    )
+    return board_ids, first * (first - 1) // 2 + second
+
+
+def canonical_combo(combo, board=()):
+    """The suit isomorphic representative of a combo on a board: the suits of both are renamed
+    the same way, so the board is :func:`poker.card.canonical_board`, and combos which are the
+    same on that board except for suits are the same, e.g. ``AhKh`` on ``Qh7h2c`` and ``AsKs``
+    on ``Qs7s2d`` are both ``AcKc`` on ``Qc7c2d``. Without board, every suited combo of a hand
+    is the same, and so on.
+
+    :return: (Combo, tuple of board Cards)
+    """
+    board_ids, combo_id = _canonical_combo_ids(combo, board)
+    return _ALL_COMBOS[combo_id], tuple(Card.from_id(card_id) for card_id in board_ids)
+
+
+def canonical_combo_key(combo, board=()):
+    """Integer key of the suit isomorphism class of a combo on a board. Combos on boards of the
+    same length are isomorphic if and only if their keys are equal.
+    """
+    board_ids, combo_id = _canonical_combo_ids(combo, board)
+    board_mask = 0
+    for card_id in board_ids:
+        board_mask |= 1 << card_id
+    # combo ids are less than 2 ** 11
+    return board_mask << 11 | combo_id
+
+
+_RANK_INDEXES = {}
+for _index, _rank in enumerate(Rank):
+    _RANK_INDEXES[_rank.val] = _RANK_INDEXES[_rank.val.lower()] = _index
+del _index, _rank
+
+# Range bitmasks of hands indexed by rank indexes (DEUCE is 0, ACE is 12), [first][second]
+# for non-pairs, where second < first, other positions are 0
+_PAIR_MASKS = tuple(_HAND_MASKS[Hand(rank.val * 2)] for rank in Rank)
+_SUITED_MASKS = tuple(
+    tuple(
+        _HAND_MASKS[Hand(f"{first}{second}s")] if second < first else 0
+        for second in Rank
+    )
+    for first in Rank
+)
+_OFFSUIT_MASKS = tuple(
+    tuple(
+        _HAND_MASKS[Hand(f"{first}{second}o")] if second < first else 0
+        for second in Rank
+    )
+    for first in Rank
+)
+_NON_PAIR_MASKS = tuple(
+    tuple(suited | offsuit for suited, offsuit in zip(suited_row, offsuit_row))
+    for suited_row, offsuit_row in zip(_SUITED_MASKS, _OFFSUIT_MASKS)
+)
+
+
+def _parse_pairs(lowest, highest):
+    mask = 0
+    for rank in range(_RANK_INDEXES[lowest], _RANK_INDEXES[highest] + 1):
+        mask |= _PAIR_MASKS[rank]
+    return mask
+
+
+def _non_pairs_mask(masks, first, lowest, highest):
+    """Hands with the first rank, second ranks between lowest and highest (inclusive)."""
+    row = masks[first]
+    mask = 0
+    for second in range(lowest, highest + 1):
+        mask |= row[second]
+    return mask
+
+
+def _x_mask(masks, lowest_first, highest_first):
+    """Every hand with first rank between lowest_first and highest_first (inclusive)."""
+    mask = 0
+    for first in range(lowest_first, highest_first + 1):
+        mask |= _non_pairs_mask(masks, first, 0, first - 1)
+    return mask
+
+
+# for 'AK', 'KJ+' and 'Q5-' the value is (smaller, bigger)
+def _parse_hand(masks, ranks):
+    return masks[_RANK_INDEXES[ranks[1]]][_RANK_INDEXES[ranks[0]]]
+
+
+def _parse_hand_plus(masks, ranks):
+    smaller, bigger = _RANK_INDEXES[ranks[0]], _RANK_INDEXES[ranks[1]]
+    return _non_pairs_mask(masks, bigger, smaller, bigger - 1)
+
+
+def _parse_hand_minus(masks, ranks):
+    smaller, bigger = _RANK_INDEXES[ranks[0]], _RANK_INDEXES[ranks[1]]
+    return _non_pairs_mask(masks, bigger, 0, smaller)
+
+
+# for 'A5-AT' the value is (first, smaller, bigger)
+def _parse_hand_dash(masks, ranks):
+    first, smaller, bigger = (_RANK_INDEXES[rank] for rank in ranks)
+    return _non_pairs_mask(masks, first, smaller, bigger)
+
+
+# for 'AX', 'KX+' and 'QX-' the value is the first rank
+def _parse_x(masks, rank):
+    rank = _RANK_INDEXES[rank]
+    return _x_mask(masks, rank, rank)
+
+
+def _parse_x_plus(masks, rank):
+    return _x_mask(masks, _RANK_INDEXES[rank], 12)
+
+
+def _parse_x_minus(masks, rank):
+    return _x_mask(masks, 0, _RANK_INDEXES[rank])
+
+
+def _make_token_parsers():
+    """Functions making a Range bitmask from the lexer value for every token name."""
+    parsers = {
+        "PAIR": lambda rank: _parse_pairs(rank, rank),
+        "PAIR_PLUS": lambda rank: _parse_pairs(rank, "A"),
+        "PAIR_MINUS": lambda rank: _parse_pairs("2", rank),
+        "PAIR_DASH": lambda ranks: _parse_pairs(*ranks),
+        "COMBO": lambda combo: 1 << Combo(combo).id,
+    }
+    shapes = (
+        ("BOTH", "X", _NON_PAIR_MASKS),
+        ("SUITED", "X_SUITED", _SUITED_MASKS),
+        ("OFFSUIT", "X_OFFSUIT", _OFFSUIT_MASKS),
+    )
+    for name, x_name, masks in shapes:
+        parsers[name] = functools.partial(_parse_hand, masks)
+        parsers[name + "_PLUS"] = functools.partial(_parse_hand_plus, masks)
+        parsers[name + "_MINUS"] = functools.partial(_parse_hand_minus, masks)
+        parsers[name + "_DASH"] = functools.partial(_parse_hand_dash, masks)
+        parsers[x_name + "_PLUS"] = functools.partial(_parse_x_plus, masks)
+        parsers[x_name + "_MINUS"] = functools.partial(_parse_x_minus, masks)
+    parsers["X_BOTH"] = functools.partial(_parse_x, _NON_PAIR_MASKS)
+    parsers["X_SUITED"] = functools.partial(_parse_x, _SUITED_MASKS)
+    parsers["X_OFFSUIT"] = functools.partial(_parse_x, _OFFSUIT_MASKS)
+    return parsers
+
+
+_TOKEN_PARSERS = _make_token_parsers()
+
+
+_RANK_GROUP = r"([2-9TJQKA])"
+
+
+def _name_rule_groups(name, regex):
+    """Change the numbered rank groups and backreferences of a rule to named ones,
+    so more rules can be joined into one regex.
+    """
+    parts = regex.split(_RANK_GROUP)
+    named_regex = parts[0]
+    for index, part in enumerate(parts[1:], 1):
+        named_regex += f"(?P<{name}{index}>{_RANK_GROUP[1:-1]})" + part
+    for index in range(1, len(parts)):
+        named_regex = named_regex.replace(f"\\{index}", f"(?P={name}{index})")
+    return named_regex
 
 
 class _RegexRangeLexer:
     _separator_re = re.compile(r"[,;\s]+")
-    _rank = r"([2-9TJQKA])"
+    _rank = _RANK_GROUP
     _suit = r"[cdhs♣♦♥♠]"
     # the second card is not the same as the first
     # (negative lookahead for the first matching group)
@@ -405,10 +632,16 @@ class _RegexRangeLexer:
         ("COMBO", rf"{_rank}{_suit}{_rank}{_suit}$", "_get_value"),
     )
     # compile regexes when initializing class, so every instance will have them precompiled
-    rules = [
-        (name, re.compile(regex, re.IGNORECASE), method)
-        for (name, regex, method) in rules
-    ]
+    # one regex for all the rules; every rule is a named group, so the name of the
+    # matching rule is the last matched group of the match (tried in order)
+    _rules_re = re.compile(
+        "|".join(
+            f"(?P<{name}>{_name_rule_groups(name, regex)})"
+            for name, regex, _ in rules
+        ),
+        re.IGNORECASE,
+    )
+    _value_methods = {name: method for name, _, method in rules}
 
     def __init__(self, range=""):
         # filter out empty matches
@@ -419,13 +652,12 @@ class _RegexRangeLexer:
         makes an appropriate value for the token and yields them.
         """
         for token in self.tokens:
-            for name, regex, method_name in self.rules:
-                if regex.match(token):
-                    val_method = getattr(self, method_name)
-                    yield name, val_method(token)
-                    break
-            else:
+            match = self._rules_re.match(token)
+            if not match:
                 raise ValueError("Invalid token: %s" % token)
+            name = match.lastgroup
+            val_method = getattr(self, self._value_methods[name])
+            yield name, val_method(token)
 
     @staticmethod
     def _get_value(token):
@@ -481,194 +713,8 @@ class _RegexRangeLexer:
         return cls._get_first_smaller_bigger(slice(0, 2), slice(4, 6), token)
 
 
-@functools.total_ordering
-class Range:
-    """Parses a str range into tuple of Combos (or Hands)."""
-
-    slots = ("_hands", "_combos")
-
-    def __init__(self, range=""):
-        self._hands = set()
-        self._combos = set()
-
-        for name, value in _RegexRangeLexer(range):
-            if name == "ALL":
-                for card in itertools.combinations("AKQJT98765432", 2):
-                    self._add_offsuit(card)
-                    self._add_suited(card)
-                for rank in "AKQJT98765432":
-                    self._add_pair(rank)
-
-                # full range, no need to parse any more name
-                break
-
-            elif name == "PAIR":
-                self._add_pair(value)
-
-            elif name == "PAIR_PLUS":
-                smallest = Rank(value)
-                for rank in (rank.val for rank in Rank if rank >= smallest):
-                    self._add_pair(rank)
-
-            elif name == "PAIR_MINUS":
-                biggest = Rank(value)
-                for rank in (rank.val for rank in Rank if rank <= biggest):
-                    self._add_pair(rank)
-
-            elif name == "PAIR_DASH":
-                first, second = Rank(value[0]), Rank(value[1])
-                ranks = (rank.val for rank in Rank if first <= rank <= second)
-                for rank in ranks:
-                    self._add_pair(rank)
-
-            elif name == "BOTH":
-                self._add_offsuit(value[0] + value[1])
-                self._add_suited(value[0] + value[1])
-
-            elif name == "X_BOTH":
-                for rank in (r.val for r in Rank if r < Rank(value)):
-                    self._add_suited(value + rank)
-                    self._add_offsuit(value + rank)
-
-            elif name == "OFFSUIT":
-                self._add_offsuit(value[0] + value[1])
-
-            elif name == "SUITED":
-                self._add_suited(value[0] + value[1])
-
-            elif name == "X_OFFSUIT":
-                biggest = Rank(value)
-                for rank in (rank.val for rank in Rank if rank < biggest):
-                    self._add_offsuit(value + rank)
-
-            elif name == "X_SUITED":
-                biggest = Rank(value)
-                for rank in (rank.val for rank in Rank if rank < biggest):
-                    self._add_suited(value + rank)
-
-            elif name == "BOTH_PLUS":
-                smaller, bigger = Rank(value[0]), Rank(value[1])
-                for rank in (rank.val for rank in Rank if smaller <= rank < bigger):
-                    self._add_suited(value[1] + rank)
-                    self._add_offsuit(value[1] + rank)
-
-            elif name == "BOTH_MINUS":
-                smaller, bigger = Rank(value[0]), Rank(value[1])
-                for rank in (rank.val for rank in Rank if rank <= smaller):
-                    self._add_suited(value[1] + rank)
-                    self._add_offsuit(value[1] + rank)
-
-            elif name in ("X_PLUS", "X_SUITED_PLUS", "X_OFFSUIT_PLUS"):
-                smallest = Rank(value)
-                first_ranks = (rank for rank in Rank if rank >= smallest)
-
-                for rank1 in first_ranks:
-                    second_ranks = (rank for rank in Rank if rank < rank1)
-                    for rank2 in second_ranks:
-                        if name != "X_OFFSUIT_PLUS":
-                            self._add_suited(rank1.val + rank2.val)
-                        if name != "X_SUITED_PLUS":
-                            self._add_offsuit(rank1.val + rank2.val)
-
-            elif name in ("X_MINUS", "X_SUITED_MINUS", "X_OFFSUIT_MINUS"):
-                biggest = Rank(value)
-                first_ranks = (rank for rank in Rank if rank <= biggest)
-
-                for rank1 in first_ranks:
-                    second_ranks = (rank for rank in Rank if rank < rank1)
-                    for rank2 in second_ranks:
-                        if name != "X_OFFSUIT_MINUS":
-                            self._add_suited(rank1.val + rank2.val)
-                        if name != "X_SUITED_MINUS":
-                            self._add_offsuit(rank1.val + rank2.val)
-
-            elif name == "COMBO":
-                self._combos.add(Combo(value))
-
-            elif name == "OFFSUIT_PLUS":
-                smaller, bigger = Rank(value[0]), Rank(value[1])
-                for rank in (rank.val for rank in Rank if smaller <= rank < bigger):
-                    self._add_offsuit(value[1] + rank)
-
-            elif name == "OFFSUIT_MINUS":
-                smaller, bigger = Rank(value[0]), Rank(value[1])
-                for rank in (rank.val for rank in Rank if rank <= smaller):
-                    self._add_offsuit(value[1] + rank)
-
-            elif name == "SUITED_PLUS":
-                smaller, bigger = Rank(value[0]), Rank(value[1])
-                for rank in (rank.val for rank in Rank if smaller <= rank < bigger):
-                    self._add_suited(value[1] + rank)
-
-            elif name == "SUITED_MINUS":
-                smaller, bigger = Rank(value[0]), Rank(value[1])
-                for rank in (rank.val for rank in Rank if rank <= smaller):
-                    self._add_suited(value[1] + rank)
-
-            elif name == "BOTH_DASH":
-                smaller, bigger = Rank(value[1]), Rank(value[2])
-                for rank in (rank.val for rank in Rank if smaller <= rank <= bigger):
-                    self._add_offsuit(value[0] + rank)
-                    self._add_suited(value[0] + rank)
-
-            elif name == "OFFSUIT_DASH":
-                smaller, bigger = Rank(value[1]), Rank(value[2])
-                for rank in (rank.val for rank in Rank if smaller <= rank <= bigger):
-                    self._add_offsuit(value[0] + rank)
-
-            elif name == "SUITED_DASH":
-                smaller, bigger = Rank(value[1]), Rank(value[2])
-                for rank in (rank.val for rank in Rank if smaller <= rank <= bigger):
-                    self._add_suited(value[0] + rank)
-
-    @classmethod
-    def from_file(cls, filename):
-        """Creates an instance from a given file, containing a range.
-        It can handle the PokerCruncher (.rng extension) format.
-        """
-        range_string = Path(filename).open().read()
-        return cls(range_string)
-
-    @classmethod
-    def from_objects(cls, iterable):
-        """Make an instance from an iterable of Combos, Hands or both."""
-        range_string = " ".join(str(obj) for obj in iterable)
-        return cls(range_string)
-
-    def __eq__(self, other):
-        if self.__class__ is other.__class__:
-            return self._all_combos == other._all_combos
-        return NotImplemented
-
-    def __lt__(self, other):
-        if self.__class__ is other.__class__:
-            return len(self._all_combos) < len(other._all_combos)
-        return NotImplemented
-
-    def __contains__(self, item):
-        if isinstance(item, Combo):
-            return item in self._combos or item.to_hand() in self._hands
-        elif isinstance(item, Hand):
-            return item in self._all_hands
-        elif isinstance(item, str):
-            if len(item) == 4:
-                combo = Combo(item)
-                return combo in self._combos or combo.to_hand() in self._hands
-            else:
-                return Hand(item) in self._all_hands
-
-    def __len__(self):
-        return self._count_combos()
-
-    def __str__(self):
-        return ", ".join(self.rep_pieces)
-
-    def __repr__(self):
-        range = " ".join(self.rep_pieces)
-        return f"{self.__class__.__name__}('{range}')"
-
-    def __hash__(self):
-        return hash(self.combos)
+class _RangeTableMixin:
+    """Renders the 13x13 hand table of the ranges, based on the hands property."""
 
     def to_html(self):
         """Returns a 13x13 HTML table representing the range.
@@ -745,11 +791,127 @@ class Range:
 
         return "".join(table)
 
+
+# maximum number of different range strings kept in the cache
+_RANGE_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=_RANGE_CACHE_SIZE)
+def _parse_range(range):
+    """Range bitmask of a range str, where tokens are separated by one space."""
+    mask = 0
+    for name, value in _RegexRangeLexer(range):
+        if name == "ALL":
+            # full range, no need to parse any more name
+            return _ALL_COMBOS_MASK
+        mask |= _TOKEN_PARSERS[name](value)
+    return mask
+
+
+@functools.total_ordering
+class Range(_RangeTableMixin):
+    """Parses a str range into tuple of Combos (or Hands).
+
+    Stored as a bitmask of 1326 bits, bit n is set if the combo with id n is in the range.
+    The last parsed range strings are cached (see :meth:`cache_info`), so parsing the same
+    range again is only a lookup.
+    """
+
+    slots = ("_mask",)
+
+    def __init__(self, range=""):
+        tokens = _RegexRangeLexer._separator_re.split(range)
+        self._mask = _parse_range(" ".join(token for token in tokens if token))
+
+    @staticmethod
+    def cache_info():
+        """Hit and miss statistics of the parsed range cache."""
+        return _parse_range.cache_info()
+
+    @staticmethod
+    def cache_clear():
+        """Clear the parsed range cache and its statistics."""
+        _parse_range.cache_clear()
+
+    @classmethod
+    def from_file(cls, filename):
+        """Creates an instance from a given file, containing a range.
+        It can handle the PokerCruncher (.rng extension) format.
+        """
+        range_string = Path(filename).open().read()
+        return cls(range_string)
+
+    @classmethod
+    def from_objects(cls, iterable):
+        """Make an instance from an iterable of Combos, Hands or both."""
+        range_string = " ".join(str(obj) for obj in iterable)
+        return cls(range_string)
+
+    @classmethod
+    def _from_mask(cls, mask):
+        self = cls.__new__(cls)
+        self._mask = mask
+        return self
+
+    def __eq__(self, other):
+        if self.__class__ is other.__class__:
+            return self._mask == other._mask
+        return NotImplemented
+
+    def __lt__(self, other):
+        if self.__class__ is other.__class__:
+            return _popcount(self._mask) < _popcount(other._mask)
+        return NotImplemented
+
+    def __contains__(self, item):
+        if isinstance(item, Combo):
+            return bool(self._mask >> item.id & 1)
+        elif isinstance(item, Hand):
+            return bool(self._mask & _HAND_MASKS[item])
+        elif isinstance(item, str):
+            if len(item) == 4:
+                return bool(self._mask >> Combo(item).id & 1)
+            else:
+                return bool(self._mask & _HAND_MASKS[Hand(item)])
+
+    def __len__(self):
+        return _popcount(self._mask)
+
+    def __str__(self):
+        return ", ".join(self.rep_pieces)
+
+    def __repr__(self):
+        range = " ".join(self.rep_pieces)
+        return f"{self.__class__.__name__}('{range}')"
+
+    def __hash__(self):
+        return hash(self._mask)
+
+    def __or__(self, other):
+        if self.__class__ is other.__class__:
+            return self._from_mask(self._mask | other._mask)
+        return NotImplemented
+
+    def __and__(self, other):
+        if self.__class__ is other.__class__:
+            return self._from_mask(self._mask & other._mask)
+        return NotImplemented
+
+    def __sub__(self, other):
+        if self.__class__ is other.__class__:
+            return self._from_mask(self._mask & ~other._mask)
+        return NotImplemented
+
+    def __xor__(self, other):
+        if self.__class__ is other.__class__:
+            return self._from_mask(self._mask ^ other._mask)
+        return NotImplemented
+
     @property
     def rep_pieces(self):
         """List of str pieces how the Range is represented."""
 
-        if self._count_combos() == 1326:
+        if self._mask == _ALL_COMBOS_MASK:
             return ["XX"]
 
         all_combos = self._all_combos
@@ -773,7 +935,7 @@ class Range:
         if not combos:
             return []
 
-        sorted_combos = sorted(combos, reverse=True)
+        sorted_combos = sorted(combos, key=_sort_key, reverse=True)
         hands_and_combos = []
         current_combos = []
         last_combo = sorted_combos[0]
@@ -843,25 +1005,59 @@ class Range:
         else:
             return f"{first}-{last}"
 
-    def _add_pair(self, rank):
-        self._hands.add(Hand(rank * 2))
+    def equity_vs(self, other, board=None, dead=None, iterations=None, seed=None):
+        """All-in equity of this range against the other range, between 0 and 1.
+
+        Every combination of non-conflicting combo pairs and runouts count with the same weight.
+        When iterations is None, equity is calculated exactly by enumerating every runout if there
+        are at most two board cards to come, otherwise estimated with 10 000 Monte Carlo trials.
+        When iterations is given, always estimated with that many trials.
 
-    def _add_offsuit(self, tok):
-        self._hands.add(Hand(tok[0] + tok[1] + "o"))
+        :param board: Cards already on the board, e.g. ``'AsKd7c'`` or an iterable of Cards
+        :param dead: Cards known to be out of the deck (e.g. folded cards)
+        :param int seed: seed for the random generator of the Monte Carlo simulation
+        """
+        board = _parse_cards(board)
+        dead_mask = _cards_mask(board) | _cards_mask(_parse_cards(dead))
+        if len(board) > 5:
+            raise ValueError(f"Board can't have more than 5 cards: {board!r}")
+
+        first_combos = _live_combos(self._all_combos, dead_mask)
+        second_combos = _live_combos(other._all_combos, dead_mask)
+        deck = [(card.bitmask, encode(card)) for card in Card if not card.bitmask & dead_mask]
+        board = [encode(card) for card in board]
+        cards_to_come = 5 - len(board)
+
+        if iterations is None and cards_to_come <= _MAX_EXACT_CARDS_TO_COME:
+            wins, ties, total = _enumerate_equity(
+                first_combos, second_combos, board, deck, cards_to_come
+            )
+        else:
+            wins, ties, total = _simulate_equity(
+                first_combos,
+                second_combos,
+                board,
+                deck,
+                cards_to_come,
+                iterations or _DEFAULT_ITERATIONS,
+                random.Random(seed),
+            )
+
+        if not total:
+            raise ValueError("There are no possible matchups between the two ranges.")
 
-    def _add_suited(self, tok):
-        self._hands.add(Hand(tok[0] + tok[1] + "s"))
+        return (wins + ties / 2) / total
 
     @cached_property
     def hands(self):
         """Tuple of hands contained in this range. If only one combo of the same hand is present,
         it will be shown here. e.g. ``Range('2s2c').hands == (Hand('22'),)``
         """
-        return tuple(sorted(self._all_hands))
+        return tuple(sorted(self._all_hands, key=_sort_key))
 
     @cached_property
     def combos(self):
-        return tuple(sorted(self._all_combos))
+        return tuple(sorted(self._all_combos, key=_sort_key))
 
     @cached_property
     def percent(self):
@@ -870,30 +1066,301 @@ class Range:
         There are 1326 total combos in Hold'em: 52 * 51 / 2 (because order doesn't matter)
         Precision: 2 decimal point
         """
-        dec_percent = Decimal(self._count_combos()) / 1326 * 100
+        dec_percent = Decimal(_popcount(self._mask)) / 1326 * 100
         # round to two decimal point
         return float(dec_percent.quantize(Decimal("1.00")))
 
-    def _count_combos(self):
-        combo_count = len(self._combos)
-        for hand in self._hands:
-            if hand.is_pair:
-                combo_count += 6
-            elif hand.is_offsuit:
-                combo_count += 12
-            elif hand.is_suited:
-                combo_count += 4
-        return combo_count
-
     @cached_property
     def _all_combos(self):
-        hand_combos = {combo for hand in self._hands for combo in hand.to_combos()}
-        return hand_combos | self._combos
+        # in the order of ids, so seeded simulations don't depend on the order of a set
+        return tuple(_ALL_COMBOS[combo_id] for combo_id in _iter_combo_ids(self._mask))
 
     @cached_property
     def _all_hands(self):
-        combo_hands = {combo.to_hand() for combo in self._combos}
-        return combo_hands | self._hands
+        mask = self._mask
+        return {hand for hand, hand_mask in _HAND_MASKS.items() if mask & hand_mask}
+
+
+class WeightedRange(_RangeTableMixin):
+    """Range where every combo has a weight (frequency) between 0 and 1.
+
+    In the str form every piece can have a weight after a colon, e.g. ``'AA, KK:0.5, AKs:0.25'``.
+    Pieces without weight have a weight of 1. If a combo is given more than once, the last one
+    counts. Set operations work like on fuzzy sets: union is the maximum of weights,
+    intersection is the minimum, difference is ``min(weight, 1 - other weight)``.
+    Range instances can be combined with WeightedRanges, they count with weight 1.
+    """
+
+    def __init__(self, range=""):
+        self._weights = {}
+        for token in _RegexRangeLexer._separator_re.split(range):
+            if not token:
+                continue
+            piece, _, weight = token.partition(":")
+            weight = self._check_weight(float(weight) if weight else 1.0, token)
+            for combo_id in _iter_combo_ids(Range(piece)._mask):
+                if weight:
+                    self._weights[combo_id] = weight
+                else:
+                    self._weights.pop(combo_id, None)
+
+    @classmethod
+    def from_range(cls, range, weight=1.0):
+        """Make an instance from a :class:`Range` with the same weight for every combo."""
+        weight = cls._check_weight(float(weight), str(weight))
+        weights = dict.fromkeys(_iter_combo_ids(range._mask), weight) if weight else {}
+        return cls._from_weights(weights)
+
+    @classmethod
+    def _from_weights(cls, weights):
+        self = cls.__new__(cls)
+        self._weights = weights
+        return self
+
+    @staticmethod
+    def _check_weight(weight, token):
+        if not 0 <= weight <= 1:
+            raise ValueError(f"Invalid weight in {token!r}, should be between 0 and 1")
+        return weight
+
+    def __getitem__(self, item):
+        """Weight of the combo, 0 if it's not in the range."""
+        return self._weights.get(Combo(item).id, 0)
+
+    def __contains__(self, item):
+        if isinstance(item, Hand) or (isinstance(item, str) and len(item) != 4):
+            hand_mask = _HAND_MASKS[Hand(item)]
+            return any(hand_mask >> combo_id & 1 for combo_id in self._weights)
+        return Combo(item).id in self._weights
+
+    def __len__(self):
+        return len(self._weights)
+
+    def __eq__(self, other):
+        if self.__class__ is other.__class__:
+            return self._weights == other._weights
+        return NotImplemented
+
+    def __str__(self):
+        return ", ".join(self.rep_pieces)
+
+    def __repr__(self):
+        range = " ".join(self.rep_pieces)
+        return f"{self.__class__.__name__}('{range}')"
+
+    def _combine(self, other, operation):
+        if isinstance(other, Range):
+            other = self.from_range(other)
+        elif not isinstance(other, WeightedRange):
+            return NotImplemented
+        weights = {}
+        for combo_id in self._weights.keys() | other._weights.keys():
+            weight = operation(self._weights.get(combo_id, 0), other._weights.get(combo_id, 0))
+            if weight:
+                weights[combo_id] = weight
+        return self._from_weights(weights)
+
+    def __or__(self, other):
+        return self._combine(other, max)
+
+    def __and__(self, other):
+        return self._combine(other, min)
+
+    def __sub__(self, other):
+        return self._combine(other, lambda first, second: min(first, 1 - second))
+
+    def __xor__(self, other):
+        return self._combine(
+            other,
+            lambda first, second: max(min(first, 1 - second), min(1 - first, second)),
+        )
+
+    __ror__ = __or__
+    __rand__ = __and__
+    __rxor__ = __xor__
+
+    def __rsub__(self, other):
+        if isinstance(other, Range):
+            return self.from_range(other) - self
+        return NotImplemented
+
+    def __ior__(self, other):
+        return self._set_weights(self | other)
+
+    def __iand__(self, other):
+        return self._set_weights(self & other)
+
+    def __isub__(self, other):
+        return self._set_weights(self - other)
+
+    def __ixor__(self, other):
+        return self._set_weights(self ^ other)
+
+    def _set_weights(self, result):
+        if result is NotImplemented:
+            return result
+        self._weights = result._weights
+        return self
+
+    @property
+    def range(self):
+        """:class:`Range` of every combo with a non-zero weight."""
+        mask = 0
+        for combo_id in self._weights:
+            mask |= 1 << combo_id
+        return Range._from_mask(mask)
+
+    @property
+    def hands(self):
+        """Tuple of hands which have at least one combo with non-zero weight."""
+        return self.range.hands
+
+    @property
+    def combos(self):
+        return tuple(sorted(_ALL_COMBOS[combo_id] for combo_id in self._weights))
+
+    @property
+    def weights(self):
+        """Dict of Combo: weight pairs."""
+        return {_ALL_COMBOS[combo_id]: weight for combo_id, weight in self._weights.items()}
+
+    @property
+    def percent(self):
+        """Weighted percent of combos compared to all the possible combos (1326)."""
+        dec_percent = Decimal(sum(self._weights.values())) / 1326 * 100
+        return float(dec_percent.quantize(Decimal("1.00")))
+
+    @property
+    def rep_pieces(self):
+        """List of str pieces, grouped by weights in descending order."""
+        masks = {}
+        for combo_id, weight in self._weights.items():
+            masks[weight] = masks.get(weight, 0) | 1 << combo_id
+
+        pieces = []
+        for weight in sorted(masks, reverse=True):
+            range_pieces = Range._from_mask(masks[weight]).rep_pieces
+            if weight == 1:
+                pieces.extend(range_pieces)
+            else:
+                # repr of floats is the shortest form parsed back to the same weight
+                pieces.extend(f"{piece}:{weight!r}" for piece in range_pieces)
+        return pieces
+
+
+def _parse_cards(cards):
+    if not cards:
+        return []
+    elif isinstance(cards, str):
+        cards = "".join(cards.split())
+        return [Card(cards[i : i + 2]) for i in range(0, len(cards), 2)]
+    return [Card(card) for card in cards]
+
+
+def _cards_mask(cards):
+    mask = 0
+    for card in cards:
+        mask |= card.bitmask
+    return mask
+
+
+def _live_combos(combos, dead_mask):
+    """(card mask, packed first card, packed second card) of combos not blocked by dead cards."""
+    live_combos = []
+    for combo in combos:
+        mask = combo.first.bitmask | combo.second.bitmask
+        if not mask & dead_mask:
+            live_combos.append((mask, encode(combo.first), encode(combo.second)))
+    return live_combos
+
+
+def _enumerate_equity(first_combos, second_combos, board, deck, cards_to_come):
+    """Count results for every runout at once for all combos of both ranges.
+
+    Instead of comparing every combo pair, the second range's values are sorted, so wins and ties
+    can be counted by bisection, then pairs sharing a card are taken out again.
+    """
+    # second range combos which share a card with the given first range combo
+    blockers = [
+        [j for j, (second_mask, _, _) in enumerate(second_combos) if mask & second_mask]
+        for mask, _, _ in first_combos
+    ]
+    wins = ties = total = 0
+
+    for runout in itertools.combinations(deck, cards_to_come):
+        runout_mask = 0
+        full_board = board.copy()
+        for card_mask, card in runout:
+            runout_mask |= card_mask
+            full_board.append(card)
+
+        second_values = [
+            None if mask & runout_mask else evaluate(full_board + [first, second])
+            for mask, first, second in second_combos
+        ]
+        sorted_values = sorted(v for v in second_values if v is not None)
+        live_num = len(sorted_values)
+
+        for (mask, first, second), blocked in zip(first_combos, blockers):
+            if mask & runout_mask:
+                continue
+            value = evaluate(full_board + [first, second])
+            # smaller value is better
+            worse = live_num - bisect.bisect_right(sorted_values, value)
+            same = bisect.bisect_right(sorted_values, value) - bisect.bisect_left(
+                sorted_values, value
+            )
+            matchups = live_num
+            for j in blocked:
+                blocked_value = second_values[j]
+                if blocked_value is None:
+                    continue
+                matchups -= 1
+                if blocked_value > value:
+                    worse -= 1
+                elif blocked_value == value:
+                    same -= 1
+            wins += worse
+            ties += same
+            total += matchups
+
+    return wins, ties, total
+
+
+def _simulate_equity(
+    first_combos, second_combos, board, deck, cards_to_come, iterations, rng
+):
+    has_matchup = any(
+        not first[0] & second[0] for first in first_combos for second in second_combos
+    )
+    if not has_matchup:
+        return 0, 0, 0
+
+    wins = ties = total = 0
+    while total < iterations:
+        first_mask, first1, first2 = rng.choice(first_combos)
+        second_mask, second1, second2 = rng.choice(second_combos)
+        # rejecting conflicting pairs keeps every possible matchup equally likely
+        if first_mask & second_mask:
+            continue
+
+        hole_mask = first_mask | second_mask
+        runout = [
+            card
+            for card_mask, card in rng.sample(deck, cards_to_come + 4)
+            if not card_mask & hole_mask
+        ]
+        full_board = board + runout[:cards_to_come]
+
+        first_value = evaluate(full_board + [first1, first2])
+        second_value = evaluate(full_board + [second1, second2])
+        if first_value < second_value:
+            wins += 1
+        elif first_value == second_value:
+            ties += 1
+        total += 1
+
+    return wins, ties, total
 
 
 if __name__ == "__main__":
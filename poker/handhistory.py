@@ -2,16 +2,35 @@
     Poker hand history parser module.
 """
 
+import bisect
+import collections
+import functools
+import importlib
 import io
 import itertools
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from decimal import Decimal
 
 import attr
 import pytz
 from cached_property import cached_property
 from zope.interface import Attribute, Interface
 
-from .card import Rank
+from .board import FlopTexture, flop_info
+from .constants import Action, PokerRoom, Position
+
+__all__ = [
+    "detect_room",
+    "get_parser",
+    "make_hand_history",
+    "iter_hand_histories",
+    "parse_many",
+    "scan_headers",
+    "read_hand",
+]
 
 
 @attr.s(slots=True)
@@ -33,6 +52,72 @@ class _PlayerAction:
     amount = attr.ib()
 
 
+@attr.s(slots=True)
+class _HandRecord:
+    """Compact summary of a parsed hand history, without the raw text and parser state,
+    so it's cheap to pickle between processes.
+    """
+
+    room = attr.ib()
+    ident = attr.ib()
+    date = attr.ib()
+    game_type = attr.ib()
+    game = attr.ib()
+    limit = attr.ib()
+    currency = attr.ib()
+    sb = attr.ib()
+    bb = attr.ib()
+    buyin = attr.ib()
+    rake = attr.ib()
+    tournament_ident = attr.ib()
+    tournament_level = attr.ib()
+    table_name = attr.ib()
+    max_players = attr.ib()
+    players = attr.ib()
+    hero = attr.ib()
+    button = attr.ib()
+    winners = attr.ib()
+    board = attr.ib()
+    total_pot = attr.ib()
+
+    @classmethod
+    def from_hand_history(cls, hh):
+        """Make a record from a parsed hand history. Missing attributes are None."""
+        fields = {
+            field.name: getattr(hh, field.name, None)
+            for field in attr.fields(cls)
+            if field.name not in ("players", "board")
+        }
+        return cls(players=tuple(hh.players), board=hh.board, **fields)
+
+
+@attr.s(slots=True)
+class _HandHeader:
+    """Information from the header of a hand, see :meth:`IHandHistory.parse_header`."""
+
+    room = attr.ib()
+    ident = attr.ib()
+    date = attr.ib()
+    game_type = attr.ib()
+    game = attr.ib()
+    limit = attr.ib()
+    currency = attr.ib()
+    sb = attr.ib()
+    bb = attr.ib()
+    buyin = attr.ib()
+    tournament_ident = attr.ib()
+    offset = attr.ib()
+
+    @classmethod
+    def from_hand_history(cls, hh, offset):
+        fields = {
+            field.name: getattr(hh, field.name, None)
+            for field in attr.fields(cls)
+            if field.name != "offset"
+        }
+        return cls(offset=offset, **fields)
+
+
 class IStreet(Interface):
     actions = Attribute("_StreetAction instances.")
     cards = Attribute("Cards.")
@@ -45,12 +130,15 @@ class IHandHistory(Interface):
     any pokerroom hand history, so you always have to deal with None values.
     """
 
+    room = Attribute("PokerRoom enum value of the parser.")
+
     # parsing information
     header_parsed = Attribute("Shows wheter header is parsed already or not.")
     parsed = Attribute("Shows wheter the whole hand history is parsed already or not.")
     date = Attribute("Date of the hand history.")
 
     # Street informations
+    posts = Attribute("_PlayerAction instances of blinds (POST) and antes (ANTE).")
     preflop = Attribute("_Street instance for preflop actions.")
     flop = Attribute("_Street instance for flop actions.")
     turn = Attribute("_Street instance for turn actions.")
@@ -64,6 +152,7 @@ class IHandHistory(Interface):
     hero = Attribute("_Player instance with hero data.")
     button = Attribute("_Player instance of button.")
     winners = Attribute("Tuple of _Player instances with winners.")
+    winnings = Attribute("Dict of {winner name: amount collected from all the pots}.")
 
     # Game informations
     game_type = Attribute("GameType enum value (CASH, TOUR or SNG)")
@@ -88,56 +177,101 @@ class IHandHistory(Interface):
         by parsing the least lines possible to get these.
         """
 
-    def parse():
-        """Parses the body of the hand history, but first parse header if not yet parsed."""
+    def parse(lazy=False):
+        """Parses the body of the hand history, but first parse header if not yet parsed.
+        If lazy is True, only the hand history is split into sections, and attributes are
+        parsed on first access.
+        """
+
+
+def _split_name(line, names):
+    """Split an action line into the name of the player at the start of it and the rest.
+    Names can have spaces, so the longest of names the line starts with is taken,
+    the first word if it starts with none of them.
+    """
+    name = max((name for name in names if line.startswith(name + " ")), key=len, default=None)
+    if name is None:
+        name, _, rest = line.partition(" ")
+        return name, rest
+    return name, line[len(name) + 1 :]
 
 
 class _BaseStreet:
-    def __init__(self, flop):
+    def __init__(self, flop, names=()):
         self.pot = None
         self.actions = None
         self.cards = None
         self._parse_cards(flop[0])
-        self._parse_actions(flop[1:])
-        self._all_combinations = itertools.combinations(self.cards, 2)
+        self._parse_actions(flop[1:], names)
+
+    def _parse_actions(self, actionlines, names=()):
+        actions = []
+        for line in actionlines:
+            action = self._parse_action(line, names)
+            if action is None:
+                continue
+            if action.action == Action.WIN:
+                self.pot = action.amount
+            actions.append(action)
+        self.actions = tuple(actions) if actions else None
+
+    @classmethod
+    def _parse_action(cls, line, names=()):
+        """Parse one action line of any street into a :class:`_PlayerAction`.
+
+        :param names: names of the players at the table, see :func:`_split_name`
+        :return: None for lines which are not actions (e.g. chat)
+        :raises ValueError: if the line can't be parsed
+        """
+        try:
+            action = cls._split_action(line, names)
+        except (ValueError, ArithmeticError) as exc:
+            raise ValueError(f"Can't parse action line: {line!r}") from exc
+        return _PlayerAction(*action) if action is not None else None
+
+    @classmethod
+    def _split_action(cls, line, names):
+        """(name, :class:`poker.constants.Action`, amount) of one line or None if it's not an
+        action, implemented by the room parsers.
+        """
+        raise NotImplementedError
 
     @cached_property
+    def info(self):
+        """:class:`poker.board.FlopInfo` of the flop cards."""
+        return flop_info(self.cards)
+
+    @property
+    def texture(self):
+        return self.info.texture
+
+    @property
     def is_rainbow(self):
-        return all(
-            first.suit != second.suit for first, second in self._all_combinations
-        )
+        return FlopTexture.RAINBOW in self.texture
 
-    @cached_property
+    @property
     def is_monotone(self):
-        return all(
-            first.suit == second.suit for first, second in self._all_combinations
-        )
+        return FlopTexture.MONOTONE in self.texture
 
-    @cached_property
+    @property
     def is_triplet(self):
-        return all(
-            first.rank == second.rank for first, second in self._all_combinations
-        )
+        return FlopTexture.TRIPLET in self.texture
 
-    @cached_property
+    @property
     def has_pair(self):
-        return any(
-            first.rank == second.rank for first, second in self._all_combinations
-        )
+        return FlopTexture.PAIR in self.texture
 
-    @cached_property
+    @property
     def has_straightdraw(self):
-        return any(1 <= diff <= 3 for diff in self._get_differences())
+        return FlopTexture.STRAIGHTDRAW in self.texture
 
-    @cached_property
+    @property
     def has_gutshot(self):
-        return any(1 <= diff <= 4 for diff in self._get_differences())
+        return FlopTexture.GUTSHOT in self.texture
 
-    @cached_property
+    @property
     def has_flushdraw(self):
-        return any(
-            first.suit == second.suit for first, second in self._all_combinations
-        )
+        return FlopTexture.FLUSHDRAW in self.texture
 
     @cached_property
     def players(self):
@@ -150,16 +284,19 @@ class _BaseStreet:
                 player_names.append(player_name)
         return tuple(player_names)
 
-    def _get_differences(self):
-        return (
-            Rank.difference(first.rank, second.rank)
-            for first, second in self._all_combinations
-        )
-
 
 class _BaseHandHistory:
     """Abstract base class for *all* kinds of parser."""
 
+    # number of lines parse_header needs from the start of the hand
+    _HEADER_LINES = 1
+    # raise amounts are the total bet after the raise, e.g. "raises to 80"
+    _RAISE_TO = True
+    # call amounts are the total bet after the call instead of the amount put in
+    _CALL_TO = False
+    # attribute name: parse steps which set it in lazy mode, made by _make_lazy_parsers
+    _LAZY_PARSERS = {}
+
     def __init__(self, hand_text):
         """Save raw hand history."""
         self.raw = hand_text.strip()
@@ -171,9 +308,38 @@ class _BaseHandHistory:
         with io.open(filename, "rt", encoding="utf-8-sig") as f:
             return cls(f.read())
 
+    @classmethod
+    def iter_file(cls, filename):
+        """Generator of unparsed instances for every hand in a file with multiple hand histories.
+        Hands are separated by empty lines. The file is read buffered, line by line, so only
+        the current hand is kept in memory, independent of the size of the file.
+        """
+        with io.open(filename, "rt", encoding="utf-8-sig") as f:
+            for hand_text in _split_hands(f):
+                yield cls(hand_text)
+
     def __str__(self):
         return f"<{self.__class__.__name__}: #{self.ident}>"
 
+    def __getattr__(self, name):
+        # only called when the attribute is not set yet
+        lazy_parsed = self.__dict__.get("_lazy_parsed")
+        if lazy_parsed is None or name not in self._LAZY_PARSERS:
+            raise AttributeError(
+                f"{self.__class__.__name__!r} object has no attribute {name!r}"
+            )
+        for step in self._LAZY_PARSERS[name]:
+            if step not in lazy_parsed:
+                method_name, *args = step
+                getattr(self, method_name)(*args)
+                lazy_parsed.add(step)
+        return object.__getattribute__(self, name)
+
+    def _start_lazy_parsing(self):
+        """Attributes in _LAZY_PARSERS will be parsed on first access from the split sections."""
+        self._lazy_parsed = set()
+        self.parsed = True
+
     @property
     def board(self):
         """Calculates board from flop, turn and river."""
@@ -186,6 +352,20 @@ class _BaseHandHistory:
                     board.append(self.river)
         return tuple(board) if board else None
 
+    def _get_header_lines(self):
+        """First _HEADER_LINES lines of the hand, without splitting the whole text."""
+        raw = self.raw
+        lines = []
+        start = 0
+        while len(lines) < self._HEADER_LINES:
+            end = raw.find("\n", start)
+            if end == -1:
+                lines.append(raw[start:])
+                break
+            lines.append(raw[start:end])
+            start = end + 1
+        return lines
+
     def _parse_date(self, date_string):
         """Parse the date_string and return a datetime object as UTC."""
         date = datetime.strptime(date_string, self._DATE_FORMAT)
@@ -205,18 +385,407 @@ class _BaseHandHistory:
         hero_index = player_names.index(hero_name)
         return self.players[hero_index], hero_index
 
+    def _iter_actions(self):
+        """Generator of (street, :class:`_PlayerAction`) for every action in the hand.
+        Only the flop is parsed into actions by the room parsers, action lines of the other
+        streets are parsed here one by one. Lines which are not actions (e.g. chat) are skipped.
+
+        :raises ValueError: for action lines which can't be parsed
+        """
+        names = [player.name for player in self.players]
+        for street in _STREETS:
+            if street == "flop":
+                actions = self.flop.actions if self.flop else None
+                for action in actions or ():
+                    yield street, action
+                continue
+
+            for line in getattr(self, f"{street}_actions", None) or ():
+                action = self._street_class._parse_action(line, names)
+                if action is not None:
+                    yield street, action
+
+
+_STREETS = ("preflop", "flop", "turn", "river")
+
+
+def _make_lazy_parsers(units):
+    """Make _LAZY_PARSERS from a dict of {attribute names: parse steps}.
+    A step is a method name or a tuple of a method name and its arguments.
+    Steps are run in order and only once per hand history.
+    """
+    lazy_parsers = {}
+    for attribute_names, steps in units.items():
+        steps = tuple(step if isinstance(step, tuple) else (step,) for step in steps)
+        for name in attribute_names:
+            lazy_parsers[name] = steps
+    return lazy_parsers
+
+
+_EARLY_POSITIONS = (
+    Position.UTG,
+    Position.UTG1,
+    Position.UTG2,
+    Position.UTG3,
+    Position.UTG4,
+)
+
+
+def _get_positions(players, button, active=None):
+    """Map player names to :class:`poker.constants.Position` of players sitting at the table.
+    Empty seats (players without stack) are skipped, so are players sitting out when the
+    names of the players who posted or acted in the hand are given in ``active``.
+    """
+    seated = [
+        player
+        for player in players
+        if player.stack and (active is None or player.name in active)
+    ]
+    in_order = [p for p in seated if p.seat > button.seat] + [
+        p for p in seated if p.seat <= button.seat
+    ]
+
+    num_players = len(in_order)
+    if num_players < 2:
+        return {}
+    elif num_players == 2:
+        positions = (Position.BB, Position.BTN)
+    else:
+        middle = num_players - 3
+        if middle == 0:
+            middle_positions = ()
+        elif middle == 1:
+            middle_positions = (Position.CO,)
+        else:
+            middle_positions = _EARLY_POSITIONS[: middle - 2] + (Position.HJ, Position.CO)
+        positions = (Position.SB, Position.BB) + middle_positions + (Position.BTN,)
+
+    return {player.name: position for player, position in zip(in_order, positions)}
+
+
+def _split_hands(lines):
+    """Join lines of hand histories separated by empty lines into one str per hand."""
+    hand_lines = []
+    for line in lines:
+        if line.strip():
+            hand_lines.append(line)
+        elif hand_lines:
+            yield "".join(hand_lines)
+            hand_lines = []
+    if hand_lines:
+        yield "".join(hand_lines)
+
+
+_PARSERS = {
+    PokerRoom.STARS: (".room.pokerstars", "PokerStarsHandHistory"),
+    PokerRoom.FTP: (".room.fulltiltpoker", "FullTiltPokerHandHistory"),
+    PokerRoom.PKR: (".room.pkr", "PKRHandHistory"),
+}
+
+
+def get_parser(room):
+    """Hand history parser class for a :class:`poker.constants.PokerRoom` (or any of its names).
+    Room modules are imported only when needed.
+    """
+    room = PokerRoom(room)
+    try:
+        module_name, class_name = _PARSERS[room]
+    except KeyError:
+        raise ValueError(f"There is no hand history parser for {room}")
+    return getattr(importlib.import_module(module_name, __package__), class_name)
+
+
+# Hands start with these, see the _header_re of the room parsers.
+# PKR hands start with "Table <name>" and the hand id is in the second line.
+_ROOM_PREFIXES = (
+    ("PokerStars Hand #", PokerRoom.STARS),
+    ("Full Tilt Poker Game #", PokerRoom.FTP),
+)
+_PKR_PREFIXES = ("Table ", "Starting Hand #")
+_SNIFF_SIZE = 256
+
+
+def detect_room(hand_text):
+    """Detect the :class:`poker.constants.PokerRoom` of a hand history by looking only at the
+    first few hundred characters of it, without parsing. Returns None for unknown rooms.
+    """
+    start = hand_text[:_SNIFF_SIZE].lstrip("\ufeff\r\n\t ")
+    for prefix, room in _ROOM_PREFIXES:
+        if start.startswith(prefix):
+            return room
+
+    first_line, _, rest = start.partition("\n")
+    table_prefix, hand_prefix = _PKR_PREFIXES
+    if first_line.startswith(table_prefix) and rest.lstrip().startswith(hand_prefix):
+        return PokerRoom.PKR
+
+    return None
+
+
+def make_hand_history(hand_text):
+    """Make an unparsed hand history instance of the parser of the detected room.
+    Raises ValueError if the room can't be detected.
+    """
+    room = detect_room(hand_text)
+    if room is None:
+        raise ValueError(f"Unknown hand history format: {hand_text[:50]!r}")
+    return get_parser(room)(hand_text)
+
+
+def iter_hand_histories(filename, room=None):
+    """Generator of unparsed hand histories from a file with hands separated by empty lines.
+    If room is None, the room of every hand is detected, so files can have mixed hands.
+    """
+    if room is not None:
+        yield from get_parser(room).iter_file(filename)
+        return
+
+    with io.open(filename, "rt", encoding="utf-8-sig") as f:
+        for hand_text in _split_hands(f):
+            yield make_hand_history(hand_text)
+
+
+# PKR needs the most lines for parsing the header
+_MAX_HEADER_LINES = 9
+
+
+def _iter_hand_starts(f, num_lines):
+    """Generator of (byte offset, first num_lines lines) of every hand in a binary file.
+    Other lines are only skipped until the empty line at the end of the hand.
+    """
+    offset = 0
+    hand_offset = None
+    lines = []
+    for line in f:
+        if line.strip():
+            if hand_offset is None:
+                hand_offset = offset
+            if len(lines) < num_lines:
+                lines.append(line)
+        elif hand_offset is not None:
+            yield hand_offset, lines
+            hand_offset, lines = None, []
+        offset += len(line)
+    if hand_offset is not None:
+        yield hand_offset, lines
+
+
+def scan_headers(filename, room=None):
+    """Generator of :class:`_HandHeader` records of every hand in a file, by reading and
+    parsing only the header lines of every hand, which is much faster than a full parse.
+    The offset of the header is the byte position of the hand in the file,
+    the full hand can be read with :func:`read_hand`.
+
+    :param room: :class:`poker.constants.PokerRoom` of the hand histories, detected for every
+        hand if None.
+    """
+    parser = None if room is None else get_parser(room)
+    num_lines = _MAX_HEADER_LINES if parser is None else parser._HEADER_LINES
+
+    with io.open(filename, "rb") as f:
+        for offset, lines in _iter_hand_starts(f, num_lines):
+            header_text = b"".join(lines).decode("utf-8-sig").replace("\r\n", "\n")
+            if parser is None:
+                hh = make_hand_history(header_text)
+            else:
+                hh = parser(header_text)
+            hh.parse_header()
+            yield _HandHeader.from_hand_history(hh, offset)
+
+
+def read_hand(filename, offset, room=None):
+    """Read the hand starting at the byte offset of the file (e.g. from :func:`scan_headers`)
+    until the next empty line. Returns an unparsed hand history instance.
+    """
+    with io.open(filename, "rb") as f:
+        f.seek(offset)
+        with io.TextIOWrapper(f, encoding="utf-8-sig") as text_file:
+            hand_text = next(_split_hands(text_file))
+    if room is None:
+        return make_hand_history(hand_text)
+    return get_parser(room)(hand_text)
+
+
+# files are split between hands into chunks of about this many bytes for the worker processes
+_CHUNK_SIZE = 1 << 20
+# chunks submitted to the pool per worker before waiting for the first result
+_CHUNKS_AHEAD = 2
+
+
+def _chunk_offsets(f, chunk_size, start=0, end=None):
+    """Byte offsets of a binary file about chunk_size apart, right after empty lines, so no hand
+    is cut in two. The first is start, the last is end, the size of the file by default.
+    """
+    if end is None:
+        end = f.seek(0, io.SEEK_END)
+    offsets = [start]
+    while True:
+        f.seek(offsets[-1] + chunk_size)
+        # the line at the seek position can be cut, it doesn't count as an empty line
+        f.readline()
+        for line in iter(f.readline, b""):
+            if not line.strip():
+                break
+        offset = f.tell()
+        if offset >= end:
+            break
+        offsets.append(offset)
+    offsets.append(end)
+    return offsets
+
+
+def _iter_chunks(paths):
+    """Generator of (filename, start, end) byte ranges of the files, split between hands."""
+    for filename in paths:
+        with io.open(filename, "rb") as f:
+            offsets = _chunk_offsets(f, _CHUNK_SIZE)
+        for start, end in zip(offsets, offsets[1:]):
+            yield filename, start, end
+
+
+def _iter_chunk_hand_histories(room, filename, start, end):
+    """Like :func:`iter_hand_histories`, but only for the hands between two chunk offsets."""
+    with io.open(filename, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return _iter_bytes_hand_histories(room, data)
+
+
+def _iter_bytes_hand_histories(room, data):
+    """Generator of unparsed hand histories from the bytes of a chunk of a file."""
+    # the initial value is written with newline translation, so lines end with "\n"
+    lines = io.StringIO(data.decode("utf-8-sig"), newline=None)
+    make = make_hand_history if room is None else get_parser(room)
+    for hand_text in _split_hands(lines):
+        yield make(hand_text)
+
+
+def _map_chunks(func, paths, workers):
+    """Generator of func(filename, start, end) for every chunk of every file, in order.
+    Only a few chunks per worker are submitted ahead, results are generated as soon as they
+    and the ones before them are done, so neither the chunks nor the results of whole files
+    are waiting in memory.
+    """
+    chunks = _iter_chunks(paths)
+    if workers == 1:
+        for chunk in chunks:
+            yield func(*chunk)
+        return
+
+    max_pending = _CHUNKS_AHEAD * (workers or os.cpu_count() or 1)
+    pending = collections.deque()
+    with ProcessPoolExecutor(workers) as executor:
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(func, *chunk))
+                while pending and (len(pending) >= max_pending or pending[0].done()):
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _parse_chunk(room, filename, start, end):
+    records = []
+    for hh in _iter_chunk_hand_histories(room, filename, start, end):
+        hh.parse()
+        records.append(_HandRecord.from_hand_history(hh))
+    return records
+
+
+def parse_many(paths, room=None, workers=None):
+    """Parse every hand from every file in paths with a pool of worker processes.
+    Files are split between hands into chunks of about a megabyte, which are parsed by the
+    workers, so big files are parsed in parallel too. Generates :class:`_HandRecord` instances
+    in the order of paths and hands, the records of a chunk as soon as it is parsed.
+
+    :param room: :class:`poker.constants.PokerRoom` of the hand histories, detected for every
+        hand if None.
+    :param workers: Number of processes, ``os.cpu_count()`` by default. With 1, files are
+        parsed in the current process.
+    """
+    if room is not None:
+        room = PokerRoom(room)
+        get_parser(room)
+    parse_chunk = functools.partial(_parse_chunk, room)
+    return itertools.chain.from_iterable(_map_chunks(parse_chunk, paths, workers))
+
+
+class _Lines(list):
+    """Parts of a split hand history. Positions of a value are searched for only once,
+    then every :meth:`index` call is a binary search.
+    """
+
+    def __init__(self, parts):
+        super().__init__(parts)
+        self._positions = {}
+
+    def __contains__(self, value):
+        return bool(self.positions(value))
+
+    def positions(self, value):
+        """Sorted indexes of every part equal to value."""
+        try:
+            return self._positions[value]
+        except KeyError:
+            pass
+        positions = self._positions[value] = []
+        index = -1
+        try:
+            while True:
+                index = super().index(value, index + 1)
+                positions.append(index)
+        except ValueError:
+            return positions
+
+    def index(self, value, start=0):
+        positions = self.positions(value)
+        found = bisect.bisect_left(positions, start)
+        if found == len(positions):
+            raise ValueError(f"{value!r} is not in lines")
+        return positions[found]
+
 
 class _SplittableHandHistoryMixin:
     """Class for PokerStars and FullTiltPoker type hand histories, where you can split the hand
     history into sections.
     """
 
+    # splits on newlines and "***" section markers, like in PokerStars and Full Tilt hands;
+    # every branch starts with a literal character, so the regex engine can skip fast
+    _split_re = re.compile(r"\n|\ \*\*\*\ ?\n?|\*\*\*\ ?\n?")
+
     def _split_raw(self):
         """Split hand history by sections."""
 
-        self._splitted = self._split_re.split(self.raw)
-        # search split locations (basically empty strings)
-        self._sections = [ind for ind, elem in enumerate(self._splitted) if not elem]
+        self._splitted = _Lines(self._split_re.split(self.raw))
+        # split locations (basically empty strings)
+        self._sections = self._splitted.positions("")
+
+    def _parse_posts(self):
+        """Parse blinds and antes from the lines before the hole cards."""
+        posts = []
+        stop = self._sections[self._POSTS_SECTION]
+        for line in itertools.islice(self._splitted, stop):
+            match = self._post_re.match(line)
+            if not match:
+                continue
+            name = match.group("name")
+            action = Action.ANTE if match.group("ante") else Action.POST
+            amount = Decimal(match.group("amount").replace(",", ""))
+            if match.groupdict().get("dead_small"):
+                # a late player posting both blinds: the small blind is dead money like an ante,
+                # only the big blind counts as a live bet
+                posts.append(_PlayerAction(name, Action.ANTE, self.sb))
+                amount -= self.sb
+            posts.append(_PlayerAction(name, action, amount))
+        self.posts = tuple(posts)
+
+    def _next_section(self, index):
+        """Index of the first section split after index."""
+        return self._splitted.index("", index + 1)
 
     def _del_split_vars(self):
         del self._splitted, self._sections
@@ -0,0 +1,220 @@
+"""
+    Hand replayer: the state of the hand after every action of a parsed hand history.
+
+    The state is stored in columns of :class:`array.array`, one item for every action:
+    stack of the acting player, pot, the amount the player had to call, the effective stack and
+    the number of players still in the hand. Blinds and antes are the first actions.
+    Amounts are exact, they are stored as integers in the smallest unit of the hand
+    (e.g. cents), and states of actions have them as :class:`decimal.Decimal`.
+    Only the actions of the streets are replayed, so pots won at the showdown are not paid out
+    when the room doesn't log them as actions (PKR).
+"""
+
+import array
+import itertools
+from decimal import Decimal
+
+import attr
+
+from .constants import Action
+from .handhistory import _STREETS
+
+__all__ = ["HandReplay"]
+
+
+_ACTIONS = tuple(Action)
+_ACTION_CODES = {action: code for code, action in enumerate(_ACTIONS)}
+_STREET_CODES = {street: code for code, street in enumerate(_STREETS)}
+_POST = _ACTION_CODES[Action.POST]
+_ANTE = _ACTION_CODES[Action.ANTE]
+_BET = _ACTION_CODES[Action.BET]
+_CALL = _ACTION_CODES[Action.CALL]
+_RAISE = _ACTION_CODES[Action.RAISE]
+_RETURN = _ACTION_CODES[Action.RETURN]
+_WIN = _ACTION_CODES[Action.WIN]
+_FOLD = _ACTION_CODES[Action.FOLD]
+
+
+@attr.s(slots=True)
+class _ActionState:
+    """State of the hand after an action."""
+
+    street = attr.ib()
+    name = attr.ib()
+    action = attr.ib()
+    amount = attr.ib()
+    stack = attr.ib()
+    pot = attr.ib()
+    to_call = attr.ib()
+    effective_stack = attr.ib()
+    players_left = attr.ib()
+
+
+class HandReplay:
+    """Replay a parsed hand history action by action.
+
+    :ivar tuple names:               names of players sitting at the table in seat order
+    :ivar int places:                number of decimal places of the amounts in the hand,
+                                     amount columns are in units of ``10 ** -places``
+    :ivar array starting_stacks:     stacks of players before the hand in units, in the order
+                                     of names
+    :raises ValueError: if an action line of the hand history can't be parsed
+    """
+
+    def __init__(self, hh):
+        seated = [player for player in hh.players if player.stack]
+        posts = (("preflop", post) for post in hh.posts)
+        actions = list(itertools.chain(posts, hh._iter_actions()))
+        # blinds and winnings can have more decimal places than the stacks and actions
+        winnings = getattr(hh, "winnings", None) or {}
+        amounts = [player.stack for player in seated] + [hh.sb, hh.bb]
+        amounts += [action.amount for _, action in actions] + list(winnings.values())
+        amounts = [Decimal(amount) for amount in amounts if amount]
+        self.places = max([0] + [-amount.as_tuple().exponent for amount in amounts])
+
+        self.names = tuple(player.name for player in seated)
+        self.starting_stacks = array.array("q", (self.to_units(p.stack) for p in seated))
+
+        self.streets = array.array("B")
+        self.players = array.array("B")
+        self.actions = array.array("B")
+        self.amounts = array.array("q")
+        self.stacks = array.array("q")
+        self.pots = array.array("q")
+        self.to_calls = array.array("q")
+        self.effective_stacks = array.array("q")
+        self.players_left = array.array("B")
+
+        self._replay(actions, hh._RAISE_TO, hh._CALL_TO)
+
+    def __len__(self):
+        return len(self.actions)
+
+    def __getitem__(self, index):
+        to_decimal = self.to_decimal
+        return _ActionState(
+            street=_STREETS[self.streets[index]],
+            name=self.names[self.players[index]],
+            action=_ACTIONS[self.actions[index]],
+            amount=to_decimal(self.amounts[index]),
+            stack=to_decimal(self.stacks[index]),
+            pot=to_decimal(self.pots[index]),
+            to_call=to_decimal(self.to_calls[index]),
+            effective_stack=to_decimal(self.effective_stacks[index]),
+            players_left=self.players_left[index],
+        )
+
+    def __iter__(self):
+        return (self[index] for index in range(len(self)))
+
+    @property
+    def final_stacks(self):
+        """Stacks of players after the last action in units, in the order of names."""
+        stacks = array.array("q", self.starting_stacks)
+        for player, stack in zip(self.players, self.stacks):
+            stacks[player] = stack
+        return stacks
+
+    def to_units(self, amount):
+        """Integer number of units of an amount of the hand."""
+        return int(Decimal(amount).scaleb(self.places))
+
+    def to_decimal(self, units):
+        """:class:`decimal.Decimal` amount of a number of units."""
+        return Decimal(units).scaleb(-self.places)
+
+    def _replay(self, actions, raise_to, call_to):
+        player_indexes = {name: index for index, name in enumerate(self.names)}
+        stacks = list(self.starting_stacks)
+        in_hand = list(range(len(stacks)))
+        pot = 0
+        street = None
+        to_units = self.to_units
+        # one tuple for every action, columns are filled at the end with one extend each
+        rows = []
+
+        for action_street, action in actions:
+            player = player_indexes.get(action.name)
+            if player is None:
+                continue
+
+            if action_street != street:
+                street = action_street
+                street_code = _STREET_CODES[street]
+                bets = [0] * len(stacks)
+                current_bet = 0
+
+            # compare codes, hashing and comparing enum members is much slower
+            code = _ACTION_CODES[action.action]
+            amount = 0 if action.amount is None else to_units(action.amount)
+            stack = stacks[player]
+            to_call = current_bet - bets[player]
+            if to_call > stack:
+                to_call = stack
+            elif to_call < 0:
+                to_call = 0
+            opponent_stacks = [stacks[other] for other in in_hand if other != player]
+            effective_stack = min(stack, max(opponent_stacks, default=0))
+
+            if code == _POST or code == _BET:
+                put_in = amount
+            elif code == _CALL:
+                put_in = amount - bets[player] if call_to else amount
+            elif code == _RAISE:
+                total = amount if raise_to else current_bet + amount
+                put_in = total - bets[player]
+            elif code == _RETURN:
+                put_in = -amount
+            else:
+                put_in = 0
+                if code == _ANTE:
+                    # dead money, doesn't count in the bets of the street
+                    stack -= amount
+                    pot += amount
+                elif code == _WIN:
+                    stack += amount
+                    pot -= amount
+                elif code == _FOLD and player in in_hand:
+                    in_hand.remove(player)
+
+            if put_in:
+                stack -= put_in
+                pot += put_in
+                bets[player] += put_in
+                if code == _RETURN:
+                    current_bet = max(bets)
+                elif bets[player] > current_bet:
+                    current_bet = bets[player]
+            stacks[player] = stack
+
+            rows.append(
+                (
+                    street_code,
+                    player,
+                    code,
+                    amount,
+                    stack,
+                    pot,
+                    to_call,
+                    effective_stack,
+                    len(in_hand),
+                )
+            )
+
+        for column, values in zip(self._columns, zip(*rows)):
+            column.extend(values)
+
+    @property
+    def _columns(self):
+        """Columns in the order of the state of an action."""
+        return (
+            self.streets,
+            self.players,
+            self.actions,
+            self.amounts,
+            self.stacks,
+            self.pots,
+            self.to_calls,
+            self.effective_stacks,
+            self.players_left,
+        )
@@ -1,3 +1,4 @@
+import itertools
 import re
 from decimal import Decimal
 
@@ -7,7 +8,7 @@ from zope.interface import implementer
 from .. import handhistory as hh
 from .._common import _make_int
 from ..card import Card
-from ..constants import Action, Currency, Game, GameType, Limit
+from ..constants import Action, Currency, Game, GameType, Limit, PokerRoom
 from ..hand import Combo
 
 __all__ = ["FullTiltPokerHandHistory"]
@@ -15,30 +16,38 @@ __all__ = ["FullTiltPokerHandHistory"]
 
 @implementer(hh.IStreet)
 class _Street(hh._BaseStreet):
+    # chat ("name: text") and table events between the actions, which are not actions themselves
+    _table_event_re = re.compile(
+        r"^[^:]+: | has timed out| is sitting out| has returned| stands up| sits down"
+        r"| has been disconnected| has reconnected"
+    )
+
     def _parse_cards(self, boardline):
         self.cards = (Card(boardline[1:3]), Card(boardline[4:6]), Card(boardline[7:9]))
 
-    def _parse_actions(self, actionlines):
-        actions = []
-        for line in actionlines:
-            if line.startswith("Uncalled bet"):
-                action = self._parse_uncalled(line)
-            elif "raises to" in line:
-                action = self._parse_raise(line)
-            elif "wins the pot" in line:
-                action = self._parse_win(line)
-            elif "mucks" in line:
-                action = self._parse_muck(line)
-            elif "seconds left to act" in line:
-                action = self._parse_think(line)
-            elif " " in line:
-                action = self._parse_player_action(line)
-            else:
-                raise
-            actions.append(hh._PlayerAction(*action))
-        self.actions = tuple(actions) if actions else None
+    @classmethod
+    def _split_action(cls, line, names):
+        if cls._table_event_re.search(line):
+            return None
+        elif line.startswith("Uncalled bet"):
+            return cls._parse_uncalled(line)
+
+        name, action_text = hh._split_name(line, names)
+        if "raises to" in action_text:
+            return cls._parse_raise(name, action_text)
+        elif "wins the pot" in action_text:
+            return cls._parse_win(name, action_text)
+        elif "mucks" in action_text:
+            return name, Action.MUCK, None
+        elif "seconds left to act" in action_text:
+            return name, Action.THINK, None
+        elif action_text:
+            return cls._parse_player_action(name, action_text)
+        else:
+            raise ValueError("bad action line")
 
-    def _parse_uncalled(self, line):
+    @staticmethod
+    def _parse_uncalled(line):
         amount_start_index = 16
         space_after_amount_index = line.find(" ", amount_start_index)
         amount = line[amount_start_index:space_after_amount_index]
@@ -46,57 +55,40 @@ class _Street(hh._BaseStreet):
         name = line[name_start_index:]
         return name, Action.RETURN, Decimal(amount)
 
-    def _parse_raise(self, line):
-        first_space_index = line.find(" ")
-        name = line[:first_space_index]
-        amount_start_index = line.find("to ") + 3
-        amount = line[amount_start_index:]
+    @staticmethod
+    def _parse_raise(name, action_text):
+        amount_start_index = action_text.find("to ") + 3
+        amount = action_text[amount_start_index:]
         return name, Action.RAISE, Decimal(amount)
 
-    def _parse_win(self, line):
-        first_space_index = line.find(" ")
-        name = line[:first_space_index]
-        first_paren_index = line.find("(")
+    @staticmethod
+    def _parse_win(name, action_text):
+        first_paren_index = action_text.find("(")
         last_paren_index = -1
-        amount = line[first_paren_index + 1 : last_paren_index]
-        self.pot = Decimal(amount)
-        return name, Action.WIN, self.pot
-
-    def _parse_muck(self, line):
-        space_index = line.find(" ")
-        name = line[:space_index]
-        return name, Action.MUCK, None
-
-    def _parse_think(self, line):
-        space_index = line.find(" ")
-        name = line[:space_index]
-        return name, Action.THINK, None
-
-    def _parse_player_action(self, line):
-        space_index = line.find(" ")
-        name = line[:space_index]
-        end_action_index = line.find(" ", space_index + 1)
-        # -1 means not found
-        if end_action_index == -1:
-            end_action_index = None  # until the end
-        action = Action(line[space_index + 1 : end_action_index])
-        if end_action_index:
-            amount = line[end_action_index + 1 :]
-            return name, action, Decimal(amount)
+        amount = action_text[first_paren_index + 1 : last_paren_index]
+        return name, Action.WIN, Decimal(amount)
+
+    @staticmethod
+    def _parse_player_action(name, action_text):
+        action, _, amount = action_text.partition(" ")
+        if amount:
+            return name, Action(action), Decimal(amount)
         else:
-            return name, action, None
+            return name, Action(action), None
 
 
 @implementer(hh.IHandHistory)
 class FullTiltPokerHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory):
     """Parses Full Tilt Poker hands the same way as PokerStarsHandHistory class."""
 
+    room = PokerRoom.FTP
+    _street_class = _Street
+
     rake = None
     tournament_level = None
 
     _DATE_FORMAT = "%H:%M:%S ET - %Y/%m/%d"
     _TZ = pytz.timezone("US/Eastern")  # ET
-    _split_re = re.compile(r" ?\*\*\* ?\n?|\n")
     _header_re = re.compile(
         r"""
         ^Full[ ]Tilt[ ]Poker[ ]                                 # Poker Room
@@ -119,16 +111,21 @@ class FullTiltPokerHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHisto
     _hero_re = re.compile(r"^Dealt to (?P<hero_name>.*) \[(..) (..)\]$")
     _street_re = re.compile(r"\[([^\]]*)\] \(Total Pot: (\d*)\, (\d) Players")
     _pot_re = re.compile(r"^Total pot ([\d,]*) .*\| Rake (\d*)$")
-    _winner_re = re.compile(r"^Seat (?P<seat>\d): (?P<name>.*?) .*collected \((\d*)\),")
-    _showdown_re = re.compile(r"^Seat (\d): (.*) showed .* and won")
+    _winner_re = re.compile(
+        r"^Seat (?P<seat>\d): (?P<name>.*?) .*collected \((?P<amount>[\d,]*)\),"
+    )
+    _showdown_re = re.compile(
+        r"^Seat (?P<seat>\d): (?P<name>.*?) .*showed .* and won \((?P<amount>[\d,]*)\)"
+    )
     _board_re = re.compile(r"(?<=[\[ ])(..)(?=[\] ])")
+    _post_re = re.compile(
+        r"^(?P<name>.+?) (?:posts the (?:small|big) blind of|(?P<ante>antes)) "
+        r"(?P<amount>[\d,]+(?:\.\d+)?)$"
+    )
+    _POSTS_SECTION = 0
 
     def parse_header(self):
-        # sections[0] is before HOLE CARDS
-        # sections[-1] is before SUMMARY
-        self._split_raw()
-
-        header_match = self._header_re.match(self._splitted[0])
+        header_match = self._header_re.match(self._get_header_lines()[0])
         self.sb = Decimal(header_match.group("sb"))
         self.bb = Decimal(header_match.group("bb"))
         self._parse_date(header_match.group("date"))
@@ -150,14 +147,47 @@ class FullTiltPokerHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHisto
 
         self.header_parsed = True
 
-    def parse(self):
-        """Parses the body of the hand history, but first parse header if not yet parsed."""
+    _LAZY_PARSERS = hh._make_lazy_parsers(
+        {
+            ("players", "max_players", "button", "hero"): (
+                "_parse_players",
+                "_parse_button",
+                "_parse_hero",
+            ),
+            ("posts",): ("_parse_posts",),
+            ("preflop_actions",): ("_parse_preflop",),
+            ("flop",): ("_parse_flop",),
+            ("turn", "turn_actions", "river", "river_actions"): (
+                ("_parse_street", "turn"),
+                ("_parse_street", "river"),
+                "_parse_board",
+            ),
+            ("show_down",): ("_parse_showdown",),
+            ("total_pot",): ("_parse_pot",),
+            ("winners", "winnings"): ("_parse_showdown", "_parse_winners"),
+        }
+    )
+
+    def parse(self, lazy=False):
+        """Parses the body of the hand history, but first parse header if not yet parsed.
+        If lazy is True, attributes are parsed on first access, except extra.
+        """
         if not self.header_parsed:
             self.parse_header()
 
+        # sections[0] is before HOLE CARDS
+        # sections[-1] is before SUMMARY
+        self._split_raw()
+
+        if lazy:
+            self._parse_extra()
+            self._start_lazy_parsing()
+            return
+
         self._parse_players()
         self._parse_button()
         self._parse_hero()
+        self._parse_posts()
         self._parse_preflop()
         self._parse_flop()
         self._parse_street("turn")
@@ -174,7 +204,7 @@ class FullTiltPokerHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHisto
     def _parse_players(self):
         # In hh there is no indication of max_players, so init for 9.
         players = self._init_seats(9)
-        for line in self._splitted[1:]:
+        for line in itertools.islice(self._splitted, 1, None):
             match = self._seat_re.match(line)
             if not match:
                 break
@@ -215,15 +245,15 @@ class FullTiltPokerHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHisto
         except ValueError:
             self.flop = None
             return
-        stop = next(v for v in self._sections if v > start)
+        stop = self._next_section(start)
         floplines = self._splitted[start + 1 : stop]
-        self.flop = _Street(floplines)
+        self.flop = _Street(floplines, [player.name for player in self.players])
 
     def _parse_street(self, street):
         try:
             start = self._splitted.index(street.upper()) + 1
             self._parse_streetline(start, street)
-            stop = next(v for v in self._sections if v > start)
+            stop = self._next_section(start)
             street_actions = self._splitted[start + 1 : stop]
             setattr(
                 self,
@@ -253,17 +283,20 @@ class FullTiltPokerHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHisto
         self.river = Card(cards[4]) if len(cards) > 4 else None
 
     def _parse_winners(self):
-        winners = set()
+        winnings = {}
         start = self._sections[-1] + 4
         for line in self._splitted[start:]:
             if not self.show_down and "collected" in line:
                 match = self._winner_re.match(line)
-                winners.add(match.group("name"))
             elif self.show_down and "won" in line:
                 match = self._showdown_re.match(line)
-                winners.add(match.group("name"))
+            else:
+                continue
+            name = match.group("name")
+            winnings[name] = winnings.get(name, 0) + _make_int(match.group("amount"))
 
-        self.winners = tuple(winners)
+        self.winners = tuple(winnings)
+        self.winnings = winnings
 
     def _parse_extra(self):
         # tournament name already parsed in header
@@ -1,3 +1,4 @@
+import itertools
 import re
 from decimal import Decimal
 
@@ -5,7 +6,7 @@ import pytz
 from zope.interface import implementer
 
 from .. import handhistory as hh
-from ..constants import Action, Currency, Game, GameType, Limit, MoneyType
+from ..constants import Action, Currency, Game, GameType, Limit, MoneyType, PokerRoom
 from ..hand import Card, Combo
 
 __all__ = ["PKRHandHistory"]
@@ -20,47 +21,52 @@ class _Street(hh._BaseStreet):
             Card(boardline[16:19:2]),
         )
 
-    def _parse_actions(self, actionlines):
-        actions = []
+    def _parse_actions(self, actionlines, names=()):
+        super()._parse_actions(actionlines, names)
         for line in actionlines:
             if line.startswith("Pot sizes:"):
                 self._parse_pot(line)
-            elif " " in line:
-                actions.append(hh._PlayerAction(*self._parse_player_action(line)))
-            else:
-                raise
-        self.actions = tuple(actions) if actions else None
 
     def _parse_pot(self, line):
         amount_start_index = 12
         amount = line[amount_start_index:]
         self.pot = Decimal(amount)
 
-    def _parse_player_action(self, line):
-        space_index = line.find(" ")
-        name = line[:space_index]
-        end_action_index = line.find(" ", space_index + 1)
-        # -1 means not found
-        if end_action_index == -1:
-            end_action_index = None  # until the end
-        action = Action(line[space_index + 1 : end_action_index])
-        if end_action_index:
-            amount_start_index = line.find("$") + 1
-            amount = line[amount_start_index:]
-            return name, action, Decimal(amount)
+    @classmethod
+    def _split_action(cls, line, names):
+        if line.startswith("Pot sizes:"):
+            return None
+        name, action_text = hh._split_name(line, names)
+        if action_text:
+            return cls._parse_player_action(name, action_text)
         else:
-            return name, action, None
+            raise ValueError("bad action line")
+
+    @staticmethod
+    def _parse_player_action(name, action_text):
+        action, _, amount = action_text.partition(" ")
+        if amount:
+            amount_start_index = amount.find("$") + 1
+            # cut off " (all-in)"
+            amount, _, _ = amount[amount_start_index:].partition(" ")
+            return name, Action(action), Decimal(amount)
+        else:
+            return name, Action(action), None
 
 
 @implementer(hh.IHandHistory)
 class PKRHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory):
     """Parses PKR hand histories."""
 
+    room = PokerRoom.PKR
+    _street_class = _Street
+
     currency = Currency.USD
     tournament_ident = None
     tournament_name = None
     tournament_level = None
 
+    _HEADER_LINES = 9
     _DATE_FORMAT = "%d %b %Y %H:%M:%S"
     _TZ = pytz.UTC
     _SPLIT_CARD_SPACE = slice(0, 3, 2)
@@ -72,34 +78,69 @@ class PKRHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory):
     _sizes_re = re.compile(r"^Pot sizes: \$([\d.]*)$")
     _card_re = re.compile(r"\[(. .)\]")
     _rake_re = re.compile(r"Rake of \$([\d.]*) from pot \d$")
-    _win_re = re.compile(r"^(.*) wins \$([\d.]*) with: ")
+    # without showdown, the hand is not shown after the amount
+    _win_re = re.compile(r"^(.*) wins \$([\d.]*)(?: with: |$)")
+    _post_re = re.compile(
+        r"^(?P<name>.+?) posts (?:(?P<ante>ante)|small blind|big blind) \(\$(?P<amount>[\d.]+)\)$"
+    )
+    # posts are between sections[0] and sections[1]
+    _POSTS_SECTION = 1
+    # "calls $1.25" after the big blind of $0.50 means $0.75 more
+    _CALL_TO = True
 
     def parse_header(self):
-        # sections[1] is after blinds, before preflop
-        # section[2] is before flop
-        # sections[-1] is before showdown
-        self._split_raw()
-
-        self.table_name = self._splitted[0][6:]  # cut off "Table "
-        self.ident = self._splitted[1][15:]  # cut off "Starting Hand #"
-        self._parse_date(self._splitted[2][20:])  # cut off "Start time of hand: "
-        self.game = Game(self._splitted[4][11:])  # cut off "Game Type: "
-        self.limit = Limit(self._splitted[5][12:])  # cut off "Limit Type: "
-        self.game_type = GameType(self._splitted[6][12:])  # cut off "Table Type: "
-
-        match = self._blinds_re.match(self._splitted[8])
+        header_lines = self._get_header_lines()
+        self.table_name = header_lines[0][6:]  # cut off "Table "
+        self.ident = header_lines[1][15:]  # cut off "Starting Hand #"
+        self._parse_date(header_lines[2][20:])  # cut off "Start time of hand: "
+        self.game = Game(header_lines[4][11:])  # cut off "Game Type: "
+        self.limit = Limit(header_lines[5][12:])  # cut off "Limit Type: "
+        self.game_type = GameType(header_lines[6][12:])  # cut off "Table Type: "
+
+        match = self._blinds_re.match(header_lines[8])
         self.sb = Decimal(match.group(1))
         self.bb = Decimal(match.group(2))
         self.buyin = self.bb * 100
 
-    def parse(self):
-        """Parses the body of the hand history, but first parse header if not yet parsed."""
+        self.header_parsed = True
+
+    _LAZY_PARSERS = hh._make_lazy_parsers(
+        {
+            ("players", "max_players", "button", "hero"): (
+                "_parse_players",
+                "_parse_button",
+                "_parse_hero",
+            ),
+            ("posts",): ("_parse_posts",),
+            ("preflop_actions",): ("_parse_preflop",),
+            ("flop",): ("_parse_flop",),
+            ("turn", "turn_actions", "turn_pot"): (("_parse_street", "turn"),),
+            ("river", "river_actions", "river_pot"): (("_parse_street", "river"),),
+            ("show_down", "winners", "winnings", "total_pot", "rake"): ("_parse_showdown",),
+        }
+    )
+
+    def parse(self, lazy=False):
+        """Parses the body of the hand history, but first parse header if not yet parsed.
+        If lazy is True, attributes are parsed on first access, except extra.
+        """
         if not self.header_parsed:
             self.parse_header()
 
+        # sections[1] is after blinds, before preflop
+        # section[2] is before flop
+        # sections[-1] is before showdown
+        self._split_raw()
+
+        if lazy:
+            self._parse_extra()
+            self._start_lazy_parsing()
+            return
+
         self._parse_players()
         self._parse_button()
         self._parse_hero()
+        self._parse_posts()
         self._parse_preflop()
         self._parse_flop()
         self._parse_street("turn")
@@ -114,7 +155,7 @@ class PKRHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory):
         # In hh there is no indication of max_players,
         # so init for 10, as there are 10 player tables on PKR.
         players = self._init_seats(10)
-        for line in self._splitted[10:]:
+        for line in itertools.islice(self._splitted, 10, None):
             match = self._seat_re.match(line)
             if not match:
                 break
@@ -157,9 +198,9 @@ class PKRHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory):
     def _parse_flop(self):
         flop_section = self._STREET_SECTIONS["flop"]
         start = self._sections[flop_section] + 1
-        stop = next(v for v in self._sections if v > start)
+        stop = self._next_section(start)
         floplines = self._splitted[start:stop]
-        self.flop = _Street(floplines)
+        self.flop = _Street(floplines, [player.name for player in self.players])
 
     def _parse_street(self, street):
         section = self._STREET_SECTIONS[street]
@@ -172,7 +213,7 @@ class PKRHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory):
             ]
             setattr(self, street, Card(cards[0]))
 
-            stop = next(v for v in self._sections if v > start) - 1
+            stop = self._next_section(start) - 1
             setattr(self, f"{street}_actions", tuple(self._splitted[start + 1 : stop]))
 
             sizes_line = self._splitted[start - 2]
@@ -190,17 +231,22 @@ class PKRHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory):
         match = self._rake_re.match(rake_line)
         self.rake = Decimal(match.group(1))
 
+        self.show_down = False
         winners = []
+        winnings = {}
         total_pot = self.rake
         for line in self._splitted[start:]:
             if "shows" in line:
                 self.show_down = True
             elif "wins" in line:
                 match = self._win_re.match(line)
-                winners.append(match.group(1))
-                total_pot += Decimal(match.group(2))
+                name, amount = match.group(1), Decimal(match.group(2))
+                winners.append(name)
+                winnings[name] = winnings.get(name, 0) + amount
+                total_pot += amount
 
         self.winners = tuple(winners)
+        self.winnings = winnings
         self.total_pot = total_pot
 
     def _parse_extra(self):
@@ -1,3 +1,4 @@
+import itertools
 import re
 from datetime import datetime
 from decimal import Decimal
@@ -10,7 +11,7 @@ from zope.interface import implementer
 
 from .. import handhistory as hh
 from ..card import Card
-from ..constants import Action, Currency, Game, GameType, Limit, MoneyType
+from ..constants import Action, Currency, Game, GameType, Limit, MoneyType, PokerRoom
 from ..hand import Combo
 
 __all__ = ["PokerStarsHandHistory", "Notes"]
@@ -18,29 +19,35 @@ __all__ = ["PokerStarsHandHistory", "Notes"]
 
 @implementer(hh.IStreet)
 class _Street(hh._BaseStreet):
+    # chat and table events between the actions, which are not actions themselves
+    _table_event_re = re.compile(
+        r' said, "| has timed out| is (?:dis)?connected| has returned| joins the table'
+        r"| leaves the table| will be allowed to play| was removed from the table|: sits out"
+        r"|: is sitting out"
+    )
+
     def _parse_cards(self, boardline):
         self.cards = (Card(boardline[1:3]), Card(boardline[4:6]), Card(boardline[7:9]))
 
-    def _parse_actions(self, actionlines):
-        actions = []
-        for line in actionlines:
-            if line.startswith("Uncalled bet"):
-                action = self._parse_uncalled(line)
-            elif "collected" in line:
-                action = self._parse_collected(line)
-            elif "doesn't show hand" in line:
-                action = self._parse_muck(line)
-            elif ' said, "' in line:  # skip chat lines
-                continue
-            elif ":" in line:
-                action = self._parse_player_action(line)
-            else:
-                raise RuntimeError("bad action line: " + line)
-
-            actions.append(hh._PlayerAction(*action))
-        self.actions = tuple(actions) if actions else None
+    @classmethod
+    def _split_action(cls, line, names):
+        if cls._table_event_re.search(line):
+            return None
+        elif line.startswith("Uncalled bet"):
+            return cls._parse_uncalled(line)
+        elif "collected" in line:
+            return cls._parse_collected(*hh._split_name(line, names))
+        elif "doesn't show hand" in line:
+            return cls._parse_muck(line)
+        elif ": shows [" in line:
+            return cls._parse_show(line)
+        elif ":" in line:
+            return cls._parse_player_action(line)
+        else:
+            raise ValueError("bad action line")
 
-    def _parse_uncalled(self, line):
+    @staticmethod
+    def _parse_uncalled(line):
         first_paren_index = line.find("(")
         second_paren_index = line.find(")")
         amount = line[first_paren_index + 1 : second_paren_index]
@@ -48,21 +55,25 @@ class _Street(hh._BaseStreet):
         name = line[name_start_index:]
         return name, Action.RETURN, Decimal(amount)
 
-    def _parse_collected(self, line):
-        first_space_index = line.find(" ")
-        name = line[:first_space_index]
-        second_space_index = line.find(" ", first_space_index + 1)
-        third_space_index = line.find(" ", second_space_index + 1)
-        amount = line[second_space_index + 1 : third_space_index]
-        self.pot = Decimal(amount)
-        return name, Action.WIN, self.pot
+    @staticmethod
+    def _parse_collected(name, action_text):
+        # "collected 100 from pot"
+        _, amount, _ = action_text.split(" ", 2)
+        return name, Action.WIN, Decimal(amount)
 
-    def _parse_muck(self, line):
+    @staticmethod
+    def _parse_muck(line):
         colon_index = line.find(":")
         name = line[:colon_index]
         return name, Action.MUCK, None
 
-    def _parse_player_action(self, line):
+    @staticmethod
+    def _parse_show(line):
+        name, _, _ = line.partition(": shows [")
+        return name, Action.SHOW, None
+
+    @staticmethod
+    def _parse_player_action(line):
         name, _, action = line.partition(": ")
         action, _, amount = action.partition(" ")
         amount, _, _ = amount.partition(" ")
@@ -77,9 +88,11 @@ class _Street(hh._BaseStreet):
 class PokerStarsHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory):
     """Parses PokerStars Tournament hands."""
 
+    room = PokerRoom.STARS
+    _street_class = _Street
+
     _DATE_FORMAT = "%Y/%m/%d %H:%M:%S ET"
     _TZ = pytz.timezone("US/Eastern")  # ET
-    _split_re = re.compile(r" ?\*\*\* ?\n?|\n")
     _header_re = re.compile(
         r"""
                         ^PokerStars\s+                                # Poker Room
@@ -114,17 +127,29 @@ class PokerStarsHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory)
     )  # noqa
     _hero_re = re.compile(r"^Dealt to (?P<hero_name>.+?) \[(..) (..)\]")
     _pot_re = re.compile(r"^Total pot (\d+(?:\.\d+)?) .*\| Rake (\d+(?:\.\d+)?)")
-    _winner_re = re.compile(r"^Seat (\d+): (.+?) collected \((\d+(?:\.\d+)?)\)")
-    _showdown_re = re.compile(r"^Seat (\d+): (.+?) showed \[.+?\] and won")
+    # names are followed by the position of the player in some lines, e.g. "(button)"
+    _winner_re = re.compile(
+        r"^Seat (\d+): (.+?)(?: \((?:button|small blind|big blind)\))? "
+        r"collected \(\$?(?P<amount>[\d,]+(?:\.\d+)?)\)"
+    )
+    _showdown_re = re.compile(
+        r"^Seat (\d+): (.+?)(?: \((?:button|small blind|big blind)\))? "
+        r"showed \[.+?\] and won \(\$?(?P<amount>[\d,]+(?:\.\d+)?)\)"
+    )
     _ante_re = re.compile(r".*posts the ante (\d+(?:\.\d+)?)")
+    _post_re = re.compile(
+        r"^(?P<name>.+?): posts "
+        r"(?:(?P<ante>the ante)|small blind|big blind|(?P<dead_small>small & big blinds)) "
+        r"\$?(?P<amount>\d+(?:\.\d+)?)"
+    )
+    # posts are before sections[0]
+    _POSTS_SECTION = 0
+    # raise amounts are the raise itself, e.g. "raises 60 to 80"
+    _RAISE_TO = False
     _board_re = re.compile(r"(?<=[\[ ])(..)(?=[\] ])")
 
     def parse_header(self):
-        # sections[0] is before HOLE CARDS
-        # sections[-1] is before SUMMARY
-        self._split_raw()
-
-        match = self._header_re.match(self._splitted[0])
+        match = self._header_re.match(self._get_header_lines()[0])
 
         self.extra = dict()
         self.ident = match.group("ident")
@@ -169,15 +194,49 @@ class PokerStarsHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory)
 
         self.header_parsed = True
 
-    def parse(self):
-        """Parses the body of the hand history, but first parse header if not yet parsed."""
+    _LAZY_PARSERS = hh._make_lazy_parsers(
+        {
+            ("table_name", "max_players"): ("_parse_table",),
+            ("players", "button", "hero"): (
+                "_parse_table",
+                "_parse_players",
+                "_parse_button",
+                "_parse_hero",
+            ),
+            ("posts",): ("_parse_posts",),
+            ("preflop_actions",): ("_parse_preflop",),
+            ("flop",): ("_parse_flop",),
+            ("turn", "turn_actions", "river", "river_actions"): (
+                ("_parse_street", "turn"),
+                ("_parse_street", "river"),
+                "_parse_board",
+            ),
+            ("show_down",): ("_parse_showdown",),
+            ("total_pot",): ("_parse_pot",),
+            ("winners", "winnings"): ("_parse_showdown", "_parse_winners"),
+        }
+    )
+
+    def parse(self, lazy=False):
+        """Parses the body of the hand history, but first parse header if not yet parsed.
+        If lazy is True, attributes are parsed on first access.
+        """
         if not self.header_parsed:
             self.parse_header()
 
+        # sections[0] is before HOLE CARDS
+        # sections[-1] is before SUMMARY
+        self._split_raw()
+
+        if lazy:
+            self._start_lazy_parsing()
+            return
+
         self._parse_table()
         self._parse_players()
         self._parse_button()
         self._parse_hero()
+        self._parse_posts()
         self._parse_preflop()
         self._parse_flop()
         self._parse_street("turn")
@@ -197,7 +256,7 @@ class PokerStarsHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory)
 
     def _parse_players(self):
         self.players = self._init_seats(self.max_players)
-        for line in self._splitted[2:]:
+        for line in itertools.islice(self._splitted, 2, None):
             match = self._seat_re.match(line)
             # we reached the end of the players section
             if not match:
@@ -236,7 +295,7 @@ class PokerStarsHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory)
             return
         stop = self._splitted.index("", start)
         floplines = self._splitted[start:stop]
-        self.flop = _Street(floplines)
+        self.flop = _Street(floplines, [player.name for player in self.players])
 
     def _parse_street(self, street):
         try:
@@ -269,17 +328,20 @@ class PokerStarsHandHistory(hh._SplittableHandHistoryMixin, hh._BaseHandHistory)
         self.river = Card(cards[4]) if len(cards) > 4 else None
 
     def _parse_winners(self):
-        winners = set()
+        winnings = {}
         start = self._sections[-1] + 4
         for line in self._splitted[start:]:
             if not self.show_down and "collected" in line:
                 match = self._winner_re.match(line)
-                winners.add(match.group(2))
             elif self.show_down and "won" in line:
                 match = self._showdown_re.match(line)
-                winners.add(match.group(2))
+            else:
+                continue
+            amount = Decimal(match.group("amount").replace(",", ""))
+            winnings[match.group(2)] = winnings.get(match.group(2), 0) + amount
 
-        self.winners = tuple(winners)
+        self.winners = tuple(winnings)
+        self.winnings = winnings
 
 
 @attr.s(slots=True)
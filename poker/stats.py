@@ -0,0 +1,469 @@
+"""
+    HUD-style player statistics of parsed hand histories.
+
+    Every hand is replayed once with :class:`poker.replay.HandReplay` and only integer counters
+    are updated, so hands can be streamed right from the parser and thrown away.
+    Counters of different hands can be added together, so statistics collected by parallel
+    workers are simply merged at the end.
+
+    Stats can be saved to a snapshot file and updated later with new hands only.
+    A snapshot is one little-endian binary file: a header, one fixed size record of counters
+    for every player sorted by name, the end offsets of the names and the UTF-8 names. It can be
+    used memory mapped with :class:`StatsSnapshot` without reading it all, and snapshots from
+    several machines can be merged with :func:`merge_snapshots` one player at a time.
+"""
+
+import array
+import functools
+import heapq
+import itertools
+import mmap
+import operator
+import os
+import struct
+import sys
+from pathlib import Path
+
+import attr
+
+from .constants import GameType, PokerRoom
+from .handhistory import _iter_chunk_hand_histories, _map_chunks, get_parser
+from .replay import _ANTE, _BET, _CALL, _FOLD, _POST, _RAISE, _WIN, HandReplay
+
+__all__ = ["PlayerStats", "Stats", "StatsSnapshot", "collect_stats", "merge_snapshots"]
+
+
+_PREFLOP, _FLOP = 0, 1
+_FORCED = frozenset((_POST, _ANTE))
+_AGGRESSIVE = frozenset((_BET, _RAISE))
+# answers to a bet, other actions (e.g. THINK) are not decisions
+_RESPONSES = frozenset((_FOLD, _CALL, _RAISE))
+
+
+def _percent(count, chances):
+    return 100 * count / chances if chances else None
+
+
+@attr.s(slots=True)
+class PlayerStats:
+    """Counters of one player. Percentages are None when the player had no chance yet."""
+
+    hands = attr.ib(default=0)
+    voluntarily_put = attr.ib(default=0)
+    preflop_raised = attr.ib(default=0)
+    three_bet_chances = attr.ib(default=0)
+    three_bets = attr.ib(default=0)
+    cbets_faced = attr.ib(default=0)
+    cbets_folded = attr.ib(default=0)
+    saw_flop = attr.ib(default=0)
+    showdowns = attr.ib(default=0)
+    showdowns_won = attr.ib(default=0)
+    won_bb = attr.ib(default=0.0)
+
+    def __add__(self, other):
+        return PlayerStats(*(a + b for a, b in zip(attr.astuple(self), attr.astuple(other))))
+
+    def merge(self, other):
+        """Add the counters of other to this one in place."""
+        for field in _FIELD_NAMES:
+            setattr(self, field, getattr(self, field) + getattr(other, field))
+
+    @property
+    def vpip(self):
+        """Voluntarily put money in pot preflop, percent of hands."""
+        return _percent(self.voluntarily_put, self.hands)
+
+    @property
+    def pfr(self):
+        """Preflop raise, percent of hands."""
+        return _percent(self.preflop_raised, self.hands)
+
+    @property
+    def three_bet(self):
+        """Reraise of the first preflop raise, percent of chances."""
+        return _percent(self.three_bets, self.three_bet_chances)
+
+    @property
+    def fold_to_cbet(self):
+        """Folds to continuation bets on the flop, percent of continuation bets faced."""
+        return _percent(self.cbets_folded, self.cbets_faced)
+
+    @property
+    def wtsd(self):
+        """Went to showdown, percent of flops seen."""
+        return _percent(self.showdowns, self.saw_flop)
+
+    @property
+    def wsd(self):
+        """Won at showdown (W$SD), percent of showdowns."""
+        return _percent(self.showdowns_won, self.showdowns)
+
+    @property
+    def bb_per_100(self):
+        """Big blinds won per 100 hands."""
+        return 100 * self.won_bb / self.hands if self.hands else None
+
+
+_FIELD_NAMES = tuple(field.name for field in attr.fields(PlayerStats))
+
+_SNAPSHOT_MAGIC = b"PKST"
+_SNAPSHOT_VERSION = 1
+# magic, version, number of hands, number of players
+_SNAPSHOT_HEADER = struct.Struct("<4sIQQ")
+# counters of a player in the order of PlayerStats fields
+_SNAPSHOT_RECORD = struct.Struct(
+    "<"
+    + "".join(
+        "d" if isinstance(field.default, float) else "Q" for field in attr.fields(PlayerStats)
+    )
+)
+_NAME_OFFSET = struct.Struct("<Q")
+
+
+class Stats:
+    """:class:`PlayerStats` of every player by name. Add parsed hand histories with
+    :meth:`update`, combine with other instances with :meth:`merge` or ``+``.
+
+    :ivar int hands:    number of hands added
+    :ivar dict players: player name: :class:`PlayerStats`
+    """
+
+    def __init__(self):
+        self.hands = 0
+        self.players = {}
+
+    def __len__(self):
+        return len(self.players)
+
+    def __iter__(self):
+        return iter(self.players)
+
+    def __contains__(self, name):
+        return name in self.players
+
+    def __getitem__(self, name):
+        return self.players[name]
+
+    def __add__(self, other):
+        stats = Stats()
+        stats.merge(self)
+        stats.merge(other)
+        return stats
+
+    def merge(self, other):
+        """Add the counters of other to this one in place."""
+        self.hands += other.hands
+        for name, player_stats in other.players.items():
+            try:
+                self.players[name].merge(player_stats)
+            except KeyError:
+                self.players[name] = PlayerStats() + player_stats
+
+    def write(self, path):
+        """Write a snapshot file, which can be updated later with :meth:`read`, :meth:`update`
+        and :meth:`write` again, without the hands already counted.
+        """
+        path = Path(path)
+        temp_path = _write_snapshot(path, self.hands, sorted(self.players.items()))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def read(cls, path):
+        """Read every player from a snapshot written by :meth:`write`."""
+        self = cls()
+        with StatsSnapshot(path) as snapshot:
+            self.hands = snapshot.hands
+            self.players = dict(snapshot.items())
+        return self
+
+    def update(self, hand_histories):
+        """Add every parsed hand history from an iterable."""
+        for hh in hand_histories:
+            self.add(hh)
+
+    def add(self, hh):
+        """Add the counters of one parsed hand history."""
+        replay = HandReplay(hh)
+        names = replay.names
+        num_players = len(names)
+        dealt = [False] * num_players
+        vpip = [False] * num_players
+        pfr = [False] * num_players
+        three_bet_chance = [False] * num_players
+        three_bet = [False] * num_players
+        cbet_faced = [False] * num_players
+        cbet_folded = [False] * num_players
+        folded = [False] * num_players
+        folded_preflop = None
+
+        raises = 0
+        aggressor = None
+        flop_bet = False
+        cbet_open = False
+
+        for street, player, action in zip(replay.streets, replay.players, replay.actions):
+            dealt[player] = True
+            if action == _FOLD:
+                folded[player] = True
+
+            if street == _PREFLOP:
+                if action in _FORCED:
+                    continue
+                facing_open = raises == 1 and player != aggressor
+                if facing_open:
+                    three_bet_chance[player] = True
+                if action in _AGGRESSIVE:
+                    vpip[player] = pfr[player] = True
+                    if facing_open:
+                        three_bet[player] = True
+                    raises += 1
+                    aggressor = player
+                elif action == _CALL:
+                    vpip[player] = True
+                continue
+
+            if folded_preflop is None:
+                folded_preflop = list(folded)
+            if street != _FLOP:
+                continue
+
+            if not flop_bet:
+                if action in _AGGRESSIVE:
+                    flop_bet = True
+                    cbet_open = player == aggressor
+            elif cbet_open and action in _RESPONSES and not cbet_faced[player]:
+                cbet_faced[player] = True
+                cbet_folded[player] = action == _FOLD
+                # after a raise the others don't face the continuation bet anymore
+                cbet_open = action != _RAISE
+
+        if folded_preflop is None:
+            folded_preflop = folded
+        saw_flop = hh.flop is not None
+        show_down = bool(hh.show_down)
+        winners = set(hh.winners or ())
+        won = self._won_amounts(hh, replay, winners)
+        bb = replay.to_units(hh.bb)
+
+        self.hands += 1
+        players = self.players
+        for index, name in enumerate(names):
+            if not dealt[index]:
+                continue
+            try:
+                stats = players[name]
+            except KeyError:
+                stats = players[name] = PlayerStats()
+            stats.hands += 1
+            stats.voluntarily_put += vpip[index]
+            stats.preflop_raised += pfr[index]
+            stats.three_bet_chances += three_bet_chance[index]
+            stats.three_bets += three_bet[index]
+            stats.cbets_faced += cbet_faced[index]
+            stats.cbets_folded += cbet_folded[index]
+            stats.won_bb += won[index] / bb
+            if saw_flop and not folded_preflop[index]:
+                stats.saw_flop += 1
+                if show_down and not folded[index]:
+                    stats.showdowns += 1
+                    stats.showdowns_won += name in winners
+
+    @staticmethod
+    def _won_amounts(hh, replay, winners):
+        """Net amount won by every player in units of the replay, in the order of names."""
+        won = [
+            final - start for final, start in zip(replay.final_stacks, replay.starting_stacks)
+        ]
+        winnings = getattr(hh, "winnings", None)
+        if winnings is not None:
+            # pots won at showdown are not actions in every room, every winner gets the rest of
+            # what they collected, so side pots go to their winners
+            for player, action, amount in zip(replay.players, replay.actions, replay.amounts):
+                if action == _WIN:
+                    won[player] -= amount
+            for index, name in enumerate(replay.names):
+                won[index] += replay.to_units(winnings.get(name, 0))
+            return won
+
+        # without the collected amounts, share what is left after rake
+        pot = replay.pots[-1] if len(replay) else 0
+        # rake of tournaments is the fee of the buyin, not taken from the pot
+        if hh.game_type is GameType.CASH and hh.rake:
+            pot -= replay.to_units(hh.rake)
+        winner_indexes = [
+            index for index, name in enumerate(replay.names) if name in winners
+        ]
+        if pot > 0 and winner_indexes:
+            share = pot / len(winner_indexes)
+            for index in winner_indexes:
+                won[index] += share
+        return won
+
+
+class StatsSnapshot:
+    """Read only, memory mapped snapshot file written by :meth:`Stats.write`. Players are
+    looked up by binary search on the names in the file, only the records which are accessed
+    are read. Can be used as a context manager, which closes the file at the end.
+
+    :ivar int hands:    number of hands counted in the snapshot
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can't be mapped
+            self._file.close()
+            raise ValueError(f"Not a stats snapshot: {path}")
+        try:
+            self._read_header(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._num_players
+
+    def __iter__(self):
+        """Player names in sorted order."""
+        return (self._name(index).decode() for index in range(self._num_players))
+
+    def __contains__(self, name):
+        return self._find(name) is not None
+
+    def __getitem__(self, name):
+        index = self._find(name)
+        if index is None:
+            raise KeyError(name)
+        return self._record(index)
+
+    def items(self):
+        """(name, :class:`PlayerStats`) of every player in sorted order of names."""
+        for index in range(self._num_players):
+            yield self._name(index).decode(), self._record(index)
+
+    def close(self):
+        self._mmap.close()
+        self._file.close()
+
+    def _read_header(self, path):
+        try:
+            magic, version, self.hands, self._num_players = _SNAPSHOT_HEADER.unpack_from(
+                self._mmap
+            )
+        except struct.error:
+            raise ValueError(f"Not a stats snapshot: {path}")
+        if magic != _SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a stats snapshot: {path}")
+        if version != _SNAPSHOT_VERSION:
+            raise ValueError(f"Unknown format version: {version}")
+        self._offsets_start = _SNAPSHOT_HEADER.size + self._num_players * _SNAPSHOT_RECORD.size
+        self._names_start = self._offsets_start + self._num_players * _NAME_OFFSET.size
+        if len(self._mmap) < self._names_start:
+            raise ValueError(f"Truncated stats snapshot: {path}")
+
+    def _name(self, index):
+        start = self._name_offset(index - 1) if index > 0 else 0
+        end = self._name_offset(index)
+        return self._mmap[self._names_start + start : self._names_start + end]
+
+    def _name_offset(self, index):
+        position = self._offsets_start + index * _NAME_OFFSET.size
+        return _NAME_OFFSET.unpack_from(self._mmap, position)[0]
+
+    def _record(self, index):
+        position = _SNAPSHOT_HEADER.size + index * _SNAPSHOT_RECORD.size
+        return PlayerStats(*_SNAPSHOT_RECORD.unpack_from(self._mmap, position))
+
+    def _find(self, name):
+        # UTF-8 bytes sort the same way as str
+        name = name.encode()
+        low, high = 0, self._num_players
+        while low < high:
+            middle = (low + high) // 2
+            if self._name(middle) < name:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._num_players and self._name(low) == name:
+            return low
+        return None
+
+
+def _write_snapshot(path, hands, players):
+    """Write (name, PlayerStats) pairs sorted by name to a temporary file next to path.
+    Returns the path of the temporary file, which should replace path.
+    """
+    temp_path = path.with_name(path.name + ".tmp")
+    names = bytearray()
+    offsets = array.array("Q")
+    with temp_path.open("wb") as f:
+        # header is written at the end, when the number of players is known
+        f.write(bytes(_SNAPSHOT_HEADER.size))
+        for name, stats in players:
+            f.write(_SNAPSHOT_RECORD.pack(*attr.astuple(stats, recurse=False)))
+            names += name.encode()
+            offsets.append(len(names))
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        offsets.tofile(f)
+        f.write(names)
+        f.seek(0)
+        f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, hands, len(offsets)))
+    return temp_path
+
+
+def merge_snapshots(paths, destination):
+    """Merge snapshot files into destination, which can be one of paths. Players are merged
+    one at a time from the sorted snapshots, so they are never loaded into memory at once.
+    """
+    destination = Path(destination)
+    snapshots = [StatsSnapshot(path) for path in paths]
+    try:
+        hands = sum(snapshot.hands for snapshot in snapshots)
+        by_name = operator.itemgetter(0)
+        items = heapq.merge(*(snapshot.items() for snapshot in snapshots), key=by_name)
+        players = (
+            (name, functools.reduce(operator.add, (stats for _, stats in group)))
+            for name, group in itertools.groupby(items, key=by_name)
+        )
+        temp_path = _write_snapshot(destination, hands, players)
+    finally:
+        for snapshot in snapshots:
+            snapshot.close()
+    os.replace(temp_path, destination)
+
+
+def _collect_chunk(room, filename, start, end):
+    stats = Stats()
+    for hh in _iter_chunk_hand_histories(room, filename, start, end):
+        hh.parse()
+        stats.add(hh)
+    return stats
+
+
+def collect_stats(paths, room=None, workers=None):
+    """Collect :class:`Stats` of every hand in every file of paths with a pool of worker
+    processes, like :func:`poker.handhistory.parse_many`. Every worker counts chunks of
+    the files, the results are merged as they are done.
+
+    :param room: :class:`poker.constants.PokerRoom` of the hand histories, detected for every
+        hand if None.
+    :param workers: Number of processes, ``os.cpu_count()`` by default. With 1, files are
+        processed in the current process.
+    """
+    if room is not None:
+        room = PokerRoom(room)
+        get_parser(room)
+    collect_chunk = functools.partial(_collect_chunk, room)
+    stats = Stats()
+    for chunk_stats in _map_chunks(collect_chunk, paths, workers):
+        stats.merge(chunk_stats)
+    return stats
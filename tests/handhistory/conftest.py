@@ -1,4 +1,5 @@
 import pytest
+from poker.replay import HandReplay
 from poker.room.pokerstars import PokerStarsHandHistory
 from . import stars_hands
 
@@ -17,3 +18,42 @@ def all_stars_hands(request):
     hh = PokerStarsHandHistory(request.param)
     hh.parse()
     return hh
+
+
+@pytest.fixture
+def stars_hand_texts():
+    """The first three PokerStars hands, for files with more hands."""
+    return (stars_hands.HAND1, stars_hands.HAND2, stars_hands.HAND3)
+
+
+def _write_hands(path, hands, separator="\n\n\n"):
+    path.write_text(separator.join(hand.strip() for hand in hands) + "\n\n")
+    return path
+
+
+@pytest.fixture
+def write_hands():
+    """Function writing hands to a file separated by empty lines, returns the path."""
+    return _write_hands
+
+
+def _parse_hand(parser, hand_text):
+    hh = parser(hand_text)
+    hh.parse()
+    return hh
+
+
+@pytest.fixture
+def parse_hand():
+    """Function making a parsed hand history with a parser class from a hand text."""
+    return _parse_hand
+
+
+@pytest.fixture
+def replay_hand():
+    """Function making a HandReplay with a parser class from a hand text."""
+
+    def replay_hand(parser, hand_text):
+        return HandReplay(_parse_hand(parser, hand_text))
+
+    return replay_hand
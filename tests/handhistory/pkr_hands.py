@@ -227,3 +227,23 @@ Seat 1: grolongo - $50.25
 Seat 6: Walkman - $49.75
 End of Hand #2433298488
 """
+
+# holdem_full, but Capricorn folds to a bet on the river, so nobody shows down
+HOLDEM_NO_SHOW_DOWN = HANDS["holdem_full"].replace(
+    """barly123 checks
+Capricorn checks
+Pot sizes: $10.97
+Taking Rake of $0.54 from pot 1
+barly123 shows [A h][J c]
+barly123 has Three of a Kind: Jacks
+Capricorn mucks
+barly123 wins $10.43 with: Three of a Kind: Jacks
+""",
+    """barly123 bets $2
+Capricorn folds
+Pot sizes: $10.97
+Taking Rake of $0.54 from pot 1
+barly123 doesn't show
+barly123 wins $10.43
+""",
+)
@@ -0,0 +1,130 @@
+import json
+import math
+
+import pytest
+from poker.card import Card
+from poker.columnar import HandTables
+from poker.replay import HandReplay
+from poker.room.fulltiltpoker import FullTiltPokerHandHistory
+from poker.room.pkr import PKRHandHistory
+from poker.room.pokerstars import PokerStarsHandHistory
+from poker.stats import Stats
+
+from . import ftp_hands, pkr_hands, stars_hands
+
+
+@pytest.fixture
+def hand_histories(parse_hand):
+    return [
+        parse_hand(PokerStarsHandHistory, stars_hands.HAND1),
+        parse_hand(PokerStarsHandHistory, stars_hands.HAND3),
+        parse_hand(PKRHandHistory, pkr_hands.HANDS["holdem_full"]),
+        parse_hand(FullTiltPokerHandHistory, ftp_hands.HAND1),
+    ]
+
+
+@pytest.fixture
+def tables(hand_histories):
+    return HandTables.from_hand_histories(hand_histories)
+
+
+def _rows(table):
+    # NaN != NaN, compare by repr
+    return repr(list(table))
+
+
+def test_number_of_rows(tables):
+    assert len(tables) == len(tables.hands) == 4
+    assert len(tables.players) == 9 + 8 + 5 + 9
+    assert len(tables.boards) == 3
+
+
+def test_hands(tables):
+    assert list(tables.hands["ident"]) == [
+        "105024000105",
+        "105026771696",
+        "2433297728",
+        "33286946295",
+    ]
+    assert list(tables.hands["room"]) == ["STARS", "STARS", "PKR", "FTP"]
+    assert tables.hands["bb"][2] == 0.5
+    assert tables.hands["currency"][3] is None
+    assert math.isnan(tables.hands["rake"][3])
+
+
+def test_dictionary_encoded_columns(tables):
+    game = tables.hands["game"]
+    assert game.dictionary == ["HOLDEM"]
+    assert list(game.data) == [0, 0, 0, 0]
+
+    action = tables.actions["action"]
+    assert len(action.dictionary) < len(action)
+    assert action.data.typecode == "B"
+
+
+def test_players(tables):
+    hero = [row for row in tables.players if row[0] == 0 and row[7]]
+    assert hero == [
+        (0, 5, "W2lkm2n", 3000.0, "UTG1", Card("Ac"), Card("Jh"), 1, 1),
+    ]
+
+
+def test_actions(tables):
+    first_hand_actions = [row[1:] for row in tables.actions if row[0] == 0]
+    assert first_hand_actions[:2] == [
+        ("preflop", "strongi82", "FOLD", first_hand_actions[0][3]),
+        ("preflop", "W2lkm2n", "RAISE", 40.0),
+    ]
+    assert math.isnan(first_hand_actions[0][3])
+    assert first_hand_actions[-2] == ("flop", "W2lkm2n", "WIN", 150.0)
+
+
+def test_player_names_with_spaces(parse_hand):
+    # "snake 422" folds preflop
+    hh = parse_hand(FullTiltPokerHandHistory, ftp_hands.TURBO_SNG)
+    tables = HandTables.from_hand_histories([hh])
+    actions = [row[1:4] for row in tables.actions]
+    assert ("preflop", "snake 422", "FOLD") in actions
+
+    replay = HandReplay(hh)
+    assert dict(zip(replay.names, replay.final_stacks))["snake 422"] == 1485
+    assert sum(replay.final_stacks) == sum(replay.starting_stacks)
+
+    stats = Stats()
+    stats.add(hh)
+    assert stats["snake 422"].hands == 1
+    assert stats["snake 422"].voluntarily_put == 0
+
+
+def test_boards(tables):
+    assert list(tables.boards)[:2] == [
+        (0, Card("2s"), Card("6d"), Card("6h"), None, None),
+        (2, Card("7d"), Card("3c"), Card("Jd"), Card("Js"), Card("5h")),
+    ]
+    assert list(tables.boards["turn"].data) == [-1, Card("Js").id, -1]
+
+
+def test_write_and_read(tables, tmp_path):
+    tables.write(tmp_path)
+    read_tables = HandTables.read(tmp_path)
+    for table, read_table in zip(tables.tables, read_tables.tables):
+        assert _rows(table) == _rows(read_table)
+
+
+def test_column_files_are_raw_arrays(tables, tmp_path):
+    tables.write(tmp_path)
+    metadata = json.loads((tmp_path / "metadata.json").read_text())
+    amount = metadata["tables"]["actions"]["columns"]["amount"]
+    assert amount["dtype"].endswith("f8")
+    size = (tmp_path / "actions.amount.bin").stat().st_size
+    assert size == 8 * metadata["tables"]["actions"]["rows"]
+
+
+def test_read_unknown_version(tables, tmp_path):
+    tables.write(tmp_path)
+    metadata_path = tmp_path / "metadata.json"
+    metadata = json.loads(metadata_path.read_text())
+    metadata["version"] = 0
+    metadata_path.write_text(json.dumps(metadata))
+    with pytest.raises(ValueError):
+        HandTables.read(tmp_path)
@@ -0,0 +1,167 @@
+import os
+import sqlite3
+
+import pytest
+from poker.constants import PokerRoom
+from poker.db import HandDatabase
+from poker.handhistory import parse_many
+from poker.room.pokerstars import PokerStarsHandHistory
+
+from . import ftp_hands, pkr_hands
+
+
+@pytest.fixture
+def db():
+    with HandDatabase() as db:
+        yield db
+
+
+def test_import_file(db, tmp_path, stars_hand_texts, write_hands):
+    path = write_hands(tmp_path / "stars.txt", stars_hand_texts)
+    assert db.import_file(path) == 3
+    assert len(db) == 3
+    assert (PokerRoom.STARS, "105024000105") in db
+    assert (PokerRoom.FTP, "105024000105") not in db
+
+
+def test_hand_row(db, tmp_path, stars_hand_texts, write_hands):
+    db.import_file(write_hands(tmp_path / "stars.txt", stars_hand_texts[:1]))
+    row = db.connection.execute(
+        'SELECT room, ident, game_type, game, "limit", sb, bb, board FROM hands'
+    ).fetchone()
+    assert row == ("STARS", "105024000105", "TOUR", "HOLDEM", "NL", 10, 20, "2s6d6h")
+
+
+def test_player_rows(db, tmp_path, stars_hand_texts, write_hands):
+    db.import_file(write_hands(tmp_path / "stars.txt", stars_hand_texts[:1]))
+    assert db.connection.execute("SELECT count(*) FROM players").fetchone() == (9,)
+    hero = db.connection.execute(
+        "SELECT name, seat, stack, combo, is_winner FROM players WHERE is_hero"
+    ).fetchone()
+    assert hero == ("W2lkm2n", 5, 3000, "AcJh", 1)
+
+
+def test_unchanged_file_is_skipped(db, tmp_path, monkeypatch, stars_hand_texts, write_hands):
+    path = write_hands(tmp_path / "stars.txt", stars_hand_texts)
+    db.import_file(path)
+    monkeypatch.setattr(PokerStarsHandHistory, "parse_header", None)
+    assert db.import_file(path) == 0
+    assert len(db) == 3
+
+
+def test_only_new_hands_are_parsed(db, tmp_path, monkeypatch, stars_hand_texts, write_hands):
+    path = write_hands(tmp_path / "stars.txt", stars_hand_texts[:2])
+    db.import_file(path)
+    write_hands(path, stars_hand_texts)
+    os.utime(path, (0, 0))
+
+    parsed = []
+    original_parse = PokerStarsHandHistory.parse
+
+    def parse(self):
+        parsed.append(self.ident)
+        original_parse(self)
+
+    monkeypatch.setattr(PokerStarsHandHistory, "parse", parse)
+    assert db.import_file(path) == 1
+    assert parsed == ["105026771696"]
+    assert len(db) == 3
+
+
+@pytest.fixture
+def parsed_headers(monkeypatch):
+    parsed = []
+    original_parse_header = PokerStarsHandHistory.parse_header
+
+    def parse_header(self):
+        original_parse_header(self)
+        parsed.append(self.ident)
+
+    monkeypatch.setattr(PokerStarsHandHistory, "parse_header", parse_header)
+    return parsed
+
+
+def test_appended_file_is_read_from_the_last_complete_hand(
+    db, tmp_path, parsed_headers, stars_hand_texts
+):
+    path = tmp_path / "stars.txt"
+    path.write_text(stars_hand_texts[0].strip() + "\n\n\n" + stars_hand_texts[1].strip() + "\n")
+    assert db.import_file(path) == 2
+    (offset,) = db.connection.execute('SELECT "offset" FROM files').fetchone()
+    assert offset == len(stars_hand_texts[0].strip()) + 3
+
+    with path.open("a") as f:
+        f.write("\n\n" + stars_hand_texts[2].strip() + "\n\n")
+    parsed_headers.clear()
+    assert db.import_file(path) == 1
+    # the second hand wasn't followed by an empty line, it could have been incomplete
+    assert parsed_headers == ["105034215446", "105026771696"]
+    (offset,) = db.connection.execute('SELECT "offset" FROM files').fetchone()
+    assert offset == path.stat().st_size
+    assert len(db) == 3
+
+
+def test_file_without_empty_line_is_read_again_from_the_start(db, tmp_path, stars_hand_texts):
+    path = tmp_path / "stars.txt"
+    path.write_text(stars_hand_texts[0].strip() + "\n")
+    db.import_file(path)
+    (offset,) = db.connection.execute('SELECT "offset" FROM files').fetchone()
+    assert offset == 0
+
+
+def test_rewritten_file_is_read_from_the_start(
+    db, tmp_path, parsed_headers, stars_hand_texts, write_hands
+):
+    path = write_hands(tmp_path / "stars.txt", stars_hand_texts)
+    db.import_file(path)
+    write_hands(path, stars_hand_texts[::-1])
+    os.utime(path, (0, 0))
+    parsed_headers.clear()
+    assert db.import_file(path) == 0
+    assert len(parsed_headers) == 3
+
+
+def test_files_table_of_old_database_gets_new_columns(tmp_path, stars_hand_texts, write_hands):
+    db_path = tmp_path / "hands.db"
+    connection = sqlite3.connect(str(db_path))
+    connection.execute("CREATE TABLE files (path TEXT PRIMARY KEY, size INTEGER, mtime REAL)")
+    connection.close()
+    hands_path = write_hands(tmp_path / "stars.txt", stars_hand_texts)
+    with HandDatabase(db_path) as db:
+        assert db.import_file(hands_path) == 3
+
+
+def test_import_files_with_mixed_rooms(db, tmp_path, stars_hand_texts, write_hands):
+    paths = [
+        write_hands(tmp_path / "stars.txt", stars_hand_texts),
+        write_hands(tmp_path / "other.txt", [ftp_hands.HAND1, pkr_hands.HANDS["holdem_full"]]),
+    ]
+    assert db.import_files(paths) == 5
+    rooms = db.connection.execute("SELECT DISTINCT room FROM hands ORDER BY room")
+    assert rooms.fetchall() == [("FTP",), ("PKR",), ("STARS",)]
+
+
+def test_same_hand_in_more_files(db, tmp_path, stars_hand_texts, write_hands):
+    paths = [
+        write_hands(tmp_path / "first.txt", stars_hand_texts),
+        write_hands(tmp_path / "second.txt", stars_hand_texts[1:]),
+    ]
+    assert db.import_files(paths) == 3
+
+
+def test_add_hands(db, tmp_path, stars_hand_texts, write_hands):
+    path = write_hands(tmp_path / "stars.txt", stars_hand_texts)
+    records = list(parse_many([path], workers=1))
+    assert db.add_hands(records + records) == 3
+    assert db.add_hands(records) == 0
+    assert len(db) == 3
+
+
+def test_database_file(tmp_path, stars_hand_texts, write_hands):
+    db_path = tmp_path / "hands.db"
+    hands_path = write_hands(tmp_path / "stars.txt", stars_hand_texts)
+    with HandDatabase(db_path) as db:
+        db.import_file(hands_path)
+    with HandDatabase(db_path) as db:
+        assert len(db) == 3
+        assert db.import_file(hands_path) == 0
@@ -107,6 +107,7 @@ class TestHandWithFlopOnly:
             ("total_pot", Decimal(230)),
             ("show_down", False),
             ("winners", ("FatalRevange",)),
+            ("winnings", {"FatalRevange": 230}),
             ("board", (Card("8h"), Card("4h"), Card("Tc"))),
             (
                 "extra",
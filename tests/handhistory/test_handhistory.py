@@ -0,0 +1,442 @@
+import pickle
+import re
+from decimal import Decimal
+
+import pytest
+from poker.constants import Game, Limit, PokerRoom, Position
+from poker import handhistory
+from poker.handhistory import (
+    _iter_chunks,
+    _Lines,
+    _get_positions,
+    _Player,
+    detect_room,
+    get_parser,
+    iter_hand_histories,
+    make_hand_history,
+    parse_many,
+    read_hand,
+    scan_headers,
+)
+from poker.hand import Combo
+from poker.room.fulltiltpoker import FullTiltPokerHandHistory
+from poker.room.pkr import PKRHandHistory
+from poker.room.pokerstars import PokerStarsHandHistory
+
+from . import ftp_hands, pkr_hands, stars_hands
+
+
+def test_iter_file_yields_every_hand(tmp_path, stars_hand_texts, write_hands):
+    path = write_hands(tmp_path / "stars.txt", stars_hand_texts)
+    hands = list(PokerStarsHandHistory.iter_file(path))
+    assert len(hands) == 3
+    assert all(isinstance(hand, PokerStarsHandHistory) for hand in hands)
+
+
+def test_iter_file_hands_are_not_parsed(tmp_path, stars_hand_texts, write_hands):
+    path = write_hands(tmp_path / "stars.txt", stars_hand_texts)
+    hand = next(PokerStarsHandHistory.iter_file(path))
+    assert hand.header_parsed is False
+    assert hand.parsed is False
+
+
+def test_iter_file_hands_can_be_parsed(tmp_path, stars_hand_texts, write_hands):
+    path = write_hands(tmp_path / "stars.txt", stars_hand_texts)
+    idents = []
+    for hand in PokerStarsHandHistory.iter_file(path):
+        hand.parse()
+        idents.append(hand.ident)
+    assert idents == ["105024000105", "105034215446", "105026771696"]
+
+
+def test_iter_file_raw_is_the_same_as_single_hand(tmp_path, stars_hand_texts, write_hands):
+    path = write_hands(tmp_path / "stars.txt", stars_hand_texts)
+    hand = next(PokerStarsHandHistory.iter_file(path))
+    assert hand.raw == PokerStarsHandHistory(stars_hands.HAND1).raw
+
+
+def test_iter_file_with_windows_line_endings_and_bom(tmp_path, stars_hand_texts):
+    path = tmp_path / "stars.txt"
+    text = "\r\n\r\n".join(hand.strip() for hand in stars_hand_texts).replace("\n", "\r\n")
+    path.write_bytes(("﻿" + text).encode())
+    hands = list(PokerStarsHandHistory.iter_file(path))
+    assert len(hands) == 3
+    hands[0].parse()
+    assert hands[0].ident == "105024000105"
+
+
+def test_iter_file_single_hand(testdir):
+    hands = list(PokerStarsHandHistory.iter_file(testdir / "handhistory/bbb.txt"))
+    assert len(hands) == 1
+
+
+def test_iter_file_other_rooms(tmp_path, write_hands):
+    path = write_hands(tmp_path / "ftp.txt", [ftp_hands.HAND1] * 2)
+    assert len(list(FullTiltPokerHandHistory.iter_file(path))) == 2
+
+    path = write_hands(tmp_path / "pkr.txt", pkr_hands.HANDS.values(), "\n\n")
+    hands = list(PKRHandHistory.iter_file(path))
+    assert len(hands) == len(pkr_hands.HANDS)
+    hands[0].parse()
+    assert hands[0].ident == "2433297728"
+
+
+class TestParseMany:
+    @pytest.fixture
+    def paths(self, tmp_path, stars_hand_texts, write_hands):
+        return [
+            write_hands(tmp_path / "first.txt", stars_hand_texts[:2]),
+            write_hands(tmp_path / "second.txt", stars_hand_texts[2:]),
+        ]
+
+    def test_get_parser(self):
+        assert get_parser(PokerRoom.STARS) is PokerStarsHandHistory
+        assert get_parser("FTP") is FullTiltPokerHandHistory
+        assert get_parser("pkr") is PKRHandHistory
+
+    def test_get_parser_for_room_without_parser(self):
+        with pytest.raises(ValueError):
+            get_parser(PokerRoom.EIGHT)
+
+    def test_invalid_room_raises_before_parsing(self, paths):
+        with pytest.raises(ValueError):
+            parse_many(paths, "nosuchroom")
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_records_in_order(self, paths, workers):
+        records = list(parse_many(paths, PokerRoom.STARS, workers=workers))
+        assert [record.ident for record in records] == [
+            "105024000105",
+            "105034215446",
+            "105026771696",
+        ]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_files_are_parsed_in_chunks_between_hands(
+        self, tmp_path, monkeypatch, workers, stars_hand_texts
+    ):
+        path = tmp_path / "stars.txt"
+        text = "\r\n\r\n".join(hand.strip() for hand in stars_hand_texts).replace("\n", "\r\n")
+        path.write_bytes(("\ufeff" + text).encode())
+        monkeypatch.setattr(handhistory, "_CHUNK_SIZE", 100)
+        chunks = list(_iter_chunks([path]))
+        assert len(chunks) == 3
+        assert chunks[-1][2] == path.stat().st_size
+        records = list(parse_many([path], PokerRoom.STARS, workers=workers))
+        assert [record.ident for record in records] == [
+            "105024000105",
+            "105034215446",
+            "105026771696",
+        ]
+
+    def test_records_are_the_same_as_parsed_hands(self, paths):
+        record = next(iter(parse_many(paths, "STARS", workers=2)))
+        hh = PokerStarsHandHistory(stars_hands.HAND1)
+        hh.parse()
+        assert record.room == PokerRoom.STARS
+        assert record.date == hh.date
+        assert record.bb == hh.bb
+        assert record.players == tuple(hh.players)
+        assert record.hero == hh.hero
+        assert record.board == hh.board
+        assert record.winners == hh.winners
+        assert not hasattr(record, "raw")
+
+    def test_room_is_detected_for_every_hand(self, tmp_path, write_hands):
+        path = write_hands(
+            tmp_path / "mixed.txt", [stars_hands.HAND1, pkr_hands.HANDS["holdem_full"]]
+        )
+        records = list(parse_many([path], workers=1))
+        assert [record.room for record in records] == [PokerRoom.STARS, PokerRoom.PKR]
+        assert [record.ident for record in records] == ["105024000105", "2433297728"]
+
+    def test_records_are_picklable(self, paths):
+        for record in parse_many(paths, PokerRoom.STARS, workers=1):
+            assert pickle.loads(pickle.dumps(record)) == record
+
+
+class TestDetectRoom:
+    def test_stars(self, stars_hand_texts):
+        for hand_text in stars_hand_texts:
+            assert detect_room(hand_text) == PokerRoom.STARS
+
+    def test_ftp(self):
+        assert detect_room(ftp_hands.HAND1) == PokerRoom.FTP
+
+    def test_pkr(self):
+        for hand_text in pkr_hands.HANDS.values():
+            assert detect_room(hand_text) == PokerRoom.PKR
+
+    def test_leading_whitespace_and_bom(self):
+        assert detect_room("\ufeff\r\n" + stars_hands.HAND1) == PokerRoom.STARS
+        assert detect_room(pkr_hands.HANDS["holdem_full"].replace("\n", "\r\n")) == (
+            PokerRoom.PKR
+        )
+
+    def test_unknown(self):
+        assert detect_room("") is None
+        assert detect_room("Table #1 - no hand id") is None
+        assert detect_room("#Game No : 123\n***** 888poker Hand History") is None
+
+    def test_make_hand_history(self):
+        assert isinstance(make_hand_history(ftp_hands.HAND1), FullTiltPokerHandHistory)
+        hh = make_hand_history(stars_hands.HAND2)
+        assert isinstance(hh, PokerStarsHandHistory)
+        assert hh.parsed is False
+
+    def test_make_hand_history_unknown_room(self):
+        with pytest.raises(ValueError):
+            make_hand_history("Some random text")
+
+    def test_iter_hand_histories_mixed(self, tmp_path, write_hands):
+        path = write_hands(
+            tmp_path / "mixed.txt",
+            [stars_hands.HAND1, ftp_hands.HAND1, pkr_hands.HANDS["holdem_full"]],
+        )
+        rooms = [hh.room for hh in iter_hand_histories(path)]
+        assert rooms == [PokerRoom.STARS, PokerRoom.FTP, PokerRoom.PKR]
+
+    def test_iter_hand_histories_with_room(self, tmp_path, stars_hand_texts, write_hands):
+        path = write_hands(tmp_path / "stars.txt", stars_hand_texts)
+        hands = list(iter_hand_histories(path, "STARS"))
+        assert len(hands) == 3
+
+
+def test_flop_texture_properties_can_be_read_one_after_another():
+    hh = PokerStarsHandHistory(stars_hands.HAND1)
+    hh.parse()
+    flop = hh.flop
+    # 2s 6d 6h
+    assert [
+        flop.is_rainbow,
+        flop.is_monotone,
+        flop.is_triplet,
+        flop.has_pair,
+        flop.has_straightdraw,
+        flop.has_gutshot,
+        flop.has_flushdraw,
+    ] == [True, False, False, True, False, True, False]
+    assert flop.info.high_card.val == "6"
+
+
+class TestPositions:
+    def _positions(self, hand_text, parser=PokerStarsHandHistory):
+        hh = parser(hand_text)
+        hh.parse()
+        active = {post.name for post in hh.posts}
+        active.update(action.name for _, action in hh._iter_actions())
+        return _get_positions(hh.players, hh.button, active)
+
+    def test_full_ring(self):
+        positions = self._positions(stars_hands.HAND1)
+        assert positions["flettl2"] == Position.BTN
+        assert positions["santy312"] == Position.SB
+        assert positions["flavio766"] == Position.BB
+        assert positions["strongi82"] == Position.UTG
+        assert positions["STBIJUJA"] == Position.CO
+        assert positions["sinus91"] == Position.HJ
+
+    def test_button_at_the_end_of_table(self):
+        positions = self._positions(stars_hands.HAND3)
+        assert positions["W2lkm2n"] == Position.BTN
+        assert positions["fischero68"] == Position.SB
+
+    def test_empty_seats_are_skipped(self):
+        positions = self._positions(pkr_hands.HANDS["holdem_full"], PKRHandHistory)
+        assert positions["Capricorn"] == Position.BTN
+        assert positions["Walkman"] == Position.SB
+        assert positions["barly123"] == Position.BB
+
+    def test_players_sitting_out_are_skipped(self):
+        # NikosMRF is away from table with a stack, but neither posts nor acts
+        positions = self._positions(pkr_hands.HANDS["holdem_full"], PKRHandHistory)
+        assert "NikosMRF" not in positions
+        assert len(positions) == 4
+        assert positions["laxi23"] == Position.CO
+
+    def test_without_active_players_every_stack_is_seated(self):
+        hh = PKRHandHistory(pkr_hands.HANDS["holdem_full"])
+        hh.parse()
+        positions = _get_positions(hh.players, hh.button)
+        assert len(positions) == 5
+        assert positions["laxi23"] == Position.HJ
+
+    def test_heads_up(self):
+        players = [
+            _Player(name="first", stack=100, seat=1, combo=None),
+            _Player(name="second", stack=100, seat=2, combo=None),
+        ]
+        positions = _get_positions(players, players[0])
+        assert positions == {"first": Position.BTN, "second": Position.BB}
+
+
+class TestScanHeaders:
+    @pytest.fixture
+    def path(self, tmp_path, write_hands):
+        hands = [stars_hands.HAND1, pkr_hands.HANDS["holdem_full"], ftp_hands.HAND1]
+        return write_hands(tmp_path / "mixed.txt", hands)
+
+    def test_parse_header_does_not_split_the_body(self):
+        for parser, hand_text in (
+            (PokerStarsHandHistory, stars_hands.HAND1),
+            (FullTiltPokerHandHistory, ftp_hands.HAND1),
+            (PKRHandHistory, pkr_hands.HANDS["holdem_full"]),
+        ):
+            hh = parser(hand_text)
+            hh.parse_header()
+            assert hh.header_parsed is True
+            assert not hasattr(hh, "_splitted")
+
+    def test_headers(self, path):
+        headers = list(scan_headers(path))
+        assert [header.room for header in headers] == [
+            PokerRoom.STARS,
+            PokerRoom.PKR,
+            PokerRoom.FTP,
+        ]
+        assert [header.ident for header in headers] == [
+            "105024000105",
+            "2433297728",
+            "33286946295",
+        ]
+        assert headers[1].sb == Decimal("0.25")
+        assert headers[1].bb == Decimal("0.50")
+        assert headers[1].limit == Limit.NL
+        assert headers[1].game == Game.HOLDEM
+
+    def test_headers_are_the_same_as_parsed_header(self, tmp_path, stars_hand_texts, write_hands):
+        path = write_hands(tmp_path / "stars.txt", stars_hand_texts)
+        for header, hand_text in zip(scan_headers(path, "STARS"), stars_hand_texts):
+            hh = PokerStarsHandHistory(hand_text)
+            hh.parse_header()
+            assert header.ident == hh.ident
+            assert header.date == hh.date
+            assert (header.sb, header.bb) == (hh.sb, hh.bb)
+
+    def test_read_hand_from_offset(self, path):
+        for header in scan_headers(path):
+            hh = read_hand(path, header.offset)
+            hh.parse()
+            assert hh.room == header.room
+            assert hh.ident == header.ident
+
+    def test_windows_line_endings_and_bom(self, tmp_path):
+        path = tmp_path / "windows.txt"
+        text = "\n\n".join(
+            hand.strip() for hand in (stars_hands.HAND1, pkr_hands.HANDS["holdem_full"])
+        )
+        path.write_bytes(("﻿" + text).replace("\n", "\r\n").encode())
+        headers = list(scan_headers(path))
+        assert [header.ident for header in headers] == ["105024000105", "2433297728"]
+        assert headers[0].offset == 0
+        hh = read_hand(path, headers[1].offset)
+        hh.parse()
+        assert hh.ident == "2433297728"
+
+
+LAZY_TEST_HANDS = [
+    (PokerStarsHandHistory, stars_hands.HAND1),
+    (PokerStarsHandHistory, stars_hands.HAND2),
+    (PokerStarsHandHistory, stars_hands.HAND3),
+    (FullTiltPokerHandHistory, ftp_hands.HAND1),
+    (PKRHandHistory, pkr_hands.HANDS["holdem_full"]),
+    (PKRHandHistory, pkr_hands.HOLDEM_NO_SHOW_DOWN),
+]
+
+
+class TestLazyParsing:
+    @pytest.mark.parametrize(
+        "parser, hand_text",
+        LAZY_TEST_HANDS,
+        ids=["stars1", "stars2", "stars3", "ftp", "pkr", "pkr_no_show_down"],
+    )
+    def test_attributes_are_the_same_as_eager_parsing(self, parser, hand_text):
+        eager = parser(hand_text)
+        eager.parse()
+        lazy = parser(hand_text)
+        lazy.parse(lazy=True)
+        # reverse order, so later streets are parsed first
+        for name in reversed(list(parser._LAZY_PARSERS)):
+            if name == "flop" and eager.flop is not None:
+                assert lazy.flop.cards == eager.flop.cards
+                assert lazy.flop.actions == eager.flop.actions
+            else:
+                assert getattr(lazy, name) == getattr(eager, name), name
+        assert lazy.board == eager.board
+        assert lazy.extra == eager.extra
+
+    def test_nothing_is_parsed_before_access(self):
+        hh = PokerStarsHandHistory(stars_hands.HAND1)
+        hh.parse(lazy=True)
+        assert hh.parsed is True
+        assert "players" not in vars(hh)
+        assert "flop" not in vars(hh)
+
+    def test_only_needed_parts_are_parsed(self):
+        hh = PokerStarsHandHistory(stars_hands.HAND1)
+        hh.parse(lazy=True)
+        assert hh.winners == ("W2lkm2n",)
+        assert "players" not in vars(hh)
+        assert "flop" not in vars(hh)
+        assert hh.preflop_actions[0] == "strongi82: folds"
+        assert "flop" not in vars(hh)
+
+    def test_hero_is_in_players(self):
+        hh = PokerStarsHandHistory(stars_hands.HAND1)
+        hh.parse(lazy=True)
+        assert hh.players[4].combo == Combo("AcJh")
+        assert hh.players[4] is hh.hero
+
+    def test_no_show_down(self):
+        hh = PKRHandHistory(pkr_hands.HOLDEM_NO_SHOW_DOWN)
+        hh.parse(lazy=True)
+        assert hh.show_down is False
+
+    def test_unknown_attribute(self):
+        hh = PokerStarsHandHistory(stars_hands.HAND1)
+        hh.parse(lazy=True)
+        with pytest.raises(AttributeError):
+            hh.no_such_attribute
+
+    def test_attributes_are_not_parsed_without_lazy_mode(self):
+        hh = PokerStarsHandHistory(stars_hands.HAND1)
+        hh.parse_header()
+        with pytest.raises(AttributeError):
+            hh.players
+
+
+class TestLines:
+    @pytest.fixture
+    def lines(self):
+        return _Lines(["", "HOLE CARDS", "a", "", "FLOP", "b", "", "SUMMARY", ""])
+
+    def test_is_a_list(self, lines):
+        assert lines[1] == "HOLE CARDS"
+        assert lines[4:6] == ["FLOP", "b"]
+        assert len(lines) == 9
+
+    def test_positions(self, lines):
+        assert lines.positions("") == [0, 3, 6, 8]
+        assert lines.positions("FLOP") == [4]
+        assert lines.positions("TURN") == []
+
+    def test_index(self, lines):
+        assert lines.index("") == 0
+        assert lines.index("", 1) == 3
+        assert lines.index("", 7) == 8
+        assert lines.index("FLOP") == 4
+        with pytest.raises(ValueError):
+            lines.index("FLOP", 5)
+        with pytest.raises(ValueError):
+            lines.index("TURN")
+
+    def test_contains(self, lines):
+        assert "SUMMARY" in lines
+        assert "SHOW DOWN" not in lines
+
+    @pytest.mark.parametrize("parser", [PokerStarsHandHistory, FullTiltPokerHandHistory])
+    def test_split_regex_is_the_same_as_the_original(self, parser, stars_hand_texts):
+        original_split_re = re.compile(r" ?\*\*\* ?\n?|\n")
+        for hand_text in stars_hand_texts + (ftp_hands.HAND1,):
+            hand_text = hand_text.strip()
+            assert parser._split_re.split(hand_text) == original_split_re.split(hand_text)
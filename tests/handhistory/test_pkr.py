@@ -90,6 +90,7 @@ class TestHoldemHand:
             ("total_pot", D("10.97")),
             ("rake", D("0.54")),
             ("winners", ("barly123",)),
+            ("winnings", {"barly123": D("10.43")}),
             ("show_down", True),
             ("board", (Card("7d"), Card("3c"), Card("Jd"), Card("Js"), Card("5h"))),
             ("extra", dict(money_type=MoneyType.REAL, last_ident="2433297369")),
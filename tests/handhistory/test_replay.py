@@ -0,0 +1,176 @@
+from decimal import Decimal
+
+import pytest
+from poker.constants import Action
+from poker.handhistory import _PlayerAction
+from poker.replay import HandReplay
+from poker.room.fulltiltpoker import FullTiltPokerHandHistory
+from poker.room.pkr import PKRHandHistory
+from poker.room.pokerstars import PokerStarsHandHistory
+
+from . import ftp_hands, pkr_hands, stars_hands
+
+
+class TestPosts:
+    def test_stars_blinds(self):
+        hh = PokerStarsHandHistory(stars_hands.HAND1)
+        hh.parse()
+        assert hh.posts == (
+            _PlayerAction("santy312", Action.POST, Decimal(10)),
+            _PlayerAction("flavio766", Action.POST, Decimal(20)),
+        )
+
+    def test_stars_antes(self):
+        hh = PokerStarsHandHistory(stars_hands.HAND3)
+        hh.parse()
+        antes = [post for post in hh.posts if post.action is Action.ANTE]
+        assert len(antes) == 8
+        assert {post.amount for post in antes} == {Decimal(50)}
+        assert hh.posts[-2:] == (
+            _PlayerAction(hh.posts[-2].name, Action.POST, Decimal(300)),
+            _PlayerAction(hh.posts[-1].name, Action.POST, Decimal(600)),
+        )
+
+    def test_pkr_blinds(self):
+        hh = PKRHandHistory(pkr_hands.HANDS["holdem_full"])
+        hh.parse()
+        assert hh.posts == (
+            _PlayerAction("Walkman", Action.POST, Decimal("0.25")),
+            _PlayerAction("barly123", Action.POST, Decimal("0.50")),
+        )
+
+    def test_lazy(self):
+        hh = FullTiltPokerHandHistory(ftp_hands.HAND1)
+        hh.parse(lazy=True)
+        assert [post.amount for post in hh.posts] == [10, 20]
+
+
+class TestStarsReplay:
+    @pytest.fixture
+    def replay(self, replay_hand):
+        return replay_hand(PokerStarsHandHistory, stars_hands.HAND1)
+
+    def test_length(self, replay):
+        # 2 blinds, 9 preflop and 5 flop actions
+        assert len(replay) == 16
+
+    def test_blinds_are_first(self, replay):
+        assert [state.action for state in replay][:2] == [Action.POST, Action.POST]
+        assert replay.pots[1] == 30
+
+    def test_raise_by(self, replay):
+        state = replay[3]
+        assert state.name == "W2lkm2n"
+        assert state.action is Action.RAISE
+        assert state.to_call == 20
+        # raises 40 to 60
+        assert state.stack == 2940
+        assert state.pot == 90
+
+    def test_to_call_of_blinds(self, replay):
+        folds = [state for state in replay if state.street == "preflop"][-2:]
+        assert [(state.name, state.to_call) for state in folds] == [
+            ("santy312", 50),
+            ("flavio766", 40),
+        ]
+
+    def test_effective_stack(self, replay):
+        # before the raise, from the 3000 stacks still to act
+        assert replay[3].effective_stack == 3000
+        flop_bet = replay[11]
+        assert flop_bet.name == "W2lkm2n"
+        assert flop_bet.effective_stack == 2940
+
+    def test_players_left(self, replay):
+        assert replay.players_left[0] == 9
+        assert replay[-1].players_left == 1
+
+    def test_uncalled_bet_and_win(self, replay):
+        # bet, fold, uncalled bet returned, win, muck
+        assert replay.pots[-4] == 230
+        assert replay.pots[-3] == 150
+        assert replay.pots[-2] == 0
+        assert replay.to_calls[-2] == 0
+
+    def test_final_stacks(self, replay):
+        stacks = dict(zip(replay.names, replay.final_stacks))
+        assert stacks["W2lkm2n"] == 3090
+        assert stacks["MISTRPerfect"] == 2940
+        assert stacks["santy312"] == 2990
+        assert sum(replay.final_stacks) == sum(replay.starting_stacks)
+
+    def test_small_blind_of_late_poster_is_dead_money(self):
+        hand = stars_hands.HAND1.replace(
+            "flavio766: posts big blind 20\n",
+            "flavio766: posts big blind 20\nsinus91: posts small & big blinds 30\n",
+        )
+        hh = PokerStarsHandHistory(hand)
+        hh.parse()
+        assert hh.posts[2:] == (
+            _PlayerAction("sinus91", Action.ANTE, Decimal(10)),
+            _PlayerAction("sinus91", Action.POST, Decimal(20)),
+        )
+        replay = HandReplay(hh)
+        assert replay.pots[3] == 60
+        # raises 40 to 60, with the big blind of 20 in
+        assert replay[4].to_call == 20
+        sinus_fold = next(
+            state for state in replay if state.name == "sinus91" and state.action is Action.FOLD
+        )
+        assert sinus_fold.to_call == 40
+        assert sinus_fold.stack == 1470
+
+    def test_chat_and_table_events_are_not_actions(self, replay_hand):
+        hand = stars_hands.HAND1.replace(
+            "blak_douglas: folds\n",
+            'blak_douglas: folds\nsinus91 said, "gl all"\nSTBIJUJA has timed out\n',
+        )
+        replay = replay_hand(PokerStarsHandHistory, hand)
+        assert len(replay) == len(replay_hand(PokerStarsHandHistory, stars_hands.HAND1))
+
+    def test_unparsable_action_line_is_reported(self):
+        hand = stars_hands.HAND1.replace("blak_douglas: folds\n", "blak_douglas: dances\n")
+        hh = PokerStarsHandHistory(hand)
+        hh.parse()
+        with pytest.raises(ValueError, match="blak_douglas: dances"):
+            HandReplay(hh)
+
+    def test_antes_are_dead_money(self, replay_hand):
+        replay = replay_hand(PokerStarsHandHistory, stars_hands.HAND3)
+        # 8 antes and the blinds
+        assert replay.pots[9] == 8 * 50 + 300 + 600
+        assert replay.to_calls[10] == 600
+
+
+def test_ftp_raise_to(replay_hand):
+    replay = replay_hand(FullTiltPokerHandHistory, ftp_hands.HAND1)
+    raises = [state for state in replay if state.action is Action.RAISE]
+    # raises to 40, then raises to 100
+    assert [(state.stack, state.pot) for state in raises] == [
+        (9800, 70),
+        (9870, 170),
+    ]
+    assert replay[-1].pot == 0
+    assert sum(replay.final_stacks) == sum(replay.starting_stacks)
+
+
+def test_pkr_call_to(replay_hand):
+    replay = replay_hand(PKRHandHistory, pkr_hands.HANDS["holdem_full"])
+    pots = {}
+    for state in replay:
+        pots[state.street] = state.pot
+    # "Pot sizes" lines of the hand history
+    assert pots["preflop"] == Decimal("2.75")
+    assert pots["flop"] == Decimal("10.97")
+    assert pots["river"] == Decimal("10.97")
+    stacks = dict(zip(replay.names, replay.final_stacks))
+    assert replay.to_decimal(stacks["Capricorn"]) == Decimal("28.24")
+
+
+def test_amounts_are_exact_units(replay_hand):
+    replay = replay_hand(PKRHandHistory, pkr_hands.HANDS["holdem_full"])
+    assert replay.places == 2
+    assert replay.pots.typecode == "q"
+    # $0.25 + $0.50 blinds, no binary rounding error in the pot
+    assert replay.pots[1] == 75
+    assert replay[1].pot == Decimal("0.75")
@@ -246,6 +246,7 @@ class TestHandWithFlopOnly:
             ("total_pot", Decimal(150)),
             ("show_down", False),
             ("winners", ("W2lkm2n",)),
+            ("winnings", {"W2lkm2n": Decimal(150)}),
         ],
     )
     def test_body(self, hand, attribute, expected_value):
@@ -355,6 +356,7 @@ class TestAllinPreflopHand:
             ("total_pot", Decimal(26310)),
             ("show_down", True),
             ("winners", ("costamar",)),
+            ("winnings", {"costamar": Decimal(26310)}),
         ],
     )
     def test_body(self, hand, attribute, expected_value):
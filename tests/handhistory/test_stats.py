@@ -0,0 +1,263 @@
+import pickle
+
+import pytest
+from poker.constants import PokerRoom
+from poker.room.fulltiltpoker import FullTiltPokerHandHistory
+from poker.room.pkr import PKRHandHistory
+from poker.room.pokerstars import PokerStarsHandHistory
+from poker.stats import (
+    PlayerStats,
+    Stats,
+    StatsSnapshot,
+    collect_stats,
+    merge_snapshots,
+)
+
+from . import ftp_hands, pkr_hands, stars_hands
+
+
+@pytest.fixture
+def hand_stats(parse_hand):
+    """Function returning the stats of a single parsed hand."""
+
+    def hand_stats(parser, hand_text):
+        stats = Stats()
+        stats.add(parse_hand(parser, hand_text))
+        return stats
+
+    return hand_stats
+
+
+@pytest.fixture
+def stars_stats(parse_hand, stars_hand_texts):
+    stats = Stats()
+    stats.update(parse_hand(PokerStarsHandHistory, hand) for hand in stars_hand_texts)
+    return stats
+
+
+class TestPreflop:
+    def test_vpip_and_pfr(self, hand_stats):
+        stats = hand_stats(PokerStarsHandHistory, stars_hands.HAND1)
+        assert stats["W2lkm2n"].voluntarily_put == 1
+        assert stats["W2lkm2n"].preflop_raised == 1
+        assert stats["MISTRPerfect"].voluntarily_put == 1
+        assert stats["MISTRPerfect"].preflop_raised == 0
+        # posting the blinds is not voluntary
+        assert stats["flavio766"].voluntarily_put == 0
+
+    def test_three_bet(self, hand_stats):
+        stats = hand_stats(FullTiltPokerHandHistory, ftp_hands.HAND1)
+        # JohnyyR raises, FatalRevange reraises
+        assert stats["FatalRevange"].three_bet_chances == 1
+        assert stats["FatalRevange"].three_bets == 1
+        assert stats["Popp1987"].three_bet_chances == 1
+        assert stats["Popp1987"].three_bets == 0
+        # folded before the first raise
+        assert stats["PtheProphet"].three_bet_chances == 0
+        # the raiser himself
+        assert stats["JohnyyR"].three_bet_chances == 0
+
+    def test_every_seated_player_is_counted(self, stars_stats, hand_stats):
+        assert stars_stats.hands == 3
+        assert stars_stats["W2lkm2n"].hands == 3
+        assert len(hand_stats(PokerStarsHandHistory, stars_hands.HAND1)) == 9
+
+
+class TestPostflop:
+    def test_fold_to_cbet(self, hand_stats):
+        stats = hand_stats(PokerStarsHandHistory, stars_hands.HAND1)
+        assert stats["MISTRPerfect"].cbets_faced == 1
+        assert stats["MISTRPerfect"].cbets_folded == 1
+        assert stats["MISTRPerfect"].fold_to_cbet == 100
+        assert stats["W2lkm2n"].fold_to_cbet is None
+
+    def test_bet_of_other_player_is_not_a_cbet(self, hand_stats):
+        # barly123 raises preflop, checks the flop, Capricorn bets
+        stats = hand_stats(PKRHandHistory, pkr_hands.HANDS["holdem_full"])
+        assert stats["barly123"].cbets_faced == 0
+
+    def test_showdown(self, hand_stats):
+        stats = hand_stats(PKRHandHistory, pkr_hands.HANDS["holdem_full"])
+        assert stats["barly123"].saw_flop == 1
+        assert stats["barly123"].wtsd == 100
+        assert stats["barly123"].wsd == 100
+        assert stats["Capricorn"].wsd == 0
+        assert stats["Walkman"].saw_flop == 0
+        # sitting out
+        assert "NikosMRF" not in stats
+
+    def test_no_showdown(self, hand_stats):
+        stats = hand_stats(PokerStarsHandHistory, stars_hands.HAND1)
+        assert stats["W2lkm2n"].saw_flop == 1
+        assert stats["W2lkm2n"].showdowns == 0
+        assert stats["W2lkm2n"].wsd is None
+
+    def test_no_showdown_pkr(self, hand_stats):
+        stats = hand_stats(PKRHandHistory, pkr_hands.HOLDEM_NO_SHOW_DOWN)
+        assert stats["barly123"].saw_flop == 1
+        assert stats["barly123"].showdowns == 0
+        # wins $10.43, put $7.36 in
+        assert stats["barly123"].won_bb == pytest.approx(6.14)
+
+
+class TestWinnings:
+    def test_won_bb(self, hand_stats):
+        stats = hand_stats(PokerStarsHandHistory, stars_hands.HAND1)
+        assert stats["W2lkm2n"].won_bb == 4.5
+        assert stats["MISTRPerfect"].won_bb == -3
+        assert stats["santy312"].won_bb == -0.5
+        assert stats["W2lkm2n"].bb_per_100 == 450
+
+    def test_pot_won_at_showdown(self, hand_stats):
+        # side and main pots are not actions
+        stats = hand_stats(PokerStarsHandHistory, stars_hands.HAND2)
+        assert stats["costamar"].won_bb == (27565 - 13070) / 800
+        assert sum(stats[name].won_bb for name in stats) == pytest.approx(0)
+
+    def test_side_pots_go_to_their_winners(self, hand_stats):
+        hand = (
+            stars_hands.HAND2.replace(
+                "costamar collected 4740 from main pot", "Newfie_187 collected 4740 from main pot"
+            )
+            .replace(
+                "showed [9c Qd] and lost with a pair of Nines",
+                "showed [9c Qd] and won (4740) with a pair of Nines",
+            )
+            .replace("and won (26310)", "and won (21570)")
+        )
+        stats = hand_stats(PokerStarsHandHistory, hand)
+        # all-in for 1030 with the ante
+        assert stats["Newfie_187"].won_bb == (4740 - 1030) / 800
+        assert stats["costamar"].won_bb == (21570 - 75 - 12995 + 1255) / 800
+        assert sum(stats[name].won_bb for name in stats) == pytest.approx(0)
+
+    def test_rake_is_not_won(self, hand_stats):
+        stats = hand_stats(PKRHandHistory, pkr_hands.HANDS["holdem_full"])
+        # wins $10.43 of the $10.97 pot, put $5.36 in
+        assert stats["barly123"].won_bb == pytest.approx(10.14)
+        assert stats["Capricorn"].won_bb == pytest.approx(-10.72)
+
+
+class TestMerge:
+    def test_player_stats_add(self):
+        first = PlayerStats(hands=2, voluntarily_put=1, won_bb=1.5)
+        second = PlayerStats(hands=3, voluntarily_put=2, won_bb=-0.5)
+        assert first + second == PlayerStats(hands=5, voluntarily_put=3, won_bb=1.0)
+        first.merge(second)
+        assert first.hands == 5
+
+    def test_merge_is_the_same_as_update(self, stars_stats, hand_stats, stars_hand_texts):
+        merged = Stats()
+        for hand in stars_hand_texts:
+            merged.merge(hand_stats(PokerStarsHandHistory, hand))
+        assert merged.hands == stars_stats.hands
+        assert merged.players == stars_stats.players
+
+    def test_add_doesnt_change_operands(self, hand_stats):
+        first = hand_stats(PokerStarsHandHistory, stars_hands.HAND1)
+        second = hand_stats(PokerStarsHandHistory, stars_hands.HAND2)
+        total = first + second
+        assert total["W2lkm2n"].hands == 2
+        assert first["W2lkm2n"].hands == 1
+
+    def test_pickle(self, stars_stats):
+        unpickled = pickle.loads(pickle.dumps(stars_stats))
+        assert unpickled.players == stars_stats.players
+
+
+class TestSnapshot:
+    def test_write_and_read(self, tmp_path, stars_stats):
+        path = tmp_path / "stats.bin"
+        stars_stats.write(path)
+        stats = Stats.read(path)
+        assert stats.hands == 3
+        assert stats.players == stars_stats.players
+
+    def test_memory_mapped_lookup(self, tmp_path, stars_stats):
+        path = tmp_path / "stats.bin"
+        stars_stats.write(path)
+        with StatsSnapshot(path) as snapshot:
+            assert snapshot.hands == 3
+            assert len(snapshot) == len(stars_stats)
+            assert list(snapshot) == sorted(stars_stats)
+            assert snapshot["W2lkm2n"] == stars_stats["W2lkm2n"]
+            assert "Lean Abadia" in snapshot
+            assert "nobody" not in snapshot
+            with pytest.raises(KeyError):
+                snapshot["nobody"]
+
+    def test_unicode_names(self, tmp_path):
+        stats = Stats()
+        stats.players = {
+            "Zoé": PlayerStats(hands=1),
+            "Ádám": PlayerStats(hands=2),
+            "a": PlayerStats(),
+        }
+        path = tmp_path / "stats.bin"
+        stats.write(path)
+        with StatsSnapshot(path) as snapshot:
+            assert list(snapshot) == ["Zoé", "a", "Ádám"]
+            assert snapshot["Ádám"].hands == 2
+
+    def test_empty(self, tmp_path):
+        path = tmp_path / "stats.bin"
+        Stats().write(path)
+        stats = Stats.read(path)
+        assert stats.hands == 0
+        assert len(stats) == 0
+
+    def test_incremental_update(self, tmp_path, stars_stats, parse_hand, stars_hand_texts):
+        path = tmp_path / "stats.bin"
+        stats = Stats()
+        stats.update(parse_hand(PokerStarsHandHistory, hand) for hand in stars_hand_texts[:2])
+        stats.write(path)
+
+        stats = Stats.read(path)
+        stats.add(parse_hand(PokerStarsHandHistory, stars_hand_texts[2]))
+        stats.write(path)
+        assert Stats.read(path).players == stars_stats.players
+        assert not (tmp_path / "stats.bin.tmp").exists()
+
+    def test_merge_snapshots(self, tmp_path, stars_stats, hand_stats, stars_hand_texts):
+        paths = []
+        for number, hand in enumerate(stars_hand_texts):
+            path = tmp_path / f"{number}.bin"
+            hand_stats(PokerStarsHandHistory, hand).write(path)
+            paths.append(path)
+        # the first snapshot is replaced by the merged one
+        merge_snapshots(paths, paths[0])
+        merged = Stats.read(paths[0])
+        assert merged.hands == 3
+        assert merged.players == stars_stats.players
+
+    def test_not_a_snapshot(self, tmp_path):
+        path = tmp_path / "stats.bin"
+        path.write_bytes(b"something else entirely")
+        with pytest.raises(ValueError):
+            StatsSnapshot(path)
+        path.write_bytes(b"")
+        with pytest.raises(ValueError):
+            StatsSnapshot(path)
+
+    @pytest.mark.parametrize("size", [10, 40])
+    def test_truncated_snapshot_is_closed(self, tmp_path, monkeypatch, stars_stats, size):
+        path = tmp_path / "stats.bin"
+        stars_stats.write(path)
+        path.write_bytes(path.read_bytes()[:size])
+        closed = []
+        close = StatsSnapshot.close
+        monkeypatch.setattr(StatsSnapshot, "close", lambda self: closed.append(close(self)))
+        with pytest.raises(ValueError):
+            StatsSnapshot(path)
+        assert len(closed) == 1
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_collect_stats(tmp_path, stars_stats, workers, stars_hand_texts, write_hands):
+    paths = [
+        write_hands(tmp_path / "first.txt", stars_hand_texts[:2]),
+        write_hands(tmp_path / "second.txt", stars_hand_texts[2:]),
+    ]
+    stats = collect_stats(paths, PokerRoom.STARS, workers=workers)
+    assert stats.hands == 3
+    assert stats.players == stars_stats.players
@@ -0,0 +1,88 @@
+import itertools
+
+import pytest
+from poker.board import (
+    FlopTexture,
+    flop_bucket,
+    flop_id,
+    flop_info,
+    flop_texture,
+)
+from poker.card import Card, Rank
+
+
+def _flop(text):
+    return tuple(Card(text[index : index + 2]) for index in range(0, 6, 2))
+
+
+def _naive_texture(flop):
+    """The texture by the definitions of the flags."""
+    pairs = list(itertools.combinations(flop, 2))
+    differences = [Rank.difference(first.rank, second.rank) for first, second in pairs]
+    flags = {
+        FlopTexture.RAINBOW: all(first.suit != second.suit for first, second in pairs),
+        FlopTexture.MONOTONE: all(first.suit == second.suit for first, second in pairs),
+        FlopTexture.TRIPLET: all(first.rank == second.rank for first, second in pairs),
+        FlopTexture.PAIR: any(first.rank == second.rank for first, second in pairs),
+        FlopTexture.STRAIGHTDRAW: any(1 <= diff <= 3 for diff in differences),
+        FlopTexture.GUTSHOT: any(1 <= diff <= 4 for diff in differences),
+        FlopTexture.FLUSHDRAW: any(first.suit == second.suit for first, second in pairs),
+    }
+    texture = FlopTexture(0)
+    for flag, is_set in flags.items():
+        if is_set:
+            texture |= flag
+    return texture
+
+
+ALL_FLOPS = list(itertools.combinations(list(Card), 3))
+
+
+def test_number_of_canonical_flops():
+    ids = {flop_id(flop) for flop in ALL_FLOPS}
+    assert ids == set(range(1755))
+    assert sum(flop_info(id).combinations for id in ids) == 22100
+
+
+def test_every_texture_is_the_same_as_by_definition():
+    for flop in ALL_FLOPS:
+        assert flop_texture(flop) == _naive_texture(flop), flop
+
+
+def test_suit_isomorphic_flops_have_the_same_id():
+    assert flop_id(_flop("As7d2c")) == flop_id(_flop("Ah7s2d"))
+    assert flop_id(_flop("KhKd5h")) == flop_id(_flop("KsKc5c"))
+    assert flop_id(_flop("KhKd5h")) != flop_id(_flop("KhKd5c"))
+    assert flop_id(_flop("9c8c7c")) != flop_id(_flop("9c8c7d"))
+
+
+def test_order_of_cards_doesnt_matter():
+    assert flop_id(_flop("2s6d6h")) == flop_id(_flop("6h2s6d"))
+
+
+def test_canonical_flop_is_isomorphic():
+    for flop in ALL_FLOPS[::97]:
+        info = flop_info(flop)
+        assert flop_id(info.cards) == info.id
+        assert sorted(card.rank for card in info.cards) == sorted(card.rank for card in flop)
+
+
+def test_info():
+    info = flop_info(_flop("2s6d6h"))
+    assert info.high_card == Rank("6")
+    assert info.num_suits == 3
+    assert info.num_ranks == 2
+    # 4 pairs of sixes * 3 other suits for the deuce
+    assert info.combinations == 12
+    assert info.texture == FlopTexture.RAINBOW | FlopTexture.PAIR | FlopTexture.GUTSHOT
+
+
+def test_bucket():
+    assert flop_bucket(_flop("AhKh2c")) == (Rank("A"), 2, 3)
+    assert flop_bucket(_flop("Ah8h2c"), by=("texture",)) == (FlopTexture.FLUSHDRAW,)
+    assert flop_bucket(_flop("Ks7d7c")) == flop_bucket(_flop("Kd7h7s"))
+
+
+def test_not_a_flop():
+    with pytest.raises(ValueError):
+        flop_id(_flop("AsAsKd"))
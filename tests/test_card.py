@@ -1,5 +1,8 @@
+import itertools
+import pickle
+
 import pytest
-from poker.card import Card, Rank, Suit
+from poker.card import Card, Rank, Suit, canonical_board, canonical_board_key
 
 
 def test_only_cards_with_same_rank_are_equal():
@@ -140,3 +143,89 @@ def test_hash():
 
 def test_putting_them_in_set_doesnt_raise_Exception():
     {Card("As"), Card("Kc")}
+
+
+def test_hash_is_unique():
+    assert len({hash(card) for card in Card}) == 52
+
+
+def test_cards_are_singletons():
+    assert Card("As") is Card("A♠")
+    assert Card("as") is Card("As")
+    assert Card(Card("2c")) is Card("2c")
+    assert Card.make_random() in list(Card)
+
+
+def test_ids():
+    assert Card("2c").id == 0
+    assert Card("2s").id == 3
+    assert Card("3c").id == 4
+    assert Card("As").id == 51
+    assert [card.id for card in Card] == list(range(52))
+
+
+def test_ids_are_in_the_same_order_as_cards():
+    assert sorted(Card) == sorted(Card, key=lambda card: card.id)
+
+
+def test_bitmask():
+    assert Card("2c").bitmask == 1
+    assert Card("2d").bitmask == 0b10
+    assert Card("As").bitmask == 1 << 51
+
+
+def test_from_id():
+    assert Card.from_id(0) is Card("2c")
+    assert Card.from_id(51) is Card("As")
+    assert all(Card.from_id(card.id) is card for card in Card)
+
+
+def test_from_invalid_id_raises_ValueError():
+    with pytest.raises(ValueError):
+        Card.from_id(52)
+    with pytest.raises(ValueError):
+        Card.from_id(-1)
+
+
+def test_pickled_card_is_the_same_instance():
+    card = Card("Kh")
+    assert pickle.loads(pickle.dumps(card)) is card
+
+
+def test_cards_are_immutable():
+    card = Card("As")
+    with pytest.raises(AttributeError):
+        card.rank = Rank("K")
+    with pytest.raises(AttributeError):
+        card.id = 0
+    with pytest.raises(AttributeError):
+        del card.suit
+    assert Card("As").rank == Rank("A") and Card("As").id == 51
+
+
+def _board(text):
+    return [Card(text[index : index + 2]) for index in range(0, len(text), 2)]
+
+
+class TestCanonicalBoard:
+    def test_suit_isomorphic_boards_are_the_same(self):
+        assert canonical_board(_board("Ah7s2d")) == canonical_board(_board("As7d2c"))
+        assert canonical_board(_board("Ah7s2d")) == tuple(_board("Ac7d2h"))
+        assert canonical_board(_board("KhKd5h9s")) == canonical_board(_board("KcKs5c9d"))
+
+    def test_other_boards_are_different(self):
+        assert canonical_board(_board("KhKd5h")) != canonical_board(_board("KhKd5c"))
+        assert canonical_board_key(_board("9c8c7c")) != canonical_board_key(_board("9c8c7d"))
+
+    def test_order_of_cards_doesnt_matter(self):
+        assert canonical_board(_board("2s6d6hJc")) == canonical_board(_board("Jc6h2s6d"))
+
+    def test_ranks_are_kept(self):
+        board = _board("Td9d4sQh2c")
+        assert [card.rank for card in canonical_board(board)] == sorted(
+            (card.rank for card in board), reverse=True
+        )
+
+    def test_number_of_flops(self):
+        keys = {canonical_board_key(flop) for flop in itertools.combinations(list(Card), 3)}
+        assert len(keys) == 1755
@@ -1,6 +1,8 @@
+import pickle
+
 import pytest
-from poker.card import Card
-from poker.hand import Shape, Hand, Combo
+from poker.card import Card, Rank, canonical_board
+from poker.hand import Shape, Hand, Combo, canonical_combo, canonical_combo_key
 
 
 def test_first_and_second_are_Card_instances():
@@ -171,3 +173,99 @@ def test_to_hand_converter_method():
 
 def test_pairs_are_not_offsuits():
     assert Combo("2s2c").is_offsuit is False
+
+
+def test_ids():
+    assert Combo("2d2c").id == 0
+    assert Combo("2h2c").id == 1
+    assert Combo("AsAh").id == 1325
+    assert Combo("AsAh").id == Combo("AhAs").id
+
+
+def test_ids_are_unique():
+    cards = list(Card)
+    ids = {
+        Combo.from_cards(first, second).id
+        for index, first in enumerate(cards)
+        for second in cards[index + 1 :]
+    }
+    assert ids == set(range(1326))
+
+
+def test_pickle():
+    for combo in (Combo("AsKh"), Combo("2c2d")):
+        assert pickle.loads(pickle.dumps(combo)) == combo
+
+
+def test_combos_are_singletons():
+    assert Combo("AsKh") is Combo("KhAs") is Combo("A♠K♥")
+    assert Combo.from_cards(Card("Kh"), Card("As")) is Combo("AsKh")
+    assert pickle.loads(pickle.dumps(Combo("2c2d"))) is Combo("2c2d")
+
+
+def test_from_cards_with_the_same_card_raises_ValueError():
+    with pytest.raises(ValueError):
+        Combo.from_cards(Card("As"), Card("As"))
+
+
+def test_sort_keys():
+    combos = sorted(Combo.from_cards(*cards) for cards in _all_card_pairs())
+    assert [combo.sort_key for combo in combos] == list(range(1326))
+    assert Combo("AsKd") < Combo("AsKh") < Combo("AcKc") < Combo("AsKs") < Combo("2c2d")
+    assert Combo("2c2d") > Combo("AsKs") >= Combo("AsKs") <= Combo("AsKs")
+
+
+def test_precomputed_properties():
+    cards = list(Card)
+    for index, first in enumerate(cards):
+        for second in cards[index + 1 :]:
+            combo = Combo.from_cards(first, second)
+            assert combo.is_pair is (first.rank == second.rank)
+            assert combo.is_suited is (first.suit == second.suit)
+            assert combo.is_offsuit is (not combo.is_pair and not combo.is_suited)
+            assert combo.rank_difference == Rank.difference(first.rank, second.rank)
+            assert combo.is_connector is (combo.rank_difference == 1)
+            assert combo.is_broadway is (first.is_broadway and second.is_broadway)
+
+
+def _board(text):
+    return tuple(Card(text[index : index + 2]) for index in range(0, len(text), 2))
+
+
+class TestCanonicalCombo:
+    def test_preflop(self):
+        assert canonical_combo(Combo("AhKh")) == canonical_combo(Combo("AsKs"))
+        assert canonical_combo(Combo("AhKh"))[1] == ()
+        keys = {canonical_combo_key(Combo.from_cards(*cards)) for cards in _all_card_pairs()}
+        assert len(keys) == 169
+
+    def test_on_board(self):
+        first = canonical_combo(Combo("AhKh"), _board("Qh7h2c"))
+        second = canonical_combo(Combo("AsKs"), _board("Qs7s2d"))
+        assert first == second == (Combo("AcKc"), _board("Qc7c2d"))
+
+    def test_suits_of_combo_and_board_are_renamed_together(self):
+        assert canonical_combo_key(Combo("AhKh"), _board("Qh7h2c")) != canonical_combo_key(
+            Combo("AsKs"), _board("Qh7h2c")
+        )
+        assert canonical_combo_key(Combo("AsKs"), _board("Qh7h2c")) == canonical_combo_key(
+            Combo("AdKd"), _board("Qh7h2c")
+        )
+
+    def test_board_is_canonical_board(self):
+        board = _board("Td9d4sQh")
+        assert canonical_combo(Combo("AsJc"), board)[1] == canonical_board(board)
+
+
+def _all_card_pairs():
+    cards = list(Card)
+    return ((first, second) for first in cards for second in cards if first < second)
+
+
+def test_combos_are_immutable():
+    combo = Combo("AsKs")
+    with pytest.raises(AttributeError):
+        combo.first = combo.second
+    with pytest.raises(AttributeError):
+        combo.shape = "o"
+    assert str(Combo("AsKs")) == "A♠K♠"
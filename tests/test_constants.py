@@ -1,4 +1,5 @@
-from poker.constants import PokerRoom
+import pytest
+from poker.constants import PokerRoom, Position
 
 
 def test_first_values_are_represeantional():
@@ -11,3 +12,30 @@ def test_first_values_are_represeantional():
 
     assert str(PokerRoom.PKR) == "PKR"
     assert str(PokerRoom.PKR) == "PKR"
+
+
+def test_members_have_ordinals_in_definition_order():
+    assert [room.ordinal for room in PokerRoom] == list(range(len(PokerRoom)))
+
+
+def test_lookup_is_case_insensitive_and_cached():
+    assert PokerRoom("pokerstars") is PokerRoom.STARS
+    assert PokerRoom("PokerStars") is PokerRoom.STARS
+    assert PokerRoom("pOkErStArS") is PokerRoom.STARS
+    # the second lookup of a new spelling comes from the cache
+    assert PokerRoom("pOkErStArS") is PokerRoom.STARS
+
+
+def test_invalid_values_raise():
+    with pytest.raises(ValueError):
+        PokerRoom("nothing")
+    with pytest.raises(ValueError):
+        PokerRoom("nothing")
+    with pytest.raises((ValueError, TypeError)):
+        PokerRoom(["unhashable"])
+
+
+def test_comparison_with_other_enum_is_not_supported():
+    assert PokerRoom.STARS != Position.UTG
+    with pytest.raises(TypeError):
+        PokerRoom.STARS < Position.UTG
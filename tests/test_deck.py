@@ -1,3 +1,5 @@
+import pytest
+
 from poker import Card, Deck
 
 
@@ -25,3 +27,84 @@ def test_shuffle():
     deck3.shuffle()
     assert deck._cards != deck3._cards
     assert deck2._cards != deck3._cards
+
+
+def _split(samples, size):
+    return [samples[start : start + size] for start in range(0, len(samples), size)]
+
+
+def test_sample():
+    deck = Deck(seed=42)
+    samples = deck.sample(1000, 5)
+    assert len(samples) == 5000
+    assert all(len(set(sample)) == 5 for sample in _split(samples, 5))
+    assert set(samples) == set(range(52))
+    assert len(deck) == 52
+
+
+def test_sample_is_repeatable_with_seed():
+    assert Deck(seed=1).sample(100, 9) == Deck(seed=1).sample(100, 9)
+    assert Deck(seed=1).sample(100, 9) != Deck(seed=2).sample(100, 9)
+
+
+def test_sample_only_cards_left_in_the_deck():
+    deck = Deck(seed=3)
+    drawn = {deck.draw().id for _ in range(10)}
+    samples = deck.sample(1000, 2)
+    assert not drawn & set(samples)
+
+
+def test_sample_many_cards():
+    samples = Deck(seed=4).sample(100, 52)
+    assert all(sorted(sample) == list(range(52)) for sample in _split(samples, 52))
+
+
+def test_sample_too_many_cards_raises_ValueError():
+    with pytest.raises(ValueError):
+        Deck().sample(1, 53)
+
+
+def test_deal():
+    deck = Deck()
+    top = deck._cards[-3:]
+    cards = deck.deal(3)
+    assert cards == top[::-1]
+    assert len(deck) == 49
+    assert deck._drawn == cards
+    assert deck.deal(0) == []
+    with pytest.raises(ValueError):
+        deck.deal(50)
+
+
+def test_deal_is_the_same_as_draw():
+    deck, deck2 = Deck(), Deck()
+    assert deck.deal(5) == [deck2.draw() for _ in range(5)]
+
+
+def test_remove():
+    deck = Deck()
+    deck.remove([Card("As"), "Kd"])
+    assert len(deck) == 50
+    assert Card("As") not in deck._cards
+    assert Card("Kd") not in deck._cards
+
+
+def test_remove_card_not_in_deck_raises_ValueError():
+    deck = Deck()
+    deck.remove(["As"])
+    with pytest.raises(ValueError):
+        deck.remove(["Kd", "As"])
+    assert len(deck) == 51
+
+
+def test_reset_puts_back_all_but_removed_cards():
+    deck = Deck()
+    cards = deck._cards
+    deck.remove(["As", "Kd"])
+    deck.shuffle()
+    deck.deal(5)
+    deck.draw()
+    deck.reset()
+    assert deck._cards is cards
+    assert deck._cards == [card for card in Card if card not in (Card("As"), Card("Kd"))]
+    assert deck._drawn == []
@@ -0,0 +1,101 @@
+import itertools
+
+import pytest
+from poker.card import Card
+from poker.eval import HandClass, encode, evaluate, get_hand_class
+
+
+def _cards(cards):
+    return [Card(cards[i : i + 2]) for i in range(0, len(cards), 2)]
+
+
+def test_encode():
+    assert encode(Card("Kd")) == 0b00001000_00000000_01001011_00100101
+    assert encode("5s") == 0b00000000_00001000_00010011_00000111
+    assert encode(Card("Jc")) == 0b00000010_00000000_10001001_00011101
+
+
+def test_royal_flush_is_the_best():
+    assert evaluate(_cards("AsKsQsJsTs")) == 1
+
+
+def test_worst_hand():
+    assert evaluate(_cards("7c5d4h3s2c")) == 7462
+
+
+def test_wheel_is_the_smallest_straight():
+    assert evaluate(_cards("5d4c3h2sAc")) > evaluate(_cards("6d5c4h3s2c"))
+    assert get_hand_class(evaluate(_cards("5d4c3h2sAc"))) == HandClass.STRAIGHT
+
+
+def test_steel_wheel():
+    assert evaluate(_cards("5h4h3h2hAh")) == 10
+
+
+@pytest.mark.parametrize(
+    ("cards", "hand_class"),
+    [
+        ("AsKsQsJsTs", HandClass.STRAIGHT_FLUSH),
+        ("9c9d9h9s2c", HandClass.QUADS),
+        ("9c9d9hKsKc", HandClass.FULL_HOUSE),
+        ("Ac9c7c5c2c", HandClass.FLUSH),
+        ("Tc9d8h7s6c", HandClass.STRAIGHT),
+        ("7c7d7hAs2c", HandClass.TRIPS),
+        ("7c7dAhAs2c", HandClass.TWO_PAIR),
+        ("7c7dAhKs2c", HandClass.PAIR),
+        ("7c9dAhKs2c", HandClass.HIGH_CARD),
+    ],
+)
+def test_hand_classes(cards, hand_class):
+    assert get_hand_class(evaluate(_cards(cards))) == hand_class
+
+
+def test_packed_ints_and_cards_are_the_same():
+    cards = _cards("AhKh7c7d2s3s")
+    assert evaluate(cards) == evaluate([encode(card) for card in cards])
+
+
+def test_seven_cards_choose_the_best_five():
+    cards = _cards("AhKhQh2h3cJhTh")
+    assert evaluate(cards) == 1
+
+    cards = _cards("2c2d2h3c3d3hAs")
+    assert evaluate(cards) == evaluate(_cards("3c3d3h2c2d"))
+
+
+def test_seven_card_evaluation_matches_best_five():
+    cards = _cards("Ac2c3c4d5dAh9s8sKs7d")
+    for seven in itertools.islice(itertools.combinations(cards, 7), 0, None, 3):
+        best = min(evaluate(five) for five in itertools.combinations(seven, 5))
+        assert evaluate(seven) == best
+
+
+def test_hand_class_limits():
+    assert get_hand_class(10) == HandClass.STRAIGHT_FLUSH
+    assert get_hand_class(11) == HandClass.QUADS
+    assert get_hand_class(1599) == HandClass.FLUSH
+    assert get_hand_class(1600) == HandClass.STRAIGHT
+    assert get_hand_class(6186) == HandClass.HIGH_CARD
+
+
+def test_invalid_number_of_cards():
+    with pytest.raises(ValueError):
+        evaluate(_cards("AsKsQsJs"))
+    with pytest.raises(ValueError):
+        evaluate(_cards("AsKsQsJsTs9s8s7s"))
+
+
+def test_duplicate_cards():
+    with pytest.raises(ValueError):
+        evaluate(_cards("AsAsKdQhJc"))
+    with pytest.raises(ValueError):
+        evaluate([encode(card) for card in _cards("2c3d4h5s6c7d2c")])
+
+
+def test_invalid_hand_value():
+    with pytest.raises(ValueError):
+        get_hand_class(7463)
+
+
+def test_hand_classes_are_ordered():
+    assert HandClass.STRAIGHT_FLUSH > HandClass.QUADS > HandClass.HIGH_CARD
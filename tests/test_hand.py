@@ -1,3 +1,5 @@
+import pickle
+
 import pytest
 from poker import Hand, Combo, Rank
 
@@ -205,3 +207,49 @@ def test_suited_hand_to_combos():
         Combo("7h6h"),
         Combo("7s6s"),
     )
+
+
+def test_pickle():
+    for hand in (Hand("AKs"), Hand("T9o"), Hand("22")):
+        assert pickle.loads(pickle.dumps(hand)) == hand
+
+
+def test_hands_are_singletons():
+    assert Hand("AKs") is Hand("KAs") is Hand("aks")
+    assert Hand("AKs") is not Hand("AKo")
+    assert pickle.loads(pickle.dumps(Hand("T9o"))) is Hand("T9o")
+    assert Hand.make_random() in set(Hand)
+    assert len(set(Hand)) == 169
+
+
+def test_to_combos_returns_the_same_combos():
+    for hand in Hand:
+        assert all(a is b for a, b in zip(hand.to_combos(), hand.to_combos()))
+
+
+def test_sort_keys_are_in_ascending_order():
+    assert [hand.sort_key for hand in Hand] == list(range(169))
+    assert Hand("AKo").sort_key < Hand("AKs").sort_key < Hand("22").sort_key
+    assert sorted(Hand, key=lambda hand: hand.sort_key) == sorted(Hand) == list(Hand)
+    assert Hand("22") >= Hand("AKs") > Hand("AKo") <= Hand("AKo")
+
+
+def test_precomputed_properties():
+    assert Hand("AKs").is_suited and Hand("AKs").is_broadway and Hand("AKs").is_connector
+    assert Hand("AKo").is_offsuit and not Hand("AKo").is_suited
+    assert Hand("AA").is_pair and not Hand("AA").is_offsuit
+    assert Hand("A2o").rank_difference == 12
+    assert not Hand("T8s").is_connector and Hand("T8s").is_one_gapper
+    assert not Hand("T9s").is_broadway
+
+
+def test_hands_are_immutable():
+    hand = Hand("AKs")
+    with pytest.raises(AttributeError):
+        hand.shape = "o"
+    with pytest.raises(AttributeError):
+        hand.first = Rank("2")
+    with pytest.raises(AttributeError):
+        del hand.is_suited
+    assert Hand("AKs").is_suited and Hand("AKs").shape.val == "s"
+    assert str(Hand("AKs")) == "AKs"
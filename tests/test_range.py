@@ -1,4 +1,5 @@
 import pytest
+from poker.card import Card
 from poker.hand import Hand, Combo, Range, PAIR_HANDS
 
 
@@ -605,3 +606,164 @@ class TestContains:
     def test_wrong_str_in_range_raises_ValueError(self):
         with pytest.raises(ValueError):
             assert "AKl" in Range("AQo+")
+
+
+class TestEquityVs:
+    def test_river_card_to_come(self):
+        equity = Range("AsAh").equity_vs(Range("KsKh"), board="2c7d9hTc")
+        # only the two remaining kings win for KK from 44 cards
+        assert equity == 42 / 44
+
+    def test_dead_cards_are_removed_from_the_deck(self):
+        equity = Range("AsAh").equity_vs(Range("KsKh"), board="2c7d9hTc", dead="Kc")
+        assert equity == 42 / 43
+
+    def test_board_as_cards(self):
+        board = [Card("2c"), Card("7d"), Card("9h"), Card("Tc")]
+        equity = Range("AsAh").equity_vs(Range("KsKh"), board=board)
+        assert equity == 42 / 44
+
+    def test_complete_board(self):
+        assert Range("AsAh").equity_vs(Range("KsKh"), board="2c7d9hTcKc") == 0
+
+    def test_same_ranges_are_even(self):
+        assert Range("AK").equity_vs(Range("AK"), board="2c7d9h") == 0.5
+
+    def test_equities_add_up_to_one(self):
+        first, second = Range("AK, 77, T9s"), Range("AA, K7s, TT, 9h8h")
+        equity = first.equity_vs(second, board="Ah7dTs")
+        assert equity + second.equity_vs(first, board="Ah7dTs") == pytest.approx(1)
+
+    def test_conflicting_combos_are_skipped(self):
+        # AsKs can only meet AhAd, AhAc, AdAc; AA is ahead on every runout
+        equity = Range("AsKs").equity_vs(Range("AA"), board="2c3d8h9c")
+        assert equity == Range("AsKs").equity_vs(Range("AhAd"), board="2c3d8h9c")
+
+    def test_monte_carlo(self):
+        equity = Range("AA").equity_vs(Range("KK"), iterations=5000, seed=1)
+        assert equity == pytest.approx(0.82, abs=0.03)
+
+    def test_monte_carlo_is_reproducible_with_seed(self):
+        first = Range("22+").equity_vs(Range("AK"), iterations=1000, seed=42)
+        second = Range("22+").equity_vs(Range("AK"), iterations=1000, seed=42)
+        assert first == second
+
+    def test_no_possible_matchups_raises_ValueError(self):
+        with pytest.raises(ValueError):
+            Range("AsAh").equity_vs(Range("AsKs"), board="2c3d8h")
+        with pytest.raises(ValueError):
+            Range("AsAh").equity_vs(Range("AsKs"), iterations=100)
+
+    def test_too_many_board_cards_raises_ValueError(self):
+        with pytest.raises(ValueError):
+            Range("AA").equity_vs(Range("KK"), board="2c3d8h9cTcJc")
+
+
+class TestBitmask:
+    def test_bits_are_combo_ids(self):
+        assert Range("2d2c")._mask == 1
+        assert Range("AsAh")._mask == 1 << 1325
+
+    def test_full_range(self):
+        assert Range("XX")._mask == (1 << 1326) - 1
+
+    def test_hands_and_combos_are_merged(self):
+        assert Range("22, 2s2c")._mask == Range("22")._mask
+
+
+class TestSetOperators:
+    def test_union(self):
+        assert Range("22+") | Range("A2s+") == Range("22+, A2s+")
+
+    def test_intersection(self):
+        assert Range("22+, A2s+") & Range("AKs, 55") == Range("55, AKs")
+
+    def test_difference(self):
+        assert Range("22+, A2s+") - Range("22-55") == Range("66+, A2s+")
+
+    def test_symmetric_difference(self):
+        assert Range("22+") ^ Range("AA, AKs") == Range("22-KK, AKs")
+
+    def test_combos_and_hands(self):
+        assert Range("AK") - Range("AsKs") == Range("AKo, AhKh, AdKd, AcKc")
+
+    def test_operands_are_not_changed(self):
+        first, second = Range("22+"), Range("AKs")
+        first | second
+        assert first == Range("22+")
+        assert second == Range("AKs")
+
+    def test_inplace_union(self):
+        range = Range("AA")
+        original = range
+        range |= Range("KK")
+        assert range == Range("KK+")
+        assert original == Range("AA")
+
+    def test_inplace_operators_keep_ranges_in_sets_hashable(self):
+        range = Range("AA")
+        ranges = {range}
+        range |= Range("KK")
+        assert Range("AA") in ranges
+        assert range not in ranges
+        assert ranges == {Range("AA")}
+
+    def test_inplace_operators_invalidate_cached_properties(self):
+        range = Range("AA")
+        assert range.hands == (Hand("AA"),)
+        assert range.percent == 0.45
+        range |= Range("KK")
+        assert range.hands == (Hand("KK"), Hand("AA"))
+        assert range.combos == Range("KK+").combos
+        range &= Range("KK")
+        assert range.hands == (Hand("KK"),)
+        range -= Range("KhKs")
+        assert len(range) == 5
+        range ^= Range("KhKs, AA")
+        assert range == Range("KK+")
+
+    def test_operators_with_other_types(self):
+        with pytest.raises(TypeError):
+            Range("AA") | "KK"
+
+
+class TestCache:
+    def setup_method(self):
+        Range.cache_clear()
+
+    def test_parsing_the_same_range_again_is_a_hit(self):
+        Range("22+, A2s+, KTs+")
+        Range("22+, A2s+, KTs+")
+        info = Range.cache_info()
+        assert info.hits == 1
+        assert info.misses == 1
+
+    def test_separators_are_normalized(self):
+        Range("22+, A2s+")
+        Range("22+ ;A2s+")
+        assert Range.cache_info().hits == 1
+
+    def test_cached_ranges_are_equal(self):
+        assert Range("AKs, QQ+") == Range("AKs, QQ+")
+
+    def test_changing_a_range_inplace_does_not_change_cached_ranges(self):
+        range = Range("AA")
+        range |= Range("KK")
+        assert Range("AA") == Range("AsAh, AsAd, AsAc, AhAd, AhAc, AdAc")
+
+    def test_invalid_ranges_are_not_cached(self):
+        with pytest.raises(ValueError):
+            Range("AKl")
+        assert Range.cache_info().currsize == 0
+
+    def test_from_file_uses_cache(self, tmp_path):
+        range_file = tmp_path / "range.rng"
+        range_file.write_text("22+, AKs")
+        Range.from_file(range_file)
+        Range.from_file(range_file)
+        assert Range.cache_info().hits == 1
+
+    def test_cache_clear(self):
+        Range("AA")
+        Range.cache_clear()
+        assert Range.cache_info().currsize == 0
@@ -91,3 +91,14 @@ def test_rank_difference():
     assert Rank.difference("A", "2") == 12
     assert Rank.difference("K", "K") == 0
     assert Rank.difference("K", "Q") == 1
+
+
+def test_rank_difference_with_Rank_instances():
+    assert Rank.difference(Rank("A"), Rank("K")) == 1
+    assert Rank.difference(Rank("2"), "a") == 12
+
+
+def test_ordinal():
+    assert Rank("2").ordinal == 0
+    assert Rank("A").ordinal == 12
+    assert sorted(Rank, reverse=True)[0] is Rank.ACE
@@ -1,3 +1,4 @@
+import pytest
 from poker.hand import _RegexRangeLexer
 
 
@@ -38,3 +39,33 @@ def test_both_suited_and_offsuit():
 def test_both_suited_and_offsuit_plus():
     lexer = _RegexRangeLexer("KJ+")
     assert list(lexer) == [("BOTH_PLUS", ("J", "K"))]
+
+
+def test_x_suited_plus():
+    lexer = _RegexRangeLexer("KXs+")
+    assert list(lexer) == [("X_SUITED_PLUS", "K")]
+
+
+def test_dash_with_suits():
+    lexer = _RegexRangeLexer("A5s-ATs")
+    assert list(lexer) == [("SUITED_DASH", ("A", "5", "T"))]
+
+
+def test_combo():
+    lexer = _RegexRangeLexer("AsKh")
+    assert list(lexer) == [("COMBO", "AsKh")]
+
+
+def test_multiple_tokens():
+    lexer = _RegexRangeLexer("22+, AKo;KQ  J9s")
+    assert list(lexer) == [
+        ("PAIR_PLUS", "2"),
+        ("OFFSUIT", ("K", "A")),
+        ("BOTH", ("Q", "K")),
+        ("SUITED", ("9", "J")),
+    ]
+
+
+def test_invalid_token_raises_ValueError():
+    with pytest.raises(ValueError):
+        list(_RegexRangeLexer("AKx"))
@@ -0,0 +1,136 @@
+from decimal import Decimal
+
+import pytest
+from poker.hand import Combo, Hand, Range, WeightedRange
+
+
+def test_pieces_without_weight_have_weight_one():
+    range = WeightedRange("AA")
+    assert range["AsAh"] == 1
+    assert range[Combo("AdAc")] == 1
+
+
+def test_combos_not_in_range_have_zero_weight():
+    assert WeightedRange("AA")["KsKh"] == 0
+
+
+def test_weights():
+    range = WeightedRange("AA, KK:0.5, AKs:0.25")
+    assert range["KsKh"] == 0.5
+    assert range["AsKs"] == 0.25
+    assert len(range) == 16
+
+
+def test_later_pieces_override_earlier_ones():
+    range = WeightedRange("AKs:0.25, AsKs:1")
+    assert range["AsKs"] == 1
+    assert range["AhKh"] == 0.25
+
+
+def test_zero_weight_removes_combo():
+    range = WeightedRange("AA, AsAh:0")
+    assert len(range) == 5
+    assert "AsAh" not in range
+
+
+def test_invalid_weight_raises_ValueError():
+    with pytest.raises(ValueError):
+        WeightedRange("AA:1.5")
+    with pytest.raises(ValueError):
+        WeightedRange.from_range(Range("AA"), -1)
+
+
+def test_from_range():
+    range = WeightedRange.from_range(Range("AA, KK"), 0.5)
+    assert range == WeightedRange("KK+:0.5")
+
+
+def test_contains():
+    range = WeightedRange("AA, AsKs:0.5")
+    assert Combo("AsKs") in range
+    assert Hand("AKs") in range
+    assert "AKo" not in range
+    assert "AcKc" not in range
+
+
+def test_str_and_repr():
+    range = WeightedRange("AA, KK:0.5, AKs:0.25")
+    assert str(range) == "AA, KK:0.5, AKs:0.25"
+    assert repr(range) == "WeightedRange('AA KK:0.5 AKs:0.25')"
+
+
+def test_str_can_be_parsed_back():
+    range = WeightedRange("22+, A2s+:0.75, AsKs, KQo:0.1")
+    assert WeightedRange(str(range)) == range
+
+
+def test_str_round_trips_weights_with_many_digits():
+    range = WeightedRange.from_range(Range("AA"), 1 / 3) | WeightedRange("KK:0.1234567")
+    assert str(range) == "AA:0.3333333333333333, KK:0.1234567"
+    assert WeightedRange(str(range)) == range
+    assert WeightedRange(repr(range)[len("WeightedRange('") : -2]) == range
+
+
+def test_from_range_weight_is_float():
+    range = WeightedRange.from_range(Range("AA"), Decimal("0.5"))
+    assert str(range) == "AA:0.5"
+
+
+def test_range_property():
+    assert WeightedRange("AA, KK:0.5").range == Range("KK+")
+
+
+def test_hands():
+    assert WeightedRange("AA, KsKh:0.5").hands == (Hand("KK"), Hand("AA"))
+
+
+def test_combos():
+    assert WeightedRange("AA:0.2").combos == Range("AA").combos
+
+
+def test_weights_dict():
+    assert WeightedRange("AsAh:0.2").weights == {Combo("AsAh"): 0.2}
+
+
+def test_percent():
+    assert WeightedRange("AA, KK:0.5").percent == 0.68
+
+
+def test_to_ascii():
+    assert WeightedRange("AA:0.5, KK").to_ascii() == Range("KK+").to_ascii()
+
+
+def test_union_is_the_maximum_of_weights():
+    range = WeightedRange("AA:0.5, KK:0.2") | WeightedRange("KK:0.8, QQ:0.1")
+    assert range == WeightedRange("AA:0.5, KK:0.8, QQ:0.1")
+
+
+def test_intersection_is_the_minimum_of_weights():
+    range = WeightedRange("AA:0.5, KK:0.2") & WeightedRange("KK:0.8, AA")
+    assert range == WeightedRange("AA:0.5, KK:0.2")
+
+
+def test_difference():
+    range = WeightedRange("AA, KK") - WeightedRange("KK:0.25, AA")
+    assert range == WeightedRange("KK:0.75")
+
+
+def test_symmetric_difference():
+    range = WeightedRange("AA, KK:0.5") ^ WeightedRange("AA, QQ")
+    assert range == WeightedRange("KK:0.5, QQ")
+
+
+def test_operations_with_range():
+    assert WeightedRange("AA:0.5") | Range("AA") == WeightedRange("AA")
+    assert Range("AA") | WeightedRange("KK:0.5") == WeightedRange("AA, KK:0.5")
+    assert Range("KK+") - WeightedRange("KK:0.5") == WeightedRange("AA, KK:0.5")
+    assert Range("KK+") & WeightedRange("KK:0.5") == WeightedRange("KK:0.5")
+
+
+def test_inplace_operators():
+    range = WeightedRange("AA:0.5")
+    original = range
+    range |= WeightedRange("KK")
+    range -= Range("AsAh")
+    assert range is original
+    assert range == WeightedRange("AA:0.5, AsAh:0, KK")